@@ -0,0 +1,31 @@
+"""Carga de estadísticas de liga (en frío y cacheadas) y construcción de los precálculos por liga
+
+Uso: python -m benchmarks.bench_loaders
+"""
+from benchmarks.common import measure, print_results, result
+from utils.league_bundle import _build_bundle
+from utils.rankings import _build_combined
+from utils.team_stats import LEAGUE_SEEDS, _build_team_stats, load_team_stats, team_stats_version
+from utils.team_styles import _build_styles
+
+
+def run(quick=False):
+    repeat = 3 if quick else 10
+    results = []
+    for league in LEAGUE_SEEDS:
+        results.append(result("loaders", f"team_stats frío {league}", measure(lambda: _build_team_stats(league), repeat)))
+        results.append(result("loaders", f"team_stats cacheado {league}", measure(lambda: load_team_stats(league), repeat * 10, warmup=1)))
+
+    version = team_stats_version()
+    results.append(result("loaders", "bundle de liga (4 gráficas)", measure(lambda: _build_bundle("La Liga Española", version), repeat)))
+    results.append(result("loaders", "ranking combinado 5 ligas", measure(lambda: _build_combined(version), repeat)))
+    results.append(result("loaders", "estilos de juego 5 ligas", measure(lambda: _build_styles(version), repeat, warmup=1)))
+    return results
+
+
+def main():
+    print_results(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Resolución de rutas de logos y codificación base64 (en frío y cacheadas)
+
+La app resuelve las rutas con resolve_team_logo y lee los logos con la caché de utils.logos;
+se miden esas funciones directamente (importar Main.py ejecuta la app).
+Uso: python -m benchmarks.bench_logos
+"""
+import os
+import tempfile
+
+from benchmarks.common import measure, print_results, result
+from benchmarks.synthetic import write_logo_files
+from utils import logos
+from utils.logos import get_logo_base64, get_logo_src, invalidate_logo_cache
+from utils.teams import TEAM_REGISTRY, invalidate_logo_paths, resolve_team_logo
+
+
+def _resolver_todos(names):
+    for name in names:
+        resolve_team_logo(name)
+
+
+def _codificar_todos(paths):
+    for path in paths:
+        get_logo_base64(path)
+
+
+def run(quick=False):
+    repeat = 3 if quick else 10
+    names = list(TEAM_REGISTRY)
+    unknown = [f"Equipo desconocido {i}" for i in range(len(names))]
+    results = []
+
+    def frio():
+        invalidate_logo_paths()
+        _resolver_todos(names)
+
+    results.append(result("logos", f"resolve_team_logo frío x{len(names)}", measure(frio, repeat)))
+    results.append(result("logos", f"resolve_team_logo cacheado x{len(names)}", measure(lambda: _resolver_todos(names), repeat, warmup=1)))
+    results.append(result("logos", f"resolve_team_logo desconocido x{len(unknown)}", measure(lambda: _resolver_todos(unknown), repeat, warmup=1)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_logo_files(os.path.join(tmp, "logos"), n=20 if quick else 100)
+
+        def base64_frio():
+            invalidate_logo_cache()
+            _codificar_todos(paths)
+
+        results.append(result("logos", f"get_logo_base64 frío x{len(paths)}", measure(base64_frio, repeat)))
+        results.append(result("logos", f"get_logo_base64 cacheado x{len(paths)}", measure(lambda: _codificar_todos(paths), repeat, warmup=1)))
+        # Modo en línea (data URI) para no escribir archivos en static/
+        mode, logos.LOGO_MODE = logos.LOGO_MODE, "inline"
+        try:
+            results.append(result("logos", f"get_logo_src inline x{len(paths)}", measure(lambda: [get_logo_src(p, 28) for p in paths], repeat, warmup=1)))
+        finally:
+            logos.LOGO_MODE = mode
+            invalidate_logo_cache()
+    return results
+
+
+def main():
+    print_results(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compara el cálculo de distancia mínima original (itertools) con el vectorizado
+
+Uso: python -m benchmarks.bench_min_distance
+"""
+import itertools
+import time
+
+import numpy as np
+
+from benchmarks.common import measure, result
+from utils.charts import min_pairwise_distance
+
+SIZES = [20, 500, 5000]
+
+
+def min_distance_itertools(xs, ys):
+    """Cálculo original de plot_phase_plotly"""
+    coords = list(zip(xs, ys))
+    return min(np.hypot(a[0]-b[0], a[1]-b[1]) for a, b in itertools.combinations(coords, 2))
+
+
+def _medir(func, xs, ys, repeat):
+    """Mejor tiempo (s) de varias ejecuciones"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(xs, ys)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(quick=False):
+    """Casos del cálculo vectorizado para el runner de la suite"""
+    rng = np.random.default_rng(0)
+    results = []
+    for n in SIZES:
+        xs = rng.uniform(5, 14, n)
+        ys = rng.uniform(0.2, 3.0, n)
+        results.append(result("min_distance", f"min_pairwise_distance n={n}", measure(lambda: min_pairwise_distance(xs, ys), 3 if quick else 5)))
+    return results
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'puntos':>8} {'itertools (ms)':>16} {'vectorizado (ms)':>18} {'speedup':>9}  iguales")
+    for n in SIZES:
+        xs = rng.uniform(5, 14, n)
+        ys = rng.uniform(0.2, 3.0, n)
+        repeat = 1 if n >= 5000 else 5
+        t_old, d_old = _medir(min_distance_itertools, xs, ys, repeat)
+        t_new, d_new = _medir(min_pairwise_distance, xs, ys, 5)
+        print(f"{n:>8} {t_old * 1000:>16.2f} {t_new * 1000:>18.2f} {t_old / t_new:>8.1f}x  {d_old == d_new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Ejecución completa de las páginas con AppTest de Streamlit (sin navegador)
+
+Mide la primera carga de cada vista y los reruns posteriores, que son los que ve el usuario.
+Uso: python -m benchmarks.bench_pages
+"""
+import os
+import time
+
+from benchmarks.common import measure, print_results, result
+from utils.team_stats import LEAGUE_SEEDS
+
+# Segundos máximos por ejecución del script
+SCRIPT_TIMEOUT = 120
+
+
+def _run(target):
+    """Ejecuta el script (target es el AppTest o un widget ya modificado) y falla si hay excepción"""
+    app = target.run(timeout=SCRIPT_TIMEOUT)
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return app
+
+
+def _once(func):
+    start = time.perf_counter()
+    func()
+    ms = round((time.perf_counter() - start) * 1000, 3)
+    return {"best_ms": ms, "median_ms": ms, "mean_ms": ms, "repeat": 1}
+
+
+def run(quick=False):
+    from streamlit.testing.v1 import AppTest
+
+    repeat = 2 if quick else 5
+    results = []
+    main_path = os.path.abspath("Main.py")
+
+    app = AppTest.from_file(main_path, default_timeout=SCRIPT_TIMEOUT)
+    results.append(result("pages", "inicio primera carga", _once(lambda: _run(app))))
+    results.append(result("pages", "inicio rerun", measure(lambda: _run(app), repeat)))
+
+    for league in LEAGUE_SEEDS if not quick else list(LEAGUE_SEEDS)[:2]:
+        app = AppTest.from_file(main_path, default_timeout=SCRIPT_TIMEOUT)
+        _run(app)
+        results.append(result("pages", f"liga {league} primera carga",
+                              _once(lambda: _run(app.button(key=f"btn_{league}").click())),
+                              markdown=len(app.markdown), charts=len(app.get("plotly_chart"))))
+        results.append(result("pages", f"liga {league} rerun", measure(lambda: _run(app), repeat)))
+
+        selector = [s for s in app.selectbox if s.key and s.key.startswith("team_selector_")][0]
+        teams = list(selector.options[1:repeat + 1])
+
+        def seleccionar():
+            team = teams.pop(0)
+            teams.append(team)
+            _run([s for s in app.selectbox if s.key and s.key.startswith("team_selector_")][0].set_value(team))
+
+        results.append(result("pages", f"liga {league} cambiar equipo", measure(seleccionar, repeat)))
+
+    radar = AppTest.from_file(os.path.abspath(os.path.join("pages", "radares.py")), default_timeout=SCRIPT_TIMEOUT)
+    results.append(result("pages", "radares primera carga", _once(lambda: _run(radar))))
+    results.append(result("pages", "radares rerun", measure(lambda: _run(radar), repeat)))
+    return results
+
+
+def main():
+    print_results(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compara el modo de una traza por equipo con el modo de traza única en plot_phase_plotly
+
+Mide el tiempo de construcción de la figura y el tamaño del JSON que se envía al navegador.
+Uso: python -m benchmarks.bench_phase_chart
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import measure, result
+from utils.charts import plot_phase_plotly
+from utils.teams import TEAM_REGISTRY
+
+SIZES = [20, 200, 2000]
+
+
+def _datos(n, rng):
+    """Tabla con n equipos (nombres reales repetidos para que se busquen sus logos)"""
+    names = list(TEAM_REGISTRY)
+    teams = [names[i % len(names)] if i < len(names) else f"{names[i % len(names)]} {i}" for i in range(n)]
+    return pd.DataFrame({
+        'Team': teams,
+        'PPDA/90': rng.uniform(5, 14, n),
+        'CtrShots/90': rng.uniform(0.2, 3.0, n),
+    })
+
+
+def _medir(df, single_trace, repeat=3):
+    """Mejor tiempo de construcción (s) y tamaño del JSON (bytes)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = plot_phase_plotly(df, 'PPDA/90', 'CtrShots/90', False, "Transición ofensiva", "#1E88E5",
+                                selected_team=df['Team'].iloc[0], single_trace=single_trace)
+        best = min(best, time.perf_counter() - start)
+    return best, len(fig.to_json()), len(fig.data)
+
+
+def run(quick=False):
+    """Casos del modo de traza única (el que usa la app) para el runner de la suite"""
+    rng = np.random.default_rng(0)
+    results = []
+    for n in SIZES:
+        df = _datos(n, rng)
+        fig = plot_phase_plotly(df, 'PPDA/90', 'CtrShots/90', False, "Transición ofensiva", "#1E88E5", selected_team=df['Team'].iloc[0])
+        stats = measure(lambda: plot_phase_plotly(df, 'PPDA/90', 'CtrShots/90', False, "Transición ofensiva", "#1E88E5",
+                                                  selected_team=df['Team'].iloc[0]), 3 if quick else 5)
+        results.append(result("phase_chart", f"plot_phase_plotly n={n}", stats, json_bytes=len(fig.to_json()), traces=len(fig.data)))
+    return results
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'puntos':>7} {'modo':>10} {'trazas':>7} {'build (ms)':>11} {'JSON (KB)':>10}")
+    for n in SIZES:
+        df = _datos(n, rng)
+        for label, single in (("por equipo", False), ("única", True)):
+            t, size, traces = _medir(df, single, repeat=1 if (n >= 2000 and not single) else 3)
+            print(f"{n:>7} {label:>10} {traces:>7} {t * 1000:>11.1f} {size / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Almacén de jugadores, métricas por jugador, radares y búsqueda de similares con plantillas realistas
+
+create_radar_chart (pages/radares.py) es get_player_metrics x2 + build_radar_figure; se mide ese
+mismo camino porque importar la página ejecuta la interfaz.
+Uso: python -m benchmarks.bench_players
+"""
+import os
+import tempfile
+
+from benchmarks.common import measure, print_results, result
+from benchmarks.synthetic import write_radar_csv
+from utils import arrow_snapshot, data_store, player_store
+from utils.radar import TEAM_COLORS, build_radar_figure, create_radar_batch
+from utils.similarity import find_similar
+
+# Jugadores: dataset actual, cinco ligas (~100 equipos x 25) y varias temporadas
+SIZES = [22, 2500, 25000]
+
+
+def _radar_dos_jugadores(store, a, b):
+    """Mismo trabajo que create_radar_chart"""
+    metrics_a = player_store.get_player_metrics(a[0], a[1], store)
+    metrics_b = player_store.get_player_metrics(b[0], b[1], store)
+    categories = sorted(set(metrics_a) | set(metrics_b))
+    return build_radar_figure(
+        [a[0], b[0]],
+        categories,
+        [[metrics_a.get(c, 0) for c in categories], [metrics_b.get(c, 0) for c in categories]],
+        [TEAM_COLORS['Barcelona'], TEAM_COLORS['Bayern']],
+    )
+
+
+def _casos(n, store, repeat, snapshot_dir):
+    keys = list(store["index"])
+    results = [result("players", f"construir almacén n={n}", measure(lambda: player_store._build_store(store["signature"]), max(1, repeat // 3)))]
+    arrow_snapshot.write_snapshot(snapshot_dir)
+    results.append(result("players", f"leer instantánea Arrow n={n}",
+                          measure(lambda: arrow_snapshot.read_player_store(snapshot_dir), repeat),
+                          size_kb=round(sum(os.path.getsize(os.path.join(snapshot_dir, arrow_snapshot.FILES[name]))
+                                            for name in ("players", "player_metrics")) / 1024)))
+    lookup_keys = keys[:1000]
+    results.append(result("players", f"get_player_metrics x{len(lookup_keys)} n={n}",
+                          measure(lambda: [player_store.get_player_metrics(p, t, store) for p, t in lookup_keys], repeat)))
+    results.append(result("players", f"radar 2 jugadores n={n}", measure(lambda: _radar_dos_jugadores(store, keys[0], keys[1]), repeat)))
+    results.append(result("players", f"radar 11 jugadores n={n}", measure(lambda: create_radar_batch(keys[:11], store=store), repeat)))
+    results.append(result("players", f"find_similar k=10 n={n}", measure(lambda: find_similar(*keys[0], k=10, store=store), repeat, warmup=1)))
+    return results
+
+
+def run(quick=False):
+    repeat = 3 if quick else 10
+    results = []
+    saved = (data_store.DATA_DIR, player_store.RADAR_CSV_PATH, arrow_snapshot.SNAPSHOT_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Carpeta Parquet vacía para que el almacén lea el CSV indicado
+        data_store.DATA_DIR = os.path.join(tmp, "parquet")
+        arrow_snapshot.SNAPSHOT_DIR = os.path.join(tmp, "snapshot")
+        try:
+            for n in SIZES[:2] if quick else SIZES:
+                if n == SIZES[0]:
+                    player_store.RADAR_CSV_PATH = saved[1]
+                else:
+                    player_store.RADAR_CSV_PATH = write_radar_csv(os.path.join(tmp, f"radares_{n}.csv"), n_players=n)
+                player_store.invalidate_player_store()
+                results.extend(_casos(n, player_store.get_player_store(), repeat, arrow_snapshot.SNAPSHOT_DIR))
+        finally:
+            data_store.DATA_DIR, player_store.RADAR_CSV_PATH, arrow_snapshot.SNAPSHOT_DIR = saved
+            player_store.invalidate_player_store()
+    return results
+
+
+def main():
+    print_results(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Memoria con varias sesiones abiertas a la vez (AppTest de Streamlit en el mismo proceso)
+
+Cada sesión abre la vista de una liga distinta; los datos vienen de la instantánea compartida,
+así que la memoria por sesión debería ser solo la de sus elementos de interfaz.
+Uso: python -m benchmarks.bench_sessions
+"""
+import gc
+import os
+import time
+
+from benchmarks.bench_pages import SCRIPT_TIMEOUT, _run
+from benchmarks.common import print_results, result
+from utils.team_stats import LEAGUE_SEEDS
+
+
+def rss_mb():
+    """Memoria residente actual del proceso (MB; solo Linux)"""
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmRSS:")) / 1024
+
+
+def run(quick=False):
+    from streamlit.testing.v1 import AppTest
+    from utils.snapshot import snapshot_info
+
+    if not os.path.exists("/proc/self/status"):
+        return []
+    main_path = os.path.abspath("Main.py")
+    leagues = list(LEAGUE_SEEDS)
+    results = []
+
+    # Primera sesión aparte: importa módulos y construye la instantánea
+    warm = AppTest.from_file(main_path, default_timeout=SCRIPT_TIMEOUT)
+    _run(_run(warm).button(key=f"btn_{leagues[0]}").click())
+
+    sessions = []
+    gc.collect()
+    base = rss_mb()
+    for n in (3, 10) if quick else (5, 20, 50):
+        start = time.perf_counter()
+        while len(sessions) < n:
+            app = AppTest.from_file(main_path, default_timeout=SCRIPT_TIMEOUT)
+            league = leagues[len(sessions) % len(leagues)]
+            sessions.append(_run(_run(app).button(key=f"btn_{league}").click()))
+        ms = round((time.perf_counter() - start) * 1000, 3)
+        gc.collect()
+        growth = rss_mb() - base
+        results.append(result("sessions", f"{n} sesiones abiertas", {"best_ms": ms, "median_ms": ms, "mean_ms": ms, "repeat": 1},
+                              rss_growth_mb=round(growth, 1), mb_per_session=round(growth / n, 2),
+                              snapshot_version=snapshot_info()["version"]))
+    return results
+
+
+def main():
+    results = run()
+    print_results(results)
+    for r in results:
+        print(f"{r['case']}: +{r['rss_growth_mb']} MB ({r['mb_per_session']} MB por sesión)")
+
+
+if __name__ == "__main__":
+    main()
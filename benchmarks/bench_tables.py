@@ -0,0 +1,107 @@
+"""Extracción de una tabla de una página grande de FBref: pd.read_html vs DOM de lxml vs streaming
+
+La memoria se mide como pico de RSS de un proceso nuevo por método (lxml reserva fuera de Python y
+tracemalloc no la ve).
+Uso: python -m benchmarks.bench_tables
+"""
+import io
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from benchmarks.common import measure, print_results, result
+from benchmarks.synthetic import fbref_page_html
+
+# Código de cada método; lee la página de la ruta en argv[1]
+METHODS = {
+    # Lo que hacía el notebook: todas las tablas de la página y se elige una
+    "pd.read_html": "import pandas as pd; pd.read_html(sys.argv[1], attrs={'id': 'stats_standard'})",
+    "DOM lxml + read_html": "from utils.fbref import find_table_html; from benchmarks.bench_tables import parse_table_html; "
+                            "parse_table_html(find_table_html(open(sys.argv[1], 'rb').read(), 'stats_standard'))",
+    "streaming": "from utils.fbref import extract_table; extract_table(open(sys.argv[1], 'rb').read(), 'stats_standard')",
+}
+
+# En Linux se reinicia el pico de RSS (VmHWM) tras los imports para medir solo la extracción
+_RSS_CODE = """
+import sys
+{imports}
+def kb(field):
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(field))
+with open("/proc/self/clear_refs", "w") as f:
+    f.write("5")
+before = kb("VmRSS:")
+{code}
+print((kb("VmHWM:") - before) / 1024)
+"""
+
+
+def clean_table(df):
+    """Limpieza del notebook: un solo nivel de columnas, 'Player' -> 'Jugador' y sin cabeceras repetidas"""
+    if isinstance(df.columns, pd.MultiIndex):
+        top = df.columns.get_level_values(0)
+        df.columns = df.columns.droplevel(0)
+        # Las columnas repetidas (p. ej. 'Gls' total y 'Gls' por 90) se distinguen con su grupo
+        duplicated = df.columns.duplicated(keep="first")
+        df.columns = [f"{name} ({group})" if dup else name for name, group, dup in zip(df.columns, top, duplicated)]
+    df = df.rename(columns={"Player": "Jugador"})
+    if "Jugador" in df.columns:
+        df = df[df["Jugador"] != "Jugador"]
+        df = df[df["Jugador"] != "Player"]
+    return df.reset_index(drop=True)
+
+
+def parse_table_html(table_html):
+    """Camino anterior al streaming (solo para comparar): pd.read_html sobre el HTML de la tabla y limpieza"""
+    return clean_table(pd.read_html(io.StringIO(table_html))[0])
+
+
+def peak_rss_mb(code, path):
+    """Memoria máxima (MB) que añade la extracción en un proceso nuevo (None fuera de Linux)"""
+    if not os.path.exists("/proc/self/clear_refs"):
+        return None
+    statements = code.split("; ")
+    imports = "\n".join(part for part in statements if part.startswith(("import", "from")))
+    body = "\n".join(part for part in statements if not part.startswith(("import", "from")))
+    proc = subprocess.run([sys.executable, "-c", _RSS_CODE.format(imports=imports, code=body), path],
+                          capture_output=True, text=True, check=True, cwd=os.getcwd())
+    return round(float(proc.stdout.strip().splitlines()[-1]), 1)
+
+
+def run(quick=False):
+    from utils.fbref import extract_table, find_table_html
+
+    repeat = 1 if quick else 3
+    results = []
+    sizes = [(10, 500)] if quick else [(10, 500), (30, 2000)]
+    for n_tables, rows in sizes:
+        for commented in (False, True):
+            html = fbref_page_html(n_tables=n_tables, rows=rows, commented=commented)
+            label = f"{n_tables} tablas x {rows} filas{' (comentada)' if commented else ''}"
+            with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as f:
+                f.write(html)
+            try:
+                funcs = {
+                    "DOM lxml + read_html": lambda: parse_table_html(find_table_html(html, "stats_standard")),
+                    "streaming": lambda: extract_table(html, "stats_standard"),
+                }
+                if not commented:
+                    # read_html no ve las tablas comentadas
+                    funcs = {"pd.read_html": lambda: pd.read_html(io.BytesIO(html), attrs={"id": "stats_standard"}), **funcs}
+                for method, func in funcs.items():
+                    results.append(result("tables", f"{method} {label}", measure(func, repeat),
+                                          peak_rss_mb=peak_rss_mb(METHODS[method], f.name), page_mb=round(len(html) / 1e6, 1)))
+            finally:
+                os.unlink(f.name)
+    return results
+
+
+def main():
+    print_results(run())
+
+
+if __name__ == "__main__":
+    main()
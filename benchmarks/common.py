@@ -0,0 +1,89 @@
+"""Utilidades comunes de los benchmarks: medición, resultados en JSON y comparación entre ejecuciones"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Carpeta por defecto de los resultados (un JSON por ejecución)
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+
+def measure(func, repeat=5, warmup=0):
+    """Ejecuta func varias veces y devuelve los tiempos en ms (mejor, mediana y media)"""
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        "best_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "mean_ms": round(statistics.fmean(times), 3),
+        "repeat": repeat,
+    }
+
+
+def result(benchmark, case, stats, **extra):
+    """Registro de un caso medido"""
+    return {"benchmark": benchmark, "case": case, **stats, **extra}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def metadata():
+    """Entorno de la ejecución, para poder comparar resultados de distintas máquinas y commits"""
+    import numpy
+    import pandas
+    import plotly
+    import streamlit
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "versions": {
+            "numpy": numpy.__version__,
+            "pandas": pandas.__version__,
+            "plotly": plotly.__version__,
+            "streamlit": streamlit.__version__,
+        },
+    }
+
+
+def write_results(results, path):
+    """Guarda los resultados con los metadatos de la ejecución"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": metadata(), "results": results}, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_results(results, baseline=None):
+    """Tabla de resultados; con baseline añade la variación de la mediana respecto a otra ejecución"""
+    previous = {}
+    if baseline:
+        previous = {(r["benchmark"], r["case"]): r for r in baseline["results"]}
+    print(f"{'benchmark':<16} {'caso':<40} {'mejor (ms)':>11} {'mediana (ms)':>13}" + ("   vs base" if baseline else ""))
+    for r in results:
+        line = f"{r['benchmark']:<16} {r['case']:<40} {r['best_ms']:>11.2f} {r['median_ms']:>13.2f}"
+        base = previous.get((r["benchmark"], r["case"]))
+        if base and base["median_ms"]:
+            line += f"   {(r['median_ms'] / base['median_ms'] - 1) * 100:+7.1f}%"
+        print(line)
@@ -0,0 +1,104 @@
+"""Informe de tiempo de importación (python -X importtime) de cada vista de la app
+
+Se extraen con ast los imports de nivel superior de Main.py (lo que paga un arranque en frío antes
+de pintar la portada) y se ejecutan en un proceso nuevo; después, los que añade la vista de liga y
+los de la página de radares.
+Uso: python -m benchmarks.import_time [--top 15]
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+from benchmarks.common import print_results, result
+
+# Módulos que la vista de liga importa al abrirse (además de los de la portada)
+LEAGUE_VIEW_IMPORTS = [
+    "import utils.league_bundle",
+    "import utils.rankings",
+    "import utils.team_styles",
+    "import utils.html_blocks",
+]
+
+
+def top_level_imports(path):
+    """Sentencias import de nivel superior de un script"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def _importtime(code):
+    """Líneas de nivel superior de -X importtime: [(módulo, ms acumulados)]"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, cwd=os.getcwd())
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        # Sin sangría = importado directamente por el código (no por otro módulo)
+        if not name.startswith("  "):
+            rows.append((name.strip(), int(cumulative) / 1000))
+    return rows
+
+
+def importtime(statements, repeat=3):
+    """Mejor de varias ejecuciones en frío: (ms totales, {paquete raíz: ms acumulados})
+
+    Se descuentan los módulos que el intérprete importa siempre al arrancar.
+    """
+    startup = {name for name, _ in _importtime("pass")}
+    best = None
+    for _ in range(repeat):
+        packages = {}
+        for name, ms in _importtime("\n".join(statements)):
+            if name in startup:
+                continue
+            root = name.split(".")[0]
+            packages[root] = packages.get(root, 0) + ms
+        total = sum(packages.values())
+        if best is None or total < best[0]:
+            best = (total, packages)
+    return best
+
+
+def views():
+    """Imports de cada vista (acumulativos: la vista de liga parte de la portada)"""
+    home = top_level_imports("Main.py")
+    return {
+        "portada": home,
+        "vista de liga": home + LEAGUE_VIEW_IMPORTS,
+        "radares": top_level_imports(os.path.join("pages", "radares.py")),
+    }
+
+
+def run(quick=False):
+    results = []
+    for view, statements in views().items():
+        total, _ = importtime(statements, repeat=1 if quick else 3)
+        ms = round(total, 3)
+        results.append(result("imports", f"importación {view}", {"best_ms": ms, "median_ms": ms, "mean_ms": ms, "repeat": 1}))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de importación en frío de cada vista")
+    parser.add_argument("--top", type=int, default=15, help="Paquetes más lentos que se listan por vista")
+    args = parser.parse_args()
+
+    results = []
+    for view, statements in views().items():
+        total, packages = importtime(statements)
+        results.append(result("imports", f"importación {view}", {"best_ms": round(total, 3), "median_ms": round(total, 3), "mean_ms": round(total, 3), "repeat": 3}))
+        print(f"\n{view}: {total:.0f} ms")
+        for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {name:<28} {ms:>8.1f} ms")
+    print()
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
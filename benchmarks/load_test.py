@@ -0,0 +1,166 @@
+"""Prueba de carga del modo multiproceso (utils.serve): reruns por segundo con 1, 2, 4... workers
+
+Cada cliente simulado habla el protocolo de Streamlit por WebSocket a través del balanceador:
+abre la portada, entra en una liga (rotando entre las cinco) y repite reruns de la vista de liga,
+que es la que construye y serializa las gráficas. Se mide el rendimiento total, la latencia de
+cada rerun y la memoria (PSS) de los workers, que comparten las tablas mapeadas.
+Uso: python -m benchmarks.load_test --workers 1 2 4 --clients 16 --duration 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.common import print_results, result, write_results
+from utils.serve import make_balancer, start_workers, stop_workers, wait_healthy
+from utils.shared_tables import export_tables
+from utils.team_stats import LEAGUE_SEEDS
+
+# Puerto del balanceador y primer puerto de los workers durante la prueba
+BALANCER_PORT = 8700
+WORKER_PORT = 8710
+
+
+def pss_mb(pid):
+    """Memoria proporcional del proceso (las páginas compartidas cuentan dividido entre quienes las usan)"""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("Pss:")) / 1024
+    except (OSError, StopIteration):
+        return None
+
+
+async def _script_run(ws, widget_states=None):
+    """Pide un rerun y espera a que termine; devuelve los botones pintados {key: id de widget}"""
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    msg.rerun_script.page_script_hash = ""
+    if widget_states is not None:
+        msg.rerun_script.widget_states.CopyFrom(widget_states)
+    await ws.send(msg.SerializeToString())
+
+    buttons = {}
+    while True:
+        forward = ForwardMsg()
+        forward.ParseFromString(await ws.recv())
+        kind = forward.WhichOneof("type")
+        if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+            element = forward.delta.new_element
+            if element.WhichOneof("type") == "button":
+                # El id del widget termina en la key ("$$ID-<hash>-btn_<liga>")
+                buttons[element.button.id.split("-", 2)[-1]] = element.button.id
+        # Tras un st.rerun() llega un script_finished intermedio: se espera al definitivo
+        if kind == "script_finished" and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+            return buttons
+
+
+async def _client(url, league, deadline, latencies):
+    import websockets
+    from streamlit.proto.WidgetStates_pb2 import WidgetStates
+
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        buttons = await _script_run(ws)
+        click = WidgetStates()
+        widget = click.widgets.add()
+        widget.id = buttons[f"btn_{league}"]
+        widget.trigger_value = True
+        await _script_run(ws, click)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            await _script_run(ws)
+            latencies.append(time.perf_counter() - start)
+
+
+async def _load(url, clients, duration):
+    leagues = list(LEAGUE_SEEDS)
+    latencies = []
+    # Calentamiento: cada worker construye sus bundles antes de medir
+    await asyncio.gather(*(_client(url, leagues[i % len(leagues)], time.monotonic(), []) for i in range(clients)))
+    start = time.monotonic()
+    await asyncio.gather(*(_client(url, leagues[i % len(leagues)], start + duration, latencies) for i in range(clients)))
+    return latencies, time.monotonic() - start
+
+
+def _balancer_thread(ports, balance):
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    async def arrancar():
+        server = await asyncio.start_server(make_balancer(ports, balance), "127.0.0.1", BALANCER_PORT)
+        ready.set()
+        async with server:
+            try:
+                await server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(arrancar(),), name="balancer", daemon=True)
+    thread.start()
+    ready.wait(10)
+    return loop
+
+
+def run_case(n_workers, clients, duration, shared_dir, balance="sticky"):
+    workers = start_workers(n_workers, WORKER_PORT, shared_dir=shared_dir)
+    loop = None
+    try:
+        wait_healthy(workers)
+        loop = _balancer_thread([port for port, _ in workers], balance)
+        latencies, elapsed = asyncio.run(_load(f"ws://127.0.0.1:{BALANCER_PORT}/_stcore/stream", clients, duration))
+        pss = [pss_mb(process.pid) for _, process in workers]
+    finally:
+        if loop is not None:
+            loop.call_soon_threadsafe(lambda: [task.cancel() for task in asyncio.all_tasks(loop)])
+        stop_workers(workers)
+
+    ms = sorted(latency * 1000 for latency in latencies) or [0.0]
+    stats = {
+        "best_ms": round(ms[0], 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "repeat": len(latencies),
+    }
+    known = [p for p in pss if p is not None]
+    return result("load", f"{n_workers} workers, {clients} clientes", stats,
+                  reruns_per_s=round(len(latencies) / elapsed, 2),
+                  p95_ms=round(ms[int(len(ms) * 0.95) - 1 if len(ms) > 1 else 0], 3),
+                  pss_mb_per_worker=round(statistics.fmean(known), 1) if known else None,
+                  cpu_count=len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del modo multiproceso")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20, help="Segundos de medición por caso")
+    parser.add_argument("--balance", choices=("sticky", "round-robin"), default="sticky")
+    parser.add_argument("--output", default=None, help="Guardar los resultados en este JSON")
+    args = parser.parse_args()
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"Núcleos disponibles: {cores}")
+    if max(args.workers) > cores:
+        # Con más workers que núcleos los procesos se reparten la misma CPU: no se verá escalado
+        print(f"⚠️ Más workers ({max(args.workers)}) que núcleos ({cores}): el rendimiento no puede escalar")
+
+    results = []
+    with tempfile.TemporaryDirectory() as shared_dir:
+        export_tables(shared_dir)
+        for n in args.workers:
+            results.append(run_case(n, args.clients, args.duration, shared_dir, args.balance))
+            r = results[-1]
+            print(f"✅ {r['case']}: {r['reruns_per_s']} reruns/s, p50 {r['median_ms']:.0f} ms, p95 {r['p95_ms']:.0f} ms, "
+                  f"PSS {r['pss_mb_per_worker']} MB/worker ({r['cpu_count']} núcleos)")
+    print_results(results)
+    if args.output:
+        write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
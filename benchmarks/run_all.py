@@ -0,0 +1,51 @@
+"""Ejecuta toda la suite de benchmarks y guarda los resultados en JSON
+
+Uso:
+    python -m benchmarks.run_all                      # todo, resultados en benchmarks/results/<fecha>.json
+    python -m benchmarks.run_all --quick --only pages # subconjunto rápido
+    python -m benchmarks.run_all --compare benchmarks/results/anterior.json
+"""
+import argparse
+import importlib
+import os
+import time
+
+from benchmarks.common import RESULTS_DIR, load_results, print_results, write_results
+
+# Módulos de la suite (cada uno expone run(quick) -> lista de resultados)
+SUITES = {
+    "loaders": "benchmarks.bench_loaders",
+    "logos": "benchmarks.bench_logos",
+    "phase_chart": "benchmarks.bench_phase_chart",
+    "min_distance": "benchmarks.bench_min_distance",
+    "players": "benchmarks.bench_players",
+    "pages": "benchmarks.bench_pages",
+    "tables": "benchmarks.bench_tables",
+    "sessions": "benchmarks.bench_sessions",
+    "imports": "benchmarks.import_time",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de ScoutVision")
+    parser.add_argument("--only", nargs="*", choices=list(SUITES), default=None)
+    parser.add_argument("--quick", action="store_true", help="Menos repeticiones y tamaños")
+    parser.add_argument("--output", default=None, help="Ruta del JSON de resultados")
+    parser.add_argument("--compare", default=None, help="JSON de una ejecución anterior con la que comparar")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.only or SUITES:
+        start = time.perf_counter()
+        module = importlib.import_module(SUITES[name])
+        results.extend(module.run(quick=args.quick))
+        print(f"✅ {name} ({time.perf_counter() - start:.1f} s)")
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    write_results(results, output)
+    print_results(results, load_results(args.compare) if args.compare else None)
+    print(f"Resultados en {output}")
+
+
+if __name__ == "__main__":
+    main()
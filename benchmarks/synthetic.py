@@ -0,0 +1,110 @@
+"""Generadores de datos sintéticos con el tamaño del dataset real de las cinco ligas"""
+import os
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw
+
+from utils.team_stats import TEAM_METRIC_RANGES, TEAM_METRICS
+from utils.teams import TEAM_REGISTRY
+
+# Cinco ligas de ~20 equipos
+LEAGUES = ["La Liga Española", "Premier League", "Serie A", "Bundesliga", "Ligue 1"]
+
+# Posiciones del CSV de radares
+POSITIONS = ["GK", "CB", "RB", "LB", "CM-CDM", "CAM", "W", "ST"]
+
+# Jugadores por equipo en una plantilla típica
+PLAYERS_PER_TEAM = 25
+
+
+def team_names(n):
+    """n nombres de equipo: primero los reales (para que tengan logo) y después sintéticos"""
+    names = list(TEAM_REGISTRY)
+    return [names[i] if i < len(names) else f"Equipo {i}" for i in range(n)]
+
+
+def team_stats_frame(n_teams=96, seed=0):
+    """Tabla de estadísticas por equipo con las mismas columnas y rangos que load_team_stats"""
+    rng = np.random.default_rng(seed)
+    lows = np.array([low for _, low, _ in TEAM_METRIC_RANGES])
+    highs = np.array([high for _, _, high in TEAM_METRIC_RANGES])
+    df = pd.DataFrame(rng.uniform(lows, highs, (n_teams, len(TEAM_METRICS))), columns=TEAM_METRICS)
+    df.insert(0, 'Team', team_names(n_teams))
+    df['League'] = [LEAGUES[i % len(LEAGUES)] for i in range(n_teams)]
+    return df
+
+
+def radar_wide_table(n_players=2500, n_metrics=120, metrics_per_player=9, seed=0):
+    """Tabla ancha con el formato del CSV de radares ('Metrica i', 'Valor Original i', 'Valor Normalizado i')"""
+    rng = np.random.default_rng(seed)
+    metric_names = np.array([f"Métrica {j}/90" for j in range(n_metrics)])
+    n_teams = max(1, n_players // PLAYERS_PER_TEAM)
+    teams = team_names(n_teams)
+    data = {
+        'Jugador': [f"Jugador {i}" for i in range(n_players)],
+        'Equipo': [teams[i % n_teams] for i in range(n_players)],
+        'Posicion': rng.choice(POSITIONS, n_players),
+    }
+    # Cada jugador tiene su propio subconjunto de métricas, como en el CSV real
+    chosen = np.argsort(rng.random((n_players, n_metrics)), axis=1)[:, :metrics_per_player]
+    for i in range(metrics_per_player):
+        data[f'Metrica {i + 1}'] = metric_names[chosen[:, i]]
+        data[f'Valor Original {i + 1}'] = np.round(rng.gamma(2.0, 2.0, n_players), 2)
+        data[f'Valor Normalizado {i + 1}'] = np.round(rng.uniform(0, 100, n_players), 1)
+    return pd.DataFrame(data)
+
+
+def write_radar_csv(path, **kwargs):
+    """Escribe una tabla de radares sintética con el mismo separador que el CSV real"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    radar_wide_table(**kwargs).to_csv(path, sep=';', index=False)
+    return path
+
+
+def write_logo_files(directory, n=100, size=400):
+    """Escribe n logos PNG de size x size (tamaño típico de los escudos del repo)"""
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(n):
+        path = os.path.join(directory, f"logo_{i}.png")
+        # Escudo simple (fondo transparente, dos colores) para que el PNG comprima como uno real
+        image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        colors = [tuple(int(c) for c in rng.integers(0, 255, 3)) + (255,) for _ in range(2)]
+        draw.ellipse((size // 10, size // 10, size - size // 10, size - size // 10), fill=colors[0])
+        draw.rectangle((size // 3, size // 4, 2 * size // 3, 3 * size // 4), fill=colors[1])
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def fbref_page_html(n_tables=30, rows=2000, table_id="stats_standard", commented=False, seed=0):
+    """Página de competición al estilo FBref: n_tables tablas de jugadores con cabecera de dos niveles
+
+    La tabla buscada (table_id) queda en medio de la página y, si commented, dentro de un comentario HTML.
+    """
+    rng = np.random.default_rng(seed)
+    header = ("<tr class='over_header'><th colspan='4'></th><th colspan='3'>Performance</th><th colspan='3'>Per 90 Minutes</th></tr>"
+              "<tr><th>Player</th><th>Nation</th><th>Pos</th><th>90s</th><th>Gls</th><th>Ast</th><th>Min</th>"
+              "<th>Gls</th><th>Ast</th><th>xG</th></tr>")
+    parts = ["<html><head><title>Player Stats</title></head><body>"]
+    for t in range(n_tables):
+        body = []
+        for i in range(rows):
+            # FBref repite la cabecera cada 25 filas
+            if i and i % 25 == 0:
+                body.append(header.replace("<tr>", "<tr class='thead'>", 1).split("</tr>", 1)[1])
+            body.append(
+                f"<tr><th data-stat='player'><a href='/en/players/{i}'>Jugador {i}</a></th><td>es ESP</td>"
+                f"<td>{POSITIONS[i % len(POSITIONS)]}</td><td>{rng.uniform(0, 38):.1f}</td><td>{rng.integers(0, 30)}</td>"
+                f"<td>{rng.integers(0, 20)}</td><td>{rng.integers(0, 3420):,}</td><td>{rng.random():.2f}</td>"
+                f"<td>{rng.random():.2f}</td><td>{rng.random():.1f}</td></tr>"
+            )
+        target = t == n_tables // 2
+        table = (f"<table id='{table_id if target else f'stats_other_{t}'}' class='stats_table'>"
+                 f"<thead>{header}</thead><tbody>{''.join(body)}</tbody></table>")
+        parts.append(f"<div><!--\n{table}\n--></div>" if target and commented else f"<div>{table}</div>")
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
@@ -1,105 +1,60 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import numpy as np
+from utils.player_store import get_player_store, get_player_metrics as lookup_player_metrics
+from utils.radar import PLAYER_PALETTE, TEAM_COLORS, build_radar_figure, create_radar_batch, create_radar_grid, lineup_pairs
+from utils.similarity import SIMILARITY_METRICS, find_similar
+from utils.profiler import finish_rerun, profiled, start_rerun
+from utils.snapshot import pin_snapshot, release_snapshot
 
-def load_player_data():
-    return pd.read_csv(r'C:/Users/zyadb/Desktop/LINKEDIN/DatosLinkedin/radares_nico_williams.csv', sep=';')
-
-def get_player_metrics(df, player_name, team):
+def get_player_metrics(player_name, team, store=None):
+    # Búsqueda O(1) por (jugador, equipo) en el almacén de métricas (cargado una vez por proceso)
     try:
-        player_data = df[(df['Jugador'].str.strip() == player_name) & \
-                        (df['Equipo'] == team)]
-        if len(player_data) == 0:
+        metrics = lookup_player_metrics(player_name, team, store)
+        if metrics is None:
             st.error(f"No se encontraron datos para {player_name} en {team}")
-            return None
-        player_data = player_data.iloc[0]
-        metrics = {}
-        for i in range(1, 10):  # 9 métricas posibles
-            metric_name = player_data[f'Metrica {i}']
-            metric_value = player_data[f'Valor Normalizado {i}']
-            if pd.notna(metric_name) and pd.notna(metric_value):
-                try:
-                    value = float(str(metric_value).replace(',', '.'))
-                    value = max(0, min(100, value))
-                    metrics[metric_name] = value
-                except:
-                    continue
         return metrics
     except Exception as e:
         st.error(f"Error al obtener métricas para {player_name}: {str(e)}")
         return None
 
-def create_radar_chart(barca_player: str, bayern_player: str, position: str, chart_id: str = None):
-    df = load_player_data()
+@profiled()
+def create_radar_chart(barca_player: str, bayern_player: str, position: str, chart_id: str = None,
+                       barca_team: str = 'Barcelona', bayern_team: str = 'Bayern'):
+    store = get_player_store()
     try:
-        metrics_barca = get_player_metrics(df, barca_player, 'Barcelona')
-        metrics_bayern = get_player_metrics(df, bayern_player, 'Bayern')
+        metrics_barca = get_player_metrics(barca_player, barca_team, store)
+        metrics_bayern = get_player_metrics(bayern_player, bayern_team, store)
         if not metrics_barca or not metrics_bayern:
             st.error(f"No se pudieron obtener métricas para la comparación {barca_player} vs {bayern_player}")
             st.write("Datos disponibles en el CSV:")
-            st.write(df[['Jugador', 'Equipo']].to_dict('records'))
+            st.write(store["players"][['Jugador', 'Equipo']].to_dict('records'))
             return None
         all_categories = set(metrics_barca.keys()) | set(metrics_bayern.keys())
         categories = sorted(list(all_categories))
         barca_values = [metrics_barca.get(cat, 0) for cat in categories]
         bayern_values = [metrics_bayern.get(cat, 0) for cat in categories]
-        barca_values.append(barca_values[0])
-        bayern_values.append(bayern_values[0])
-        categories_closed = categories + [categories[0]]
-        fig = go.Figure()
-        fig.add_trace(go.Scatterpolar(
-            r=barca_values,
-            theta=categories_closed,
-            fill='toself',
-            name=barca_player,
-            line_color='#004D98',
-            fillcolor='rgba(0, 77, 152, 0.3)',
-            connectgaps=True,
-            line=dict(color='#004D98', width=2)
-        ))
-        fig.add_trace(go.Scatterpolar(
-            r=bayern_values,
-            theta=categories_closed,
-            fill='toself',
-            name=bayern_player,
-            line_color='#DC052D',
-            fillcolor='rgba(220, 5, 45, 0.3)',
-            connectgaps=True,
-            line=dict(color='#DC052D', width=2)
-        ))
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 100],
-                    gridcolor='rgba(128, 128, 128, 0.3)',
-                    gridwidth=1
-                ),
-                angularaxis=dict(
-                    direction='clockwise',
-                    rotation=90,
-                    gridcolor='rgba(128, 128, 128, 0.3)',
-                    gridwidth=1,
-                    linecolor='rgba(128, 128, 128, 0.6)',
-                    linewidth=1
-                ),
-                bgcolor='rgba(255, 255, 255, 0.9)'
-            ),
-            showlegend=True,
-            height=350,
-            margin=dict(t=20, b=20, l=20, r=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
+        return build_radar_figure(
+            [barca_player, bayern_player],
+            categories,
+            [barca_values, bayern_values],
+            [TEAM_COLORS.get(barca_team, PLAYER_PALETTE[0]), TEAM_COLORS.get(bayern_team, PLAYER_PALETTE[1])]
         )
-        return fig
     except Exception as e:
         st.error(f"Error al crear el gráfico para {barca_player} vs {bayern_player}: {str(e)}")
         return None
 
+def avisar_sin_metricas(missing):
+    # Los jugadores sin métricas no aparecen en el radar: se avisa en lugar de omitirlos en silencio
+    if missing:
+        st.warning("Sin métricas (no aparecen en el radar): " + ", ".join(f"{player} ({team})" for player, team in missing))
+
 # --- INTERFAZ PRINCIPAL ---
+# Perfilado del rerun (solo si SCOUTVISION_PROFILE=1)
+start_rerun("radares")
+
+# Almacén de jugadores fijo durante el rerun
+pin_snapshot()
+
 st.title("Comparativa de Radares Barça vs Bayern")
-df = load_player_data()
 
 # Selección de jugadores
 barca_players = ['Nico Williams']
@@ -116,4 +71,58 @@ with col3:
 if st.button("Mostrar Radar"):
     fig = create_radar_chart(barca_player, bayern_player, position)
     if fig:
-        st.plotly_chart(fig, use_container_width=True) 
\ No newline at end of file
+        st.plotly_chart(fig, use_container_width=True)
+
+# --- COMPARACIÓN POR LOTES ---
+st.markdown("---")
+st.subheader("Comparación por lotes")
+store = get_player_store()
+player_keys = list(zip(store["players"]['Jugador'], store["players"]['Equipo']))
+
+modo = st.radio("Modo", ["Alineación por posiciones", "Varios jugadores en un radar"], horizontal=True)
+if modo == "Alineación por posiciones":
+    equipos = sorted(store["players"]['Equipo'].unique())
+    col1, col2 = st.columns(2)
+    with col1:
+        team_a = st.selectbox("Equipo A", equipos, index=equipos.index('Barcelona') if 'Barcelona' in equipos else 0)
+    with col2:
+        team_b = st.selectbox("Equipo B", equipos, index=equipos.index('Bayern') if 'Bayern' in equipos else 0)
+    if st.button("Mostrar alineación"):
+        fig, missing = create_radar_grid(lineup_pairs(team_a, team_b, store), store=store)
+        avisar_sin_metricas(missing)
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.warning(f"No hay jugadores de {team_a} y {team_b} en las mismas posiciones")
+else:
+    seleccion = st.multiselect("Jugadores", player_keys, format_func=lambda key: f"{key[0]} ({key[1]})", max_selections=11)
+    if seleccion:
+        fig, missing = create_radar_batch(seleccion, store=store)
+        avisar_sin_metricas(missing)
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+
+# --- JUGADORES SIMILARES ---
+st.markdown("---")
+st.subheader("Jugadores similares")
+col1, col2, col3 = st.columns([2, 1, 1])
+with col1:
+    objetivo = st.selectbox("Jugador de referencia", player_keys, format_func=lambda key: f"{key[0]} ({key[1]})", key="similar_player")
+with col2:
+    distancia = st.radio("Distancia", SIMILARITY_METRICS, format_func=lambda m: "Coseno" if m == "cosine" else "Euclídea", key="similar_metric")
+with col3:
+    k = st.number_input("Resultados", min_value=1, max_value=50, value=5, key="similar_k")
+    misma_posicion = st.checkbox("Misma posición", value=True, key="similar_position")
+
+similares = find_similar(objetivo[0], objetivo[1], k=int(k), metric=distancia, same_position=misma_posicion, store=store)
+if similares is None or similares.empty:
+    st.info("No hay jugadores comparables con ese filtro")
+else:
+    st.dataframe(similares, use_container_width=True, hide_index=True)
+    candidato = st.selectbox("Comparar con", list(zip(similares['Jugador'], similares['Equipo'])), format_func=lambda key: f"{key[0]} ({key[1]})", key="similar_compare")
+    fig = create_radar_chart(objetivo[0], candidato[0], "", barca_team=objetivo[1], bayern_team=candidato[1])
+    if fig:
+        st.plotly_chart(fig, use_container_width=True)
+
+release_snapshot()
+finish_rerun()
@@ -0,0 +1,55 @@
+import functools
+import http.server
+import os
+import shutil
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Páginas de FBref grabadas (con la misma ruta que en fbref.com)
+FIXTURE_SITE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "fbref")
+
+# Equipo y temporada de las páginas grabadas
+SQUAD = ("Barcelona", "206d90db", "2024-2025")
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fbref_site(tmp_path):
+    """Servidor HTTP local con una copia de las páginas grabadas; devuelve (url base, carpeta servida)"""
+    site = tmp_path / "site"
+    shutil.copytree(FIXTURE_SITE, site)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_Handler, directory=str(site)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}", site
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def ingest_env(tmp_path, monkeypatch, fbref_site):
+    """Almacén Parquet, caché HTTP y manifiesto en carpetas temporales, apuntando FBref al servidor local"""
+    from utils import arrow_snapshot, data_store, fbref, refresh
+
+    base_url, _ = fbref_site
+    monkeypatch.setattr(data_store, "DATA_DIR", str(tmp_path / "parquet"))
+    monkeypatch.setattr(fbref, "HTTP_CACHE_DIR", str(tmp_path / "http_cache"))
+    monkeypatch.setattr(fbref, "FBREF_BASE_URL", base_url)
+    monkeypatch.setattr(fbref, "DEFAULT_MIN_INTERVAL", 0)
+    monkeypatch.setattr(refresh, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(arrow_snapshot, "SNAPSHOT_DIR", str(tmp_path / "snapshot"))
+    data_store.invalidate_dataset()
+    yield tmp_path
+    data_store.invalidate_dataset()
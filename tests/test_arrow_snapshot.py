@@ -0,0 +1,32 @@
+import os
+
+from utils import arrow_snapshot
+
+
+def _tabla_equipos(directory):
+    arrow_snapshot.write_snapshot(str(directory))
+    return directory / arrow_snapshot.FILES["team_stats"]
+
+
+def test_checksum_verified_once_per_file_version(tmp_path, monkeypatch):
+    _tabla_equipos(tmp_path)
+    assert (tmp_path / (arrow_snapshot.FILES["team_stats"] + arrow_snapshot.VERIFIED_SUFFIX)).exists()
+
+    # Recién escrita: la lectura no recalcula el checksum
+    calls = []
+    real = arrow_snapshot._checksum
+    monkeypatch.setattr(arrow_snapshot, "_checksum", lambda table: calls.append(1) or real(table))
+    assert arrow_snapshot.read_team_stats(str(tmp_path), check_source=False) is not None
+    assert calls == []
+
+
+def test_corrupted_file_is_rejected(tmp_path):
+    path = _tabla_equipos(tmp_path)
+    data = bytearray(path.read_bytes())
+    # Se cambia un byte de los valores (el mismo tamaño; el mtime cambia al reescribirlo)
+    position = len(data) // 2
+    data[position] ^= 0xFF
+    stat = path.stat()
+    path.write_bytes(bytes(data))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert arrow_snapshot.read_team_stats(str(tmp_path), check_source=False) is None
@@ -0,0 +1,36 @@
+import pytest
+
+from conftest import SQUAD
+from utils import browser_pool, fbref
+from utils.data_store import query
+
+
+def _urls():
+    return [job["url"] for job in fbref.squad_jobs(*SQUAD, pages=["all_comps", "defense"])]
+
+
+def test_rendered_fetch_uses_cache(ingest_env):
+    urls = _urls()
+    first = browser_pool.fetch_many_rendered(urls)
+    statuses = {info["status"] for _, info in first.values()}
+    assert statuses <= {"rendered", "fetched"}
+
+    second = browser_pool.fetch_many_rendered(urls, max_age=3600)
+    assert {info["status"] for _, info in second.values()} == {"cache"}
+    assert {url: html for url, (html, _) in second.items()} == {url: html for url, (html, _) in first.items()}
+
+
+def test_rendered_pages_go_through_ingest(ingest_env):
+    results = fbref.run_jobs(fbref.squad_jobs(*SQUAD, pages=["all_comps", "defense"]), fetcher=browser_pool.fetch_many_rendered)
+    assert not [info for _, info in results if isinstance(info, Exception)]
+    assert len(query("fbref_stats")) == 8
+    assert query("fbref_presion")["Jugador"].tolist() == ["Jules Koundé", "Pedri", "Frenkie de Jong"]
+
+
+@pytest.mark.skipif(not browser_pool.playwright_available(), reason="Playwright no está instalado")
+def test_rendered_fetch_revalidates(ingest_env):
+    urls = _urls()
+    browser_pool.fetch_many_rendered(urls)
+    again = browser_pool.fetch_many_rendered(urls)
+    assert {info["status"] for _, info in again.values()} == {"not_modified"}
+    browser_pool.close_pool()
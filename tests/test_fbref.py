@@ -0,0 +1,79 @@
+import pandas as pd
+
+from conftest import SQUAD
+from utils import fbref
+from utils.data_store import query
+
+
+def _jobs(pages=("all_comps", "defense")):
+    return fbref.squad_jobs(*SQUAD, pages=list(pages))
+
+
+def test_extract_two_level_header_with_duplicates(fbref_site):
+    _, site = fbref_site
+    html = (site / "en/squads/206d90db/2024-2025/all_comps/Barcelona-Stats").read_bytes()
+    df = fbref.extract_table(html, "stats_standard")
+
+    assert df.columns.is_unique
+    assert {"Gls", "Gls (Per 90 Minutes)", "xG", "xG (Per 90 Minutes)"} <= set(df.columns)
+    # Ni la cabecera repetida del cuerpo ni los totales del pie
+    assert len(df) == 8
+    assert not df["Jugador"].isin(["Player", "Squad Total", "Opponent Total"]).any()
+    assert df.loc[df["Jugador"] == "Pedri", "Min"].item() == 2700
+
+
+def test_extract_commented_table(fbref_site):
+    _, site = fbref_site
+    html = (site / "en/squads/206d90db/2024-2025/defense/Barcelona-Stats").read_bytes()
+    df = fbref.extract_table(html, "stats_defense")
+
+    assert df["Jugador"].tolist() == ["Jules Koundé", "Pedri", "Frenkie de Jong"]
+    assert "Tkl (Challenges)" in df.columns
+
+
+def test_run_jobs_ingests_every_page(ingest_env, tmp_path):
+    results = fbref.run_jobs(_jobs(), output_dir=str(tmp_path / "csv"))
+
+    assert [info["status"] for _, info in results] == ["fetched", "fetched"]
+    stats = query("fbref_stats")
+    assert len(stats) == 8 and set(stats["team"]) == {"Barcelona"}
+    assert set(stats["season"]) == {"2024_25"}
+    assert len(query("fbref_presion")) == 3
+    assert sorted(p.name for p in (tmp_path / "csv").iterdir()) == [
+        "Barcelona_2024_25_FBref_Presion.csv", "Barcelona_2024_25_FBref_Stats.csv"]
+
+
+def test_run_jobs_second_run_revalidates(ingest_env):
+    fbref.run_jobs(_jobs())
+    results = fbref.run_jobs(_jobs())
+    # http.server responde 304 a If-Modified-Since
+    assert [info["status"] for _, info in results] == ["not_modified", "not_modified"]
+    results = fbref.run_jobs(_jobs(), max_age=3600)
+    assert [info["status"] for _, info in results] == ["cache", "cache"]
+
+
+def test_run_jobs_isolates_failing_job(ingest_env):
+    jobs = _jobs()
+    jobs[0] = dict(jobs[0], table_id="stats_missing")
+    missing_page = dict(jobs[1], url=jobs[1]["url"].replace("Barcelona-Stats", "Nope-Stats"), dataset="fbref_nope")
+    results = fbref.run_jobs(jobs + [missing_page])
+
+    assert isinstance(results[0][1], ValueError)
+    assert isinstance(results[2][1], Exception)
+    assert results[1][1]["status"] == "fetched"
+    assert len(query("fbref_presion")) == 3
+
+
+def test_run_jobs_reports_ingest_errors(ingest_env, monkeypatch):
+    def rompe(df, *args, **kwargs):
+        raise RuntimeError("disco lleno")
+
+    monkeypatch.setattr(fbref, "ingest_dataframe", rompe)
+    results = fbref.run_jobs(_jobs())
+    assert all(isinstance(info, RuntimeError) for _, info in results)
+
+
+def test_csv_output_matches_parquet(ingest_env, tmp_path):
+    fbref.run_jobs(_jobs(["all_comps"]), output_dir=str(tmp_path / "csv"))
+    csv = pd.read_csv(tmp_path / "csv" / "Barcelona_2024_25_FBref_Stats.csv")
+    assert csv["Jugador"].tolist() == query("fbref_stats")["Jugador"].tolist()
@@ -0,0 +1,95 @@
+import os
+import time
+
+import pytest
+
+from conftest import SQUAD
+from utils import fbref, refresh
+from utils.data_store import query
+
+STANDARD_PAGE = "en/squads/206d90db/2024-2025/all_comps/Barcelona-Stats"
+
+
+def _editar(page, old, new):
+    """Cambia la página servida (con mtime posterior: http.server compara Last-Modified por segundos)"""
+    text = page.read_text(encoding="utf-8")
+    assert old in text
+    previous = page.stat().st_mtime
+    page.write_text(text.replace(old, new), encoding="utf-8")
+    later = max(time.time(), previous) + 10
+    os.utime(page, (later, later))
+
+
+def _refresh(manifest):
+    jobs = fbref.squad_jobs(*SQUAD, pages=["all_comps", "defense"])
+    changed = refresh.refresh_jobs(jobs, manifest)
+    return changed, refresh.recompute_derived(changed)
+
+
+def test_refresh_only_reingests_changed_tables(ingest_env, fbref_site):
+    _, site = fbref_site
+    manifest = {}
+    changed, recomputed = _refresh(manifest)
+    assert set(changed) == {"fbref_stats", "fbref_presion"}
+    assert recomputed == ["fbref_team_per90"]
+
+    # Misma página: nada que hacer
+    assert _refresh(manifest) == ({}, [])
+
+    # Cambia la página pero no la tabla (fecha de actualización)
+    page = site / STANDARD_PAGE
+    _editar(page, "2025-05-26 09:41:08", "2025-05-27 10:00:00")
+    assert _refresh(manifest) == ({}, [])
+
+    # Cambia un dato de la tabla: solo se reingiere esa tabla
+    _editar(page, 'data-stat="s2">2,700<', 'data-stat="s2">2,790<')
+    changed, recomputed = _refresh(manifest)
+    assert changed == {"fbref_stats": {("La Liga Española", "2024_25", "Barcelona")}}
+    assert recomputed == ["fbref_team_per90"]
+    assert query("fbref_stats", players=["Pedri"])["Min"].item() == 2790
+
+
+def test_refresh_skips_broken_table_and_retries(ingest_env, fbref_site, monkeypatch):
+    manifest = {}
+    real = refresh.ingest_dataframe
+
+    def falla_presion(df, dataset, *args, **kwargs):
+        if dataset == "fbref_presion":
+            raise RuntimeError("columnas inesperadas")
+        return real(df, dataset, *args, **kwargs)
+
+    monkeypatch.setattr(refresh, "ingest_dataframe", falla_presion)
+    changed, _ = _refresh(manifest)
+    assert set(changed) == {"fbref_stats"}
+
+    # Sin entrada en el manifiesto: la siguiente actualización la reintenta
+    monkeypatch.setattr(refresh, "ingest_dataframe", real)
+    changed, _ = _refresh(manifest)
+    assert set(changed) == {"fbref_presion"}
+
+
+def test_team_per90_ignores_footer_totals(ingest_env):
+    _refresh({})
+    row = query("fbref_team_per90")
+    stats = query("fbref_stats")
+    team_90s = stats["90s"].sum() / 11
+    assert row["Gls/90"].item() == pytest.approx(stats["Gls"].sum() / team_90s)
+    assert row["PrgP/90"].item() == pytest.approx(stats["PrgP"].sum() / team_90s)
+    # Solo columnas de conteo
+    assert "Age/90" not in row.columns and "Min/90" not in row.columns
+    assert not any("Per 90" in column for column in row.columns)
+
+
+def test_refresh_without_radar_csv_writes_team_snapshot(ingest_env, monkeypatch):
+    from utils import arrow_snapshot, player_store
+
+    # Sin Parquet de radares ni CSV: la actualización termina y la instantánea de equipos se escribe
+    monkeypatch.setattr(player_store, "RADAR_CSV_PATH", str(ingest_env / "no_existe.csv"))
+    changed, recomputed = refresh.refresh(fbref.squad_jobs(*SQUAD, pages=["all_comps"]))
+    assert set(changed) == {"fbref_stats"}
+    assert recomputed == ["fbref_team_per90"]
+    assert refresh.load_manifest()
+    snapshot = ingest_env / "snapshot"
+    assert (snapshot / arrow_snapshot.FILES["team_stats"]).exists()
+    assert not (snapshot / arrow_snapshot.FILES["players"]).exists()
+    assert arrow_snapshot.read_team_stats(str(snapshot)) is not None
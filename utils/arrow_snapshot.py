@@ -0,0 +1,292 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+# Carpeta de la instantánea Arrow que genera la ingesta (configurable por variable de entorno)
+SNAPSHOT_DIR = os.environ.get("SCOUTVISION_SNAPSHOT_DIR", os.path.join("data", "snapshot"))
+
+# Versión del formato: un archivo escrito con otra versión se descarta y se reconstruye desde el origen
+SCHEMA_VERSION = 1
+
+# Archivo de cada tabla dentro de la carpeta
+FILES = {
+    "team_stats": "team_stats.arrow",
+    "players": "players.arrow",
+    "player_metrics": "player_metrics.arrow",
+}
+
+# Sufijo del archivo que marca una tabla como verificada (tamaño, mtime y checksum de esa versión del archivo)
+VERIFIED_SUFFIX = ".verified"
+
+# Claves de los metadatos del esquema
+_META_VERSION = b"scoutvision.schema_version"
+_META_KIND = b"scoutvision.table"
+_META_CHECKSUM = b"scoutvision.checksum"
+_META_SOURCE = b"scoutvision.source"
+
+
+def _checksum(table):
+    """Hash de los buffers de datos de todas las columnas (en orden), sin copiarlos"""
+    digest = hashlib.blake2b(digest_size=16)
+    for column in table.columns:
+        for chunk in column.chunks:
+            arrays = [chunk]
+            while arrays:
+                array = arrays.pop(0)
+                for buffer in array.buffers():
+                    if buffer is not None:
+                        digest.update(memoryview(buffer))
+                if pa.types.is_dictionary(array.type):
+                    arrays.append(array.dictionary)
+    return digest.hexdigest()
+
+
+def _source_key(source):
+    """Firma del origen serializada (tuplas y listas se comparan igual)"""
+    return json.dumps(source, default=str).encode()
+
+
+def _version_archivo(path):
+    """Identifica una versión concreta del archivo: al reemplazarlo cambian el tamaño o el mtime"""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _marcar_verificado(path, checksum):
+    """Guarda que esta versión del archivo ya pasó el checksum (si no se puede escribir, se verificará otra vez)"""
+    try:
+        with open(path + VERIFIED_SUFFIX + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"file": _version_archivo(path), "checksum": checksum}, f)
+        os.replace(path + VERIFIED_SUFFIX + ".tmp", path + VERIFIED_SUFFIX)
+    except OSError:
+        pass
+
+
+def _verificado(path, checksum):
+    """True si esta versión del archivo ya se verificó (escrita aquí o comprobada en una lectura anterior)"""
+    try:
+        with open(path + VERIFIED_SUFFIX, encoding="utf-8") as f:
+            marker = json.load(f)
+        return marker == {"file": _version_archivo(path), "checksum": checksum}
+    except (OSError, ValueError):
+        return False
+
+
+def _write(table, path, kind, source):
+    """Escribe la tabla como Arrow IPC con versión, checksum y firma del origen; reemplazo atómico"""
+    table = table.combine_chunks()
+    checksum = _checksum(table)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _META_VERSION: str(SCHEMA_VERSION).encode(),
+        _META_KIND: kind.encode(),
+        _META_CHECKSUM: checksum.encode(),
+        _META_SOURCE: _source_key(source),
+    })
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with ipc.new_file(path + ".tmp", table.schema) as writer:
+        writer.write_table(table)
+    os.replace(path + ".tmp", path)
+    # El checksum se acaba de calcular sobre estos datos: los lectores no tienen que repetirlo
+    _marcar_verificado(path, checksum)
+    return path
+
+
+def _read(path, kind, source=None, verify=True):
+    """Tabla mapeada en memoria (sin copia) o None si falta, es de otra versión, está obsoleta o corrupta
+
+    source es la firma actual del origen: si no coincide con la guardada, la instantánea está obsoleta.
+    El checksum se comprueba una vez por versión del archivo (tamaño y mtime), no en cada lectura: el
+    coste de arrancar no crece con el tamaño de los datos.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+    except (OSError, pa.ArrowInvalid) as e:
+        print(f"⚠️ Instantánea {path} ilegible: {e}")
+        return None
+
+    meta = table.schema.metadata or {}
+    if meta.get(_META_VERSION) != str(SCHEMA_VERSION).encode() or meta.get(_META_KIND) != kind.encode():
+        print(f"⚠️ Instantánea {path} descartada: formato {meta.get(_META_VERSION, b'?').decode()} (se espera {SCHEMA_VERSION})")
+        return None
+    if source is not None and meta.get(_META_SOURCE) != _source_key(source):
+        # Los datos de origen cambiaron después de escribirla
+        return None
+    checksum = meta.get(_META_CHECKSUM, b"").decode()
+    if verify and not _verificado(path, checksum):
+        if checksum != _checksum(table):
+            print(f"⚠️ Instantánea {path} descartada: checksum incorrecto")
+            return None
+        _marcar_verificado(path, checksum)
+    return table
+
+
+def _strings(column):
+    """Columna diccionario -> Series de texto de pandas (decodificada en Arrow, sin pasar por objetos de Python)"""
+    return column.combine_chunks().dictionary_decode().to_pandas()
+
+
+def team_stats_table(tables):
+    """Tabla Arrow de {liga: DataFrame}: liga y equipo como diccionario, métricas en float32"""
+    leagues, teams, columns = [], [], {}
+    for league, df in tables.items():
+        leagues.extend([league] * len(df))
+        teams.extend(df["Team"].tolist())
+        for col in df.columns.drop("Team"):
+            columns.setdefault(col, []).append(df[col].to_numpy(dtype=np.float32))
+    data = {
+        "league": pa.array(leagues).dictionary_encode(),
+        "Team": pa.array(teams).dictionary_encode(),
+    }
+    data.update({col: pa.array(np.concatenate(parts)) for col, parts in columns.items()})
+    return pa.table(data)
+
+
+def team_stats_frames(table):
+    """{liga: DataFrame} con las métricas sobre la memoria mapeada (cada liga es un tramo contiguo)"""
+    codes = table["league"].combine_chunks().indices.to_numpy()
+    names = table["league"].combine_chunks().dictionary.to_pylist()
+    _, starts, counts = np.unique(codes, return_index=True, return_counts=True)
+    frames = {}
+    for start, count in sorted(zip(starts, counts)):
+        part = table.slice(int(start), int(count))
+        # split_blocks: cada columna float32 es una vista del archivo, sin consolidar en un bloque nuevo
+        df = part.drop_columns(["league", "Team"]).to_pandas(split_blocks=True)
+        df.insert(0, "Team", _strings(part["Team"]))
+        frames[names[codes[start]]] = df
+    return frames
+
+
+def player_tables(store):
+    """Tablas Arrow del almacén de jugadores: una fila por jugador (con su vector de métricas) y la tabla larga"""
+    players = store["players"]
+    n_metrics = len(store["metrics"])
+    values = pa.array(np.ascontiguousarray(store["matrix"], dtype=np.float32).reshape(-1))
+    players_table = pa.table({
+        "Jugador": pa.array(players["Jugador"].tolist()).dictionary_encode(),
+        "Equipo": pa.array(players["Equipo"].tolist()).dictionary_encode(),
+        "Posicion": pa.array(players["Posicion"].astype(str).tolist()).dictionary_encode(),
+        "values": pa.FixedSizeListArray.from_arrays(values, n_metrics) if n_metrics else pa.nulls(len(players), pa.list_(pa.float32(), 0)),
+    })
+    players_table = players_table.replace_schema_metadata({b"metrics": json.dumps(store["metrics"]).encode()})
+
+    long = store["long"]
+    metrics_table = pa.table({
+        "row": pa.array(long["row"].to_numpy(dtype=np.int32)),
+        "Metrica": pa.DictionaryArray.from_arrays(
+            pa.array(long["Metrica"].map(store["metric_index"]).to_numpy(dtype=np.int32)), pa.array(store["metrics"], pa.string())),
+        "Valor Original": pa.array(long["Valor Original"].to_numpy(dtype=np.float32)),
+        "Valor Normalizado": pa.array(long["Valor Normalizado"].to_numpy(dtype=np.float32)),
+    })
+    return players_table, metrics_table
+
+
+def player_store_from_tables(players_table, metrics_table, signature, metrics):
+    """Almacén de jugadores (mismo formato que player_store) con matriz y valores sobre la memoria mapeada"""
+    players = pd.DataFrame({col: _strings(players_table[col]) for col in ("Jugador", "Equipo", "Posicion")})
+    index = {}
+    for row, key in enumerate(zip(players["Jugador"].tolist(), players["Equipo"].tolist())):
+        index.setdefault(key, row)
+
+    values = players_table["values"].combine_chunks()
+    if len(metrics):
+        matrix = values.flatten().to_numpy(zero_copy_only=True).reshape(len(players), len(metrics))
+    else:
+        matrix = np.empty((len(players), 0), dtype=np.float32)
+
+    rows = metrics_table["row"].combine_chunks().to_numpy()
+    long = players.iloc[rows].reset_index(drop=True)
+    long["row"] = rows.astype(np.int64)
+    long["Metrica"] = _strings(metrics_table["Metrica"]).to_numpy()
+    long["Valor Original"] = metrics_table["Valor Original"].combine_chunks().to_numpy(zero_copy_only=False)
+    long["Valor Normalizado"] = metrics_table["Valor Normalizado"].combine_chunks().to_numpy(zero_copy_only=False)
+
+    return {
+        "signature": signature,
+        "players": players,
+        "long": long,
+        "metrics": metrics,
+        "metric_index": {metric: j for j, metric in enumerate(metrics)},
+        "matrix": matrix,
+        "index": index,
+    }
+
+
+def _team_source():
+    from utils.team_stats import source_signature
+    # Incluye el hash de rangos, semillas y equipos: sin datasets ingeridos las tablas son las sintéticas
+    return source_signature()
+
+
+def write_snapshot(directory=None):
+    """Construye tablas de equipos y jugadores desde el origen y escribe la instantánea; devuelve las rutas escritas
+
+    Cada tabla se escribe por separado: si el origen de jugadores no está disponible (p. ej. falta el
+    CSV de radares) se escriben igualmente las tablas de equipos y se avisa.
+    """
+    from utils.player_store import _build_store, _firma_origen
+    from utils.team_stats import LEAGUE_SEEDS, _build_team_stats
+
+    directory = directory or SNAPSHOT_DIR
+    team_source = _team_source()
+    paths = [_write(team_stats_table({league: _build_team_stats(league) for league in LEAGUE_SEEDS}),
+                    os.path.join(directory, FILES["team_stats"]), "team_stats", team_source)]
+
+    try:
+        signature = _firma_origen()
+        players_table, metrics_table = player_tables(_build_store(signature))
+    except Exception as e:
+        print(f"⚠️ Instantánea de jugadores no escrita (origen no disponible): {e}")
+        # Sin archivos de jugadores de una versión anterior que no corresponden a esta carpeta
+        for kind in ("players", "player_metrics"):
+            for path in (os.path.join(directory, FILES[kind]), os.path.join(directory, FILES[kind]) + VERIFIED_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+        return paths
+    paths.append(_write(players_table, os.path.join(directory, FILES["players"]), "players", signature))
+    paths.append(_write(metrics_table, os.path.join(directory, FILES["player_metrics"]), "player_metrics", signature))
+    return paths
+
+
+def read_team_stats(directory=None, check_source=True):
+    """{liga: DataFrame} desde la instantánea (None si no hay una válida y al día)"""
+    path = os.path.join(directory or SNAPSHOT_DIR, FILES["team_stats"])
+    table = _read(path, "team_stats", source=_team_source() if check_source else None)
+    return team_stats_frames(table) if table is not None else None
+
+
+def read_player_store(directory=None, check_source=True, signature=None):
+    """Almacén de jugadores desde la instantánea (None si no hay una válida y al día)"""
+    from utils.player_store import _firma_origen
+
+    directory = directory or SNAPSHOT_DIR
+    source = _firma_origen() if check_source else None
+    players_table = _read(os.path.join(directory, FILES["players"]), "players", source=source)
+    if players_table is None:
+        return None
+    metrics_table = _read(os.path.join(directory, FILES["player_metrics"]), "player_metrics", source=source)
+    if metrics_table is None:
+        return None
+    metrics = json.loads(players_table.schema.metadata[b"metrics"])
+    stored = json.loads(players_table.schema.metadata[_META_SOURCE])
+    return player_store_from_tables(players_table, metrics_table, signature or tuple(stored), metrics)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Escribe la instantánea Arrow (mapeable en memoria) de equipos y jugadores")
+    parser.add_argument("--dir", default=SNAPSHOT_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for path in write_snapshot(args.dir):
+        print(f"✅ {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+    print(f"Instantánea escrita en {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,16 @@
+import threading
+
+# Tareas en segundo plano ya lanzadas en este proceso (los reruns del script no las repiten)
+_started = {}
+_started_lock = threading.Lock()
+
+
+def run_once_in_background(name, target, *args, **kwargs):
+    """Ejecuta target en un hilo daemon una sola vez por proceso; devuelve el hilo"""
+    with _started_lock:
+        thread = _started.get(name)
+        if thread is None:
+            thread = threading.Thread(target=target, args=args, kwargs=kwargs, name=name, daemon=True)
+            _started[name] = thread
+            thread.start()
+    return thread
@@ -0,0 +1,281 @@
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+from utils.fbref import (HTTP_CACHE_DIR, MAX_WORKERS, REQUEST_TIMEOUT, USER_AGENT, _escribir_cache, _esperar_turno,
+                         _leer_cache, fetch_many, find_table)
+
+# Contextos de navegador (cada uno con sus cookies y su caché) que se mantienen abiertos
+BROWSER_CONTEXTS = 2
+
+# Pestañas abiertas como máximo por contexto (se reutilizan entre páginas)
+TABS_PER_CONTEXT = 3
+
+# Milisegundos máximos de navegación
+PAGE_TIMEOUT_MS = 30000
+
+# Milisegundos que se espera a que aparezca la tabla (si está comentada no aparecerá y se sigue igual)
+WAIT_FOR_TIMEOUT_MS = 5000
+
+# Sufijo de la clave de caché del HTML renderizado (el de la descarga HTTP usa la URL tal cual)
+RENDERED_CACHE_SUFFIX = "#rendered"
+
+# Recursos que no hacen falta para leer las tablas
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_DOMAINS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "criteo.com",
+    "taboola.com",
+)
+
+# Bucle asyncio propio en un hilo: el navegador y los contextos sobreviven entre llamadas
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def playwright_available():
+    """Indica si Playwright está instalado (es opcional: sin él se usa HTTP)"""
+    try:
+        import playwright.async_api  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def _bloquear(route):
+    request = route.request
+    host = urlparse(request.url).hostname or ""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or host.endswith(BLOCKED_DOMAINS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _abrir_navegador(pool):
+    from playwright.async_api import async_playwright
+
+    pool["playwright"] = await async_playwright().start()
+    pool["browser"] = await pool["playwright"].chromium.launch(headless=True)
+    for _ in range(BROWSER_CONTEXTS):
+        context = await pool["browser"].new_context(user_agent=USER_AGENT)
+        await context.route("**/*", _bloquear)
+        pool["contexts"].append({
+            "context": context,
+            # Pestañas libres para reutilizar y límite de pestañas simultáneas
+            "idle": asyncio.Queue(),
+            "open": 0,
+            "slots": asyncio.Semaphore(TABS_PER_CONTEXT),
+        })
+
+
+def _start_pool():
+    """Arranca el hilo del bucle asyncio y abre navegador y contextos"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+    thread.start()
+    pool = {"loop": loop, "thread": thread, "contexts": [], "next": 0}
+    try:
+        asyncio.run_coroutine_threadsafe(_abrir_navegador(pool), loop).result()
+    except Exception:
+        loop.call_soon_threadsafe(loop.stop)
+        raise
+    return pool
+
+
+def get_pool():
+    """Pool de navegador del proceso (se crea en el primer uso)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _start_pool()
+        return _pool
+
+
+async def _render(slot, url, wait_for):
+    """Carga una URL en una pestaña reutilizada del contexto; devuelve (HTML renderizado, cabeceras de la respuesta)"""
+    # El límite de peticiones por dominio es el mismo que el de las descargas HTTP; se espera el turno
+    # antes de ocupar una pestaña para no bloquearla mientras tanto
+    await asyncio.get_running_loop().run_in_executor(None, _esperar_turno, url)
+    async with slot["slots"]:
+        page = slot["idle"].get_nowait() if not slot["idle"].empty() else None
+        if page is None:
+            page = await slot["context"].new_page()
+            slot["open"] += 1
+        try:
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=PAGE_TIMEOUT_MS)
+            if response is not None and response.status >= 400:
+                raise RuntimeError(f"HTTP {response.status} en {url}")
+            if wait_for:
+                try:
+                    await page.wait_for_selector(wait_for, state="attached", timeout=WAIT_FOR_TIMEOUT_MS)
+                except Exception:
+                    pass
+            html = await page.content()
+        except Exception:
+            # Una pestaña con error no se reutiliza
+            await page.close()
+            slot["open"] -= 1
+            raise
+        slot["idle"].put_nowait(page)
+        return html, (response.headers if response is not None else {})
+
+
+async def _render_all(pool, urls, wait_for, max_workers):
+    # Como mucho max_workers páginas a la vez, igual que las descargas HTTP
+    limit = asyncio.Semaphore(max_workers)
+
+    async def one(i, url):
+        slot = pool["contexts"][(pool["next"] + i) % len(pool["contexts"])]
+        try:
+            async with limit:
+                return await _render(slot, url, wait_for)
+        except Exception as e:
+            return e
+
+    results = await asyncio.gather(*(one(i, url) for i, url in enumerate(urls)))
+    pool["next"] += len(urls)
+    return results
+
+
+def render_many(urls, wait_for=None, max_workers=MAX_WORKERS):
+    """Renderiza varias URLs en paralelo con el pool; devuelve {url: (html en bytes, cabeceras) o excepción}"""
+    urls = list(dict.fromkeys(urls))
+    pool = get_pool()
+    future = asyncio.run_coroutine_threadsafe(_render_all(pool, urls, wait_for, max_workers), pool["loop"])
+    return {url: (result[0].encode("utf-8"), result[1]) if isinstance(result, tuple) else result
+            for url, result in zip(urls, future.result())}
+
+
+def _sin_cambios(url, meta, session=None):
+    """Petición condicional por HTTP con el ETag / Last-Modified de la copia renderizada: True si es un 304"""
+    headers = {"User-Agent": USER_AGENT}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    if len(headers) == 1:
+        return False
+    _esperar_turno(url)
+    try:
+        # stream=True: si la página cambió no se descarga el cuerpo (se renderizará con el navegador)
+        with (session or requests).get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            return response.status_code == 304
+    except requests.RequestException:
+        return False
+
+
+def fetch_many_rendered(urls, max_workers=MAX_WORKERS, wait_for=None, cache_dir=None, max_age=0, session=None, **fetch_kwargs):
+    """Como fbref.fetch_many, pero con el navegador; lo que no se puede renderizar se descarga por HTTP
+
+    Usa la misma caché en disco que fetch: una copia renderizada con menos de max_age segundos se
+    devuelve sin peticiones y, si no, se revalida por HTTP con su ETag / Last-Modified; el navegador
+    solo se abre para las páginas que cambiaron o que no están en caché. Devuelve
+    {url: (html, info) o excepción}; info["status"] es "cache", "not_modified", "rendered" o el de
+    fetch si la página acabó descargándose por HTTP.
+    """
+    urls = list(dict.fromkeys(urls))
+    cache_dir = cache_dir or HTTP_CACHE_DIR
+    http_kwargs = dict(fetch_kwargs, cache_dir=cache_dir, max_age=max_age, session=session)
+    if not playwright_available():
+        return fetch_many(urls, max_workers=max_workers, **http_kwargs)
+
+    results, stale = {}, []
+    cached = {url: _leer_cache(url + RENDERED_CACHE_SUFFIX, cache_dir) for url in urls}
+    for url, (meta, body) in cached.items():
+        if meta is not None and time.time() - meta["fetched_at"] < max_age:
+            results[url] = (body, dict(meta, status="cache"))
+        else:
+            stale.append(url)
+
+    revalidate = [url for url in stale if cached[url][0] is not None]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        unchanged = dict(zip(revalidate, executor.map(lambda url: _sin_cambios(url, cached[url][0], session), revalidate)))
+    to_render = []
+    for url in stale:
+        meta, body = cached[url]
+        if unchanged.get(url):
+            meta = dict(meta, fetched_at=time.time())
+            _escribir_cache(url + RENDERED_CACHE_SUFFIX, cache_dir, meta, body)
+            results[url] = (body, dict(meta, status="not_modified"))
+        else:
+            to_render.append(url)
+
+    rendered = {}
+    if to_render:
+        try:
+            rendered = render_many(to_render, wait_for=wait_for, max_workers=max_workers)
+        except Exception as e:
+            print(f"⚠️ Navegador no disponible ({e}); se usa HTTP")
+    for url, response in rendered.items():
+        if isinstance(response, Exception):
+            continue
+        html, headers = response
+        meta = {
+            "url": url,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": time.time(),
+        }
+        _escribir_cache(url + RENDERED_CACHE_SUFFIX, cache_dir, meta, html)
+        results[url] = (html, dict(meta, status="rendered"))
+
+    failed = [url for url in urls if url not in results]
+    if failed:
+        results.update(fetch_many(failed, max_workers=max_workers, **http_kwargs))
+    return results
+
+
+def close_pool():
+    """Cierra pestañas, contextos y navegador"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is None:
+        return
+
+    async def cerrar():
+        for slot in pool["contexts"]:
+            await slot["context"].close()
+        await pool["browser"].close()
+        await pool["playwright"].stop()
+
+    asyncio.run_coroutine_threadsafe(cerrar(), pool["loop"]).result()
+    pool["loop"].call_soon_threadsafe(pool["loop"].stop)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Descarga páginas con el pool de navegador (o HTTP si no hay Playwright)")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--table", help="id (o prefijo) de la tabla a extraer")
+    parser.add_argument("--http", action="store_true", help="Forzar descarga HTTP sin navegador")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.http:
+        responses = fetch_many(args.urls)
+    else:
+        responses = fetch_many_rendered(args.urls, wait_for=f"[id^='{args.table}']" if args.table else None)
+    for url, response in responses.items():
+        if isinstance(response, Exception):
+            print(f"❌ {url}: {response}")
+            continue
+        html, info = response
+        line = f"✅ {url} ({info['status']}, {len(html) / 1024:.0f} KB)"
+        if args.table:
+            try:
+                line += f" tabla: {len(find_table(html, args.table)) / 1024:.0f} KB"
+            except ValueError as e:
+                line += f" {e}"
+        print(line)
+    close_pool()
+    print(f"{len(responses)} páginas en {time.perf_counter() - start:.1f} s")
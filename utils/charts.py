@@ -0,0 +1,252 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from utils.logos import LOGO_DISPLAY_SIZES, get_logo_src
+from utils.profiler import profiled
+from utils.teams import resolve_team_logo
+
+# Hasta este número de puntos se calculan todas las distancias por pares; por encima, KD-tree
+BRUTE_FORCE_MAX_POINTS = 1000
+
+
+def min_pairwise_distance(xs, ys):
+    """Distancia mínima entre dos puntos cualesquiera (None si hay menos de dos)"""
+    coords = np.column_stack([np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)])
+    n = len(coords)
+    if n < 2:
+        return None
+
+    if n <= BRUTE_FORCE_MAX_POINTS:
+        # Mismas distancias (np.hypot) que el cálculo por pares original, pero en un solo paso
+        i, j = np.triu_indices(n, k=1)
+        return float(np.hypot(coords[i, 0] - coords[j, 0], coords[i, 1] - coords[j, 1]).min())
+
+    from scipy.spatial import cKDTree
+
+    # El vecino más cercano de cada punto (k=1 es el propio punto)
+    distances, _ = cKDTree(coords).query(coords, k=2)
+    return float(distances[:, 1].min())
+
+
+def _add_team_points(fig, df, x, y, selected_team, logo_sizex, logo_sizey, x_label, y_label):
+    """Añade halo, marcadores de hover y logos usando columnas completas (una sola traza)"""
+    teams = df['Team'].to_numpy()
+    xs = df[x].to_numpy()
+    ys = df[y].to_numpy()
+    selected = teams == selected_team if selected_team is not None else np.zeros(len(teams), dtype=bool)
+    
+    # Círculo grande detrás del logo del equipo seleccionado
+    if selected.any():
+        fig.add_trace(go.Scatter(
+            x=xs[selected],
+            y=ys[selected],
+            mode="markers",
+            marker=dict(size=70, color="rgba(165,0,68,0.25)", line=dict(width=4, color="#A50044")),
+            hoverinfo="skip",
+            showlegend=False
+        ))
+    
+    # Marcadores invisibles para hover: una única traza con el nombre del equipo en customdata
+    fig.add_trace(go.Scatter(
+        x=xs,
+        y=ys,
+        mode="markers",
+        marker=dict(size=1, color='rgba(0,0,0,0)', symbol="circle"),
+        customdata=teams,
+        hovertemplate=f"<b>%{{customdata}}</b><br>{x_label or x}: %{{x:.2f}}<br>{y_label or y}: %{{y:.2f}}<extra></extra>"
+    ))
+    
+    # Logos desde la caché (URL estática o data URI reducido), añadidos en una sola actualización del layout
+    images = []
+    for team, x_val, y_val, is_selected in zip(teams, xs, ys, selected):
+        logo_source = get_logo_src(resolve_team_logo(team), LOGO_DISPLAY_SIZES["chart"], inline_thumb=True)
+        if not logo_source:
+            continue
+        scale = 1.7 if is_selected else 1.0
+        images.append(dict(
+            source=logo_source,
+            x=x_val,
+            y=y_val,
+            xref="x",
+            yref="y",
+            sizex=logo_sizex * scale,
+            sizey=logo_sizey * scale,
+            xanchor="center",
+            yanchor="middle",
+            layer="above",
+            sizing="contain",
+            opacity=1.0,
+            name=team
+        ))
+    fig.update_layout(images=images)
+
+
+def _add_team_points_per_trace(fig, df, x, y, selected_team, logo_sizex, logo_sizey, x_label, y_label):
+    """Versión original: una traza de hover (y otra de halo) por equipo"""
+    # Añadir logos y marcadores para cada equipo
+    for _, row in df.iterrows():
+        team = row['Team']
+        is_selected = (selected_team is not None and team == selected_team)
+        
+        # Tamaño especial si es el equipo seleccionado
+        if is_selected:
+            sizex = logo_sizex * 1.7
+            sizey = logo_sizey * 1.7
+            # Dibuja un círculo grande detrás del logo
+            fig.add_trace(go.Scatter(
+                x=[row[x]],
+                y=[row[y]],
+                mode="markers",
+                marker=dict(size=70, color="rgba(165,0,68,0.25)", line=dict(width=4, color="#A50044")),
+                hoverinfo="skip",
+                showlegend=False
+            ))
+        else:
+            sizex = logo_sizex
+            sizey = logo_sizey
+        
+        # Marcador invisible para hover
+        fig.add_trace(go.Scatter(
+            x=[row[x]],
+            y=[row[y]],
+            mode="markers",
+            marker=dict(size=1, color='rgba(0,0,0,0)', symbol="circle"),
+            name=team,
+            text=f"<b>{team}</b><br>{x_label or x}: {row[x]:.2f}<br>{y_label or y}: {row[y]:.2f}",
+            hoverinfo="text"
+        ))
+        
+        # Añadir imagen del logo desde la caché (ya reducida y codificada)
+        logo_source = get_logo_src(resolve_team_logo(team), LOGO_DISPLAY_SIZES["chart"], inline_thumb=True)
+        if logo_source:
+            fig.add_layout_image(
+                dict(
+                    source=logo_source,
+                    x=row[x],
+                    y=row[y],
+                    xref="x",
+                    yref="y",
+                    sizex=sizex,
+                    sizey=sizey,
+                    xanchor="center",
+                    yanchor="middle",
+                    layer="above",
+                    sizing="contain",
+                    opacity=1.0
+                )
+            )
+
+
+def highlight_team(base_fig, selected_team):
+    """Copia una gráfica de fases sin resaltar y le añade el halo y el logo grande del equipo"""
+    # La traza de hover (la última) tiene los nombres de los equipos en customdata
+    hover = base_fig.data[-1]
+    teams = list(hover.customdata) if hover.customdata is not None else []
+    if selected_team not in teams:
+        return go.Figure(base_fig)
+    i = teams.index(selected_team)
+
+    halo = go.Scatter(
+        x=[hover.x[i]],
+        y=[hover.y[i]],
+        mode="markers",
+        marker=dict(size=70, color="rgba(165,0,68,0.25)", line=dict(width=4, color="#A50044")),
+        hoverinfo="skip",
+        showlegend=False
+    )
+    fig = go.Figure(data=[halo] + list(base_fig.data), layout=base_fig.layout)
+
+    for image in fig.layout.images:
+        if image.name == selected_team:
+            image.sizex = image.sizex * 1.7
+            image.sizey = image.sizey * 1.7
+    return fig
+
+
+# Función principal para gráficas de análisis de fases
+@profiled()
+def plot_phase_plotly(df, x, y, invert, title, color, x_range=None, y_range=None, selected_team=None, x_label=None, y_label=None, single_trace=True):
+    """Crea gráfica interactiva con logos de equipos (adaptado de League Dashboard)
+
+    Con single_trace=True todos los equipos van en una sola traza (hover con customdata);
+    con single_trace=False se genera una traza por equipo como en la versión original.
+    """
+    fig = go.Figure()
+    
+    # Calcular tamaño proporcional al rango de ejes
+    if x_range is not None:
+        x_span = x_range[1] - x_range[0]
+    else:
+        x_span = df[x].max() - df[x].min()
+    if y_range is not None:
+        y_span = y_range[1] - y_range[0]
+    else:
+        y_span = df[y].max() - df[y].min()
+    
+    # Calcular distancia mínima entre puntos (vectorizado / KD-tree para muchos puntos)
+    min_dist = min_pairwise_distance(df[x], df[y])
+    if min_dist is None:
+        min_dist = min(x_span, y_span)
+    
+    # Autozoom: logos entre 8% y 16% del rango, según densidad
+    min_size = 0.08
+    max_size = 0.16
+    if min_dist is not None and max(x_span, y_span) > 0:
+        density_factor = min(1.0, max(0.0, min_dist / (0.25 * max(x_span, y_span))))
+        logo_frac = min_size + (max_size - min_size) * density_factor
+    else:
+        logo_frac = 0.12
+    
+    logo_sizex = x_span * logo_frac
+    logo_sizey = y_span * logo_frac
+    
+    if single_trace:
+        _add_team_points(fig, df, x, y, selected_team, logo_sizex, logo_sizey, x_label, y_label)
+    else:
+        _add_team_points_per_trace(fig, df, x, y, selected_team, logo_sizex, logo_sizey, x_label, y_label)
+    
+    # Líneas de la mediana
+    x_med = df[x].median()
+    y_med = df[y].median()
+    x_min, x_max = (x_range if x_range else (df[x].min(), df[x].max()))
+    y_min, y_max = (y_range if y_range else (df[y].min(), df[y].max()))
+    
+    # Fondos de cuadrantes
+    fig.add_shape(type="rect", x0=x_min, x1=x_med, y0=y_med, y1=y_max, fillcolor="rgba(255,255,200,0.32)", line_width=0, layer="below")
+    fig.add_shape(type="rect", x0=x_med, x1=x_max, y0=y_med, y1=y_max, fillcolor="rgba(200,255,200,0.32)", line_width=0, layer="below")
+    fig.add_shape(type="rect", x0=x_min, x1=x_med, y0=y_min, y1=y_med, fillcolor="rgba(200,220,255,0.32)", line_width=0, layer="below")
+    fig.add_shape(type="rect", x0=x_med, x1=x_max, y0=y_min, y1=y_med, fillcolor="rgba(255,200,200,0.32)", line_width=0, layer="below")
+    
+    # Líneas de mediana
+    fig.add_shape(type="line", x0=x_med, x1=x_med, y0=y_min, y1=y_max, line=dict(dash="dash", color="gray"))
+    fig.add_shape(type="line", x0=x_min, x1=x_max, y0=y_med, y1=y_med, line=dict(dash="dash", color="gray"))
+    
+    # Configurar ejes
+    if invert:
+        if x_range:
+            fig.update_xaxes(range=x_range[::-1], showticklabels=False)
+        else:
+            fig.update_xaxes(autorange="reversed", showticklabels=False)
+    else:
+        if x_range:
+            fig.update_xaxes(range=x_range, showticklabels=False)
+        else:
+            fig.update_xaxes(autorange=True, showticklabels=False)
+    
+    if y_range:
+        fig.update_yaxes(range=y_range, showticklabels=False)
+    else:
+        fig.update_yaxes(showticklabels=False)
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_label or x,
+        yaxis_title=y_label or y,
+        plot_bgcolor="#F8F9FA",
+        paper_bgcolor="#FFFFFF",
+        showlegend=False,
+        margin=dict(l=40, r=40, t=60, b=40),
+        font=dict(family="Arial", size=14),
+        transition=dict(duration=600, easing="cubic-in-out")
+    )
+    return fig
@@ -0,0 +1,234 @@
+import argparse
+import glob
+import os
+import re
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.teams import canonical_team_name, get_team_league
+
+# Carpeta raíz de los datasets Parquet (configurable por variable de entorno)
+DATA_DIR = os.environ.get("SCOUTVISION_DATA_DIR", os.path.join("data", "parquet"))
+
+# Columnas de partición (en este orden: liga/temporada/equipo)
+PARTITION_COLUMNS = ["league", "season", "team"]
+
+# Liga y temporada de los equipos del CSV de radares (Bayern 2019/20 y Barça 2024/25)
+RADAR_TEAM_SEASONS = {
+    "Bayern": ("Bundesliga", "2019_20"),
+    "Barcelona": ("La Liga Española", "2024_25"),
+}
+
+# Nombre de los CSV del notebook de FBref: <Equipo>_<YYYY>_<YY>[_FBref]_<Tabla>.csv
+FBREF_CSV_PATTERN = re.compile(r"^(?P<team>.+?)_(?P<season>\d{4}_\d{2})(?:_FBref)?_(?P<table>[^.]+)\.csv$")
+
+# Datasets abiertos: nombre -> (firma de sus archivos, pyarrow Dataset)
+_datasets = {}
+_datasets_lock = threading.Lock()
+
+
+def dataset_path(dataset):
+    """Ruta de la carpeta de un dataset"""
+    return os.path.join(DATA_DIR, dataset)
+
+
+def has_dataset(dataset):
+    """Indica si el dataset ya se ha ingerido"""
+    return bool(glob.glob(os.path.join(dataset_path(dataset), "**", "*.parquet"), recursive=True))
+
+
+def dataset_signature(dataset):
+    """Identifica la versión de un dataset por sus archivos (None si no se ha ingerido)"""
+    files = glob.glob(os.path.join(dataset_path(dataset), "**", "*.parquet"), recursive=True)
+    if not files:
+        return None
+    return (len(files), max(os.stat(f).st_mtime for f in files))
+
+
+def _detectar_separador(path):
+    """Detecta si el CSV usa ';' o ',' como separador mirando la cabecera"""
+    with open(path, encoding="utf-8-sig") as f:
+        header = f.readline()
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def _preparar_tabla(df):
+    """Limpia espacios en las columnas de texto y convierte a tabla Arrow"""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].map(lambda v: v.strip() if isinstance(v, str) else v)
+    # Las columnas de texto mezcladas (p. ej. cabeceras repetidas de FBref) se guardan como string
+    for col in df.columns:
+        if df[col].dtype == object:
+            try:
+                pa.array(df[col])
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                df[col] = df[col].astype(str)
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def ingest_dataframe(df, dataset, league, season, team=None, team_column=None):
+    """Guarda un DataFrame en el dataset, reemplazando las particiones que ya existían"""
+    duplicated = df.columns[df.columns.duplicated()].unique().tolist()
+    if duplicated:
+        raise ValueError(f"Columnas repetidas en {dataset}: {duplicated}")
+    df = df.copy()
+    if team is not None:
+        df["team"] = canonical_team_name(team) or team
+    elif team_column is not None:
+        df["team"] = df[team_column].map(lambda t: canonical_team_name(t) or t)
+    else:
+        raise ValueError("Hay que indicar team o team_column")
+    df["league"] = league
+    df["season"] = season
+
+    pq.write_to_dataset(
+        _preparar_tabla(df),
+        root_path=dataset_path(dataset),
+        partition_cols=PARTITION_COLUMNS,
+        existing_data_behavior="delete_matching",
+    )
+    invalidate_dataset(dataset)
+
+
+def ingest_csv(path, dataset, league, season, team=None, team_column=None, sep=None):
+    """Ingiere un CSV en el dataset indicado"""
+    df = pd.read_csv(path, sep=sep or _detectar_separador(path))
+    ingest_dataframe(df, dataset, league, season, team=team, team_column=team_column)
+
+
+def radar_partition(team):
+    """Liga y temporada en las que se guarda un equipo del CSV de radares"""
+    return RADAR_TEAM_SEASONS.get(team, (get_team_league(team) or "Desconocida", "desconocida"))
+
+
+def read_radar_csv(path):
+    """Lee el CSV de radares con los nombres de equipo limpios"""
+    df = pd.read_csv(path, sep=_detectar_separador(path))
+    df["Equipo"] = df["Equipo"].str.strip()
+    return df
+
+
+def ingest_radar_csv(path, dataset="radares", teams=None):
+    """Ingiere el CSV de radares, repartiendo cada equipo en su liga y temporada (solo teams si se indica)"""
+    for team, team_df in read_radar_csv(path).groupby("Equipo", sort=False):
+        if teams is not None and team not in teams:
+            continue
+        league, season = radar_partition(team)
+        ingest_dataframe(team_df, dataset, league, season, team_column="Equipo")
+
+
+def ingest_fbref_csvs(directory):
+    """Ingiere los CSV exportados por el notebook de FBref (un dataset por tipo de tabla)"""
+    ingested = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.csv"))):
+        match = FBREF_CSV_PATTERN.match(os.path.basename(path))
+        if not match:
+            continue
+        team = canonical_team_name(match["team"]) or match["team"]
+        league = get_team_league(team) or "Desconocida"
+        dataset = "fbref_" + match["table"].lower()
+        ingest_csv(path, dataset, league, match["season"], team=team)
+        ingested.append((path, dataset))
+    return ingested
+
+
+def invalidate_dataset(dataset=None):
+    """Olvida el Dataset abierto (se vuelve a descubrir en la siguiente consulta)"""
+    with _datasets_lock:
+        if dataset is None:
+            _datasets.clear()
+        else:
+            _datasets.pop(dataset, None)
+
+
+def _abrir_dataset(dataset):
+    """Abre (o reutiliza) el Dataset Arrow con el esquema unificado de todos sus archivos"""
+    # Firma por archivos y no mtime de la carpeta raíz: otra ingesta (p. ej. la del CLI de refresh)
+    # solo reescribe las carpetas de las particiones, con archivos de nombre nuevo
+    signature = dataset_signature(dataset)
+    cached = _datasets.get(dataset)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    root = dataset_path(dataset)
+    with _datasets_lock:
+        partitioning = ds.partitioning(
+            pa.schema([(col, pa.string()) for col in PARTITION_COLUMNS]), flavor="hive"
+        )
+        discovered = ds.dataset(root, format="parquet", partitioning=partitioning)
+        # Solo se leen los pies de los archivos: los CSV de FBref no tienen todos las mismas columnas
+        schemas = [fragment.physical_schema for fragment in discovered.get_fragments()]
+        schema = pa.unify_schemas(schemas + [discovered.partitioning.schema], promote_options="permissive")
+        dataset_obj = ds.dataset(root, format="parquet", partitioning=partitioning, schema=schema)
+        _datasets[dataset] = (signature, dataset_obj)
+    return dataset_obj
+
+
+def query(dataset, columns=None, leagues=None, seasons=None, teams=None, players=None, player_column="Jugador"):
+    """Lee solo las columnas y filas pedidas; los filtros se aplican al escanear los archivos"""
+    dataset_obj = _abrir_dataset(dataset)
+
+    conditions = []
+    if leagues is not None:
+        conditions.append(ds.field("league").isin(list(leagues)))
+    if seasons is not None:
+        conditions.append(ds.field("season").isin(list(seasons)))
+    if teams is not None:
+        conditions.append(ds.field("team").isin([canonical_team_name(t) or t for t in teams]))
+    if players is not None:
+        conditions.append(ds.field(player_column).isin([p.strip() for p in players]))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    if columns is not None:
+        columns = [col for col in columns if col in dataset_obj.schema.names]
+    try:
+        table = dataset_obj.to_table(columns=columns, filter=expression)
+    except FileNotFoundError:
+        # Una ingesta concurrente reemplazó archivos entre la firma y la lectura: se redescubre una vez
+        invalidate_dataset(dataset)
+        table = _abrir_dataset(dataset).to_table(columns=columns, filter=expression)
+    return table.to_pandas()
+
+
+def latest_season(dataset, league=None):
+    """Temporada más reciente ingerida en el dataset (opcionalmente de una liga); None si no hay"""
+    seasons = query(dataset, columns=["season"], leagues=[league] if league is not None else None)["season"]
+    # Formato '2024_25': el orden alfabético es el cronológico
+    return seasons.max() if len(seasons) else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingesta de CSV al almacén Parquet")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    radares_parser = subparsers.add_parser("radares", help="CSV de radares (separado por ';')")
+    radares_parser.add_argument("path")
+    fbref_parser = subparsers.add_parser("fbref", help="Carpeta con los CSV exportados del notebook")
+    fbref_parser.add_argument("directory")
+    team_stats_parser = subparsers.add_parser("team_stats", help="CSV con estadísticas por equipo de una liga (columna 'Team')")
+    team_stats_parser.add_argument("path")
+    team_stats_parser.add_argument("league")
+    team_stats_parser.add_argument("season")
+    args = parser.parse_args()
+
+    if args.command == "radares":
+        ingest_radar_csv(args.path)
+        print(f"✅ {args.path} -> {dataset_path('radares')}")
+    elif args.command == "team_stats":
+        ingest_csv(args.path, "team_stats", args.league, args.season, team_column="Team")
+        print(f"✅ {args.path} -> {dataset_path('team_stats')}")
+    else:
+        for path, dataset in ingest_fbref_csvs(args.directory):
+            print(f"✅ {path} -> {dataset_path(dataset)}")
+
+    # Instantánea Arrow al día con lo ingerido (la app la mapea al arrancar)
+    from utils.arrow_snapshot import write_snapshot
+    write_snapshot()
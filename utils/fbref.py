@@ -0,0 +1,286 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import lxml.html
+import requests
+
+from utils.arrow_snapshot import write_snapshot
+from utils.data_store import ingest_dataframe
+from utils.table_stream import read_table, to_dataframe
+from utils.teams import canonical_team_name, get_team_league
+
+# Raíz de FBref (se puede apuntar a un servidor local con páginas grabadas para pruebas)
+FBREF_BASE_URL = os.environ.get("SCOUTVISION_FBREF_BASE_URL", "https://fbref.com")
+
+# Caché HTTP en disco: <sha256 de la URL>.html + .json con ETag / Last-Modified
+HTTP_CACHE_DIR = os.environ.get("SCOUTVISION_HTTP_CACHE", os.path.join("data", "http_cache"))
+
+# Segundos mínimos entre peticiones al mismo dominio (FBref permite ~10 peticiones por minuto)
+DOMAIN_MIN_INTERVAL = {
+    "fbref.com": 6.0,
+}
+DEFAULT_MIN_INTERVAL = 1.0
+
+# Peticiones simultáneas como máximo
+MAX_WORKERS = 4
+
+REQUEST_TIMEOUT = 30
+USER_AGENT = "ScoutVision/1.0 (+https://github.com/ZyadBennani/tfm)"
+
+# Páginas de estadísticas de cada equipo: página de FBref -> (prefijo del id de la tabla, nombre del dataset)
+SQUAD_PAGES = {
+    "all_comps": ("stats_standard", "stats"),
+    "defense": ("stats_defense", "presion"),
+    "passing": ("stats_passing", "passing"),
+    "shooting": ("stats_shooting", "shooting"),
+    "possession": ("stats_possession", "possession"),
+    "gca": ("stats_gca", "gca"),
+}
+
+_next_request_at = {}
+_rate_lock = threading.Lock()
+
+
+def _esperar_turno(url):
+    """Espera lo necesario para respetar el intervalo mínimo entre peticiones al dominio"""
+    domain = urlparse(url).hostname or ""
+    domain = domain[4:] if domain.startswith("www.") else domain
+    interval = DOMAIN_MIN_INTERVAL.get(domain, DEFAULT_MIN_INTERVAL)
+    with _rate_lock:
+        now = time.monotonic()
+        start = max(now, _next_request_at.get(domain, now))
+        _next_request_at[domain] = start + interval
+    if start > now:
+        time.sleep(start - now)
+
+
+def _cache_paths(url, cache_dir):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key + ".html"), os.path.join(cache_dir, key + ".json")
+
+
+def _leer_cache(url, cache_dir):
+    body_path, meta_path = _cache_paths(url, cache_dir)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            return meta, f.read()
+    except (OSError, ValueError):
+        return None, None
+
+
+def _escribir_cache(url, cache_dir, meta, body):
+    os.makedirs(cache_dir, exist_ok=True)
+    body_path, meta_path = _cache_paths(url, cache_dir)
+    for path, data, mode in ((body_path, body, "wb"), (meta_path, json.dumps(meta), "w")):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, mode) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+
+def fetch(url, session=None, cache_dir=None, max_age=0):
+    """Descarga una URL usando la caché en disco; devuelve (html en bytes, info)
+
+    Si la copia en caché tiene menos de max_age segundos no se hace ninguna petición; si no,
+    se revalida con If-None-Match / If-Modified-Since y un 304 reutiliza el cuerpo guardado.
+    info lleva los metadatos de la caché y "status" ("cache", "not_modified" o "fetched").
+    """
+    cache_dir = cache_dir or HTTP_CACHE_DIR
+    session = session or requests
+    meta, body = _leer_cache(url, cache_dir)
+    if meta is not None and time.time() - meta["fetched_at"] < max_age:
+        return body, dict(meta, status="cache")
+
+    headers = {"User-Agent": USER_AGENT}
+    if meta is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    _esperar_turno(url)
+    response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304 and body is not None:
+        meta = dict(meta, fetched_at=time.time())
+        _escribir_cache(url, cache_dir, meta, body)
+        return body, dict(meta, status="not_modified")
+
+    response.raise_for_status()
+    meta = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+    }
+    _escribir_cache(url, cache_dir, meta, response.content)
+    return response.content, dict(meta, status="fetched")
+
+
+def fetch_many(urls, max_workers=MAX_WORKERS, **kwargs):
+    """Descarga varias URLs en paralelo (limitado por dominio); devuelve {url: (html, info) o excepción}"""
+    def _fetch(url):
+        try:
+            return fetch(url, **kwargs)
+        except Exception as e:
+            return e
+
+    urls = list(dict.fromkeys(urls))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(zip(urls, pool.map(_fetch, urls)))
+
+
+def _buscar_tabla(root, table_id):
+    """Primera tabla cuyo id es table_id o empieza por table_id"""
+    found = root.xpath("//table[@id=$id]", id=table_id)
+    if not found:
+        found = root.xpath("//table[starts-with(@id, $id)]", id=table_id)
+    return found[0] if found else None
+
+
+def find_table_html(html, table_id):
+    """HTML de la tabla con ese id (también si FBref la esconde dentro de un comentario HTML)"""
+    root = lxml.html.fromstring(html)
+    table = _buscar_tabla(root, table_id)
+    if table is None:
+        # FBref deja muchas tablas avanzadas comentadas y las muestra con JavaScript
+        for comment in root.xpath("//comment()[contains(., $id)]", id=table_id):
+            table = _buscar_tabla(lxml.html.fromstring(comment.text or "<div></div>"), table_id)
+            if table is not None:
+                break
+    if table is None:
+        raise ValueError(f"No se encontró la tabla '{table_id}'")
+    return lxml.html.tostring(table, encoding="unicode")
+
+
+def find_table_html_bs4(html, table_id):
+    """Igual que find_table_html pero con BeautifulSoup (tolera HTML que lxml no recupera bien)"""
+    from bs4 import BeautifulSoup, Comment
+
+    def buscar(soup):
+        return soup.find("table", id=table_id) or soup.find("table", id=lambda value: bool(value) and value.startswith(table_id))
+
+    soup = BeautifulSoup(html, "html.parser")
+    table = buscar(soup)
+    if table is None:
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment) and table_id in text):
+            table = buscar(BeautifulSoup(str(comment), "html.parser"))
+            if table is not None:
+                break
+    if table is None:
+        raise ValueError(f"No se encontró la tabla '{table_id}'")
+    return str(table)
+
+
+def find_table(html, table_id):
+    """HTML de la tabla (visible o comentada): primero con lxml y, si no aparece, con BeautifulSoup"""
+    try:
+        return find_table_html(html, table_id)
+    except ValueError:
+        return find_table_html_bs4(html, table_id)
+
+
+def extract_arrow_table(html, table_id):
+    """Tabla Arrow con ese id; ValueError si no aparece
+
+    Se recorre el HTML en streaming (utils.table_stream): no se construye el DOM de la página ni
+    el resto de tablas, así que la memoria depende solo de la tabla buscada. Solo si el streaming
+    no la encuentra se construye el DOM (lxml y, si hace falta, BeautifulSoup) para localizarla.
+    """
+    try:
+        return read_table(html, table_id=table_id)
+    except ValueError:
+        return read_table(find_table(html, table_id), table_id=table_id)
+
+
+def extract_table(html, table_id):
+    """Extrae solo la tabla con ese id y la convierte en DataFrame"""
+    return to_dataframe(extract_arrow_table(html, table_id))
+
+
+def squad_jobs(team, squad_id, season, pages=None):
+    """Trabajos de ingesta de las páginas de estadísticas de un equipo (season con formato '2024-2025')"""
+    team = canonical_team_name(team) or team
+    slug = team.replace(" ", "-")
+    jobs = []
+    for page in pages or SQUAD_PAGES:
+        table_id, dataset = SQUAD_PAGES[page]
+        jobs.append({
+            "team": team,
+            "league": get_team_league(team) or "Desconocida",
+            "season": f"{season[:4]}_{season[-2:]}",
+            "url": f"{FBREF_BASE_URL}/en/squads/{squad_id}/{season}/{page}/{slug}-Stats",
+            "table_id": table_id,
+            "dataset": "fbref_" + dataset,
+        })
+    return jobs
+
+
+def run_jobs(jobs, max_workers=MAX_WORKERS, output_dir=None, fetcher=None, **fetch_kwargs):
+    """Descarga en paralelo, extrae la tabla de cada trabajo y la guarda en el almacén Parquet
+
+    Si se indica output_dir también se escribe un CSV por trabajo, como hacía el notebook.
+    fetcher sustituye a fetch_many (p. ej. browser_pool.fetch_many_rendered).
+    Devuelve una lista de (trabajo, info de la descarga o excepción).
+    """
+    responses = (fetcher or fetch_many)([job["url"] for job in jobs], max_workers=max_workers, **fetch_kwargs)
+    results = []
+    for job in jobs:
+        response = responses[job["url"]]
+        if isinstance(response, Exception):
+            results.append((job, response))
+            continue
+        html, info = response
+        # Un error en una tabla (no encontrada, columnas inesperadas...) no detiene el resto del lote
+        try:
+            df = extract_table(html, job["table_id"])
+            ingest_dataframe(df, job["dataset"], job["league"], job["season"], team=job["team"])
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+                name = f"{job['team'].replace(' ', '_')}_{job['season']}_FBref_{job['dataset'][len('fbref_'):].capitalize()}.csv"
+                df.to_csv(os.path.join(output_dir, name), index=False)
+        except Exception as e:
+            results.append((job, e))
+            continue
+        results.append((job, info))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingesta de estadísticas de equipos desde FBref")
+    parser.add_argument("config", help='JSON con una lista de {"team", "squad_id", "season"}')
+    parser.add_argument("--pages", nargs="*", choices=list(SQUAD_PAGES), default=None)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--max-age", type=float, default=0, help="Segundos durante los que la caché no se revalida")
+    parser.add_argument("--csv-dir", default=None, help="Escribir también un CSV por tabla")
+    parser.add_argument("--browser", action="store_true", help="Renderizar con el pool de Playwright (HTTP si no está instalado)")
+    args = parser.parse_args()
+
+    with open(args.config, encoding="utf-8") as f:
+        config = json.load(f)
+    jobs = [job for entry in config for job in squad_jobs(entry["team"], entry["squad_id"], entry["season"], args.pages)]
+
+    fetcher = None
+    if args.browser:
+        from utils.browser_pool import fetch_many_rendered
+        fetcher = fetch_many_rendered
+
+    start = time.perf_counter()
+    ingested = False
+    for job, info in run_jobs(jobs, max_workers=args.workers, output_dir=args.csv_dir, fetcher=fetcher, max_age=args.max_age):
+        if isinstance(info, Exception):
+            print(f"❌ {job['team']} {job['dataset']}: {info}")
+        else:
+            print(f"✅ {job['team']} {job['dataset']} ({info['status']})")
+            ingested = True
+    if ingested:
+        # Instantánea Arrow al día con lo ingerido (la app la mapea al arrancar)
+        write_snapshot()
+    print(f"{len(jobs)} tablas en {time.perf_counter() - start:.1f} s")
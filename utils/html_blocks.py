@@ -0,0 +1,57 @@
+import html
+
+from utils.logos import LOGO_DISPLAY_SIZES, get_logo_src
+from utils.teams import resolve_team_logo
+
+# Filas del ranking por página (cada página se envía como un único bloque HTML)
+RANKING_PAGE_SIZE = 10
+
+# Equipos por fila en el grid de una liga
+GRID_COLUMNS = 5
+
+
+def _logo_img(team, size_key, attrs):
+    """Etiqueta <img> del logo de un equipo ('' si no hay logo)"""
+    src = get_logo_src(resolve_team_logo(team), LOGO_DISPLAY_SIZES[size_key])
+    return f"<img src='{src}' {attrs}>" if src else ""
+
+
+def ranking_html(rows, metric_col, selected_team=None, start=0):
+    """Ranking completo (una página) como un solo bloque HTML; muestra la liga si rows la incluye"""
+    show_league = 'League' in rows.columns
+    parts = ["<div style='height: 8px'></div>"]
+    for idx, (team, value, league) in enumerate(zip(rows['Team'], rows[metric_col], rows['League'] if show_league else [None] * len(rows))):
+        logo_html = _logo_img(team, "ranking", "height='28' style='vertical-align:middle;margin-right:8px;'")
+        league_html = f"<span style='color:#666;margin-right:12px;'>{html.escape(league)}</span>" if show_league else ""
+        highlight = "background:#ffe5f0;border-radius:8px;" if team == selected_team else ""
+        parts.append(
+            f"<div style='display:flex;align-items:center;{highlight}padding:4px 8px;margin-bottom:2px;'>"
+            f"<span style='width:32px;font-weight:bold;'>{start + idx + 1}</span>{logo_html}"
+            f"<span style='flex:1;'>{html.escape(team)}</span>{league_html}"
+            f"<span style='font-weight:bold;'>{value:.2f}</span></div>"
+        )
+    return "".join(parts)
+
+
+def similar_teams_html(rows):
+    """Lista de equipos parecidos (logo, nombre y liga) como un solo bloque HTML"""
+    parts = []
+    for team, league in zip(rows['Team'], rows['League']):
+        logo_html = _logo_img(team, "ranking", "height='28' style='vertical-align:middle;margin-right:8px;'")
+        parts.append(
+            f"<div style='display:flex;align-items:center;padding:4px 8px;margin-bottom:2px;'>{logo_html}"
+            f"<span style='flex:1;'>{html.escape(team)}</span><span style='color:#666;'>{html.escape(league)}</span></div>"
+        )
+    return "".join(parts)
+
+
+def team_cards_html(teams, columns=GRID_COLUMNS):
+    """Fila del grid de equipos (logo + nombre) en un solo bloque, alineada con st.columns"""
+    cards = []
+    for team in teams:
+        logo_html = _logo_img(team, "grid", f"class='team-logo' alt='{html.escape(team)}'")
+        if not logo_html:
+            logo_html = f"<div class='placeholder-image'>Logo {html.escape(team)}</div>"
+        cards.append(f"<div style='text-align:center;'>{logo_html}<div class='team-name'>{html.escape(team)}</div></div>")
+    # Mismo número de columnas y separación (1rem) que st.columns para que los botones queden debajo
+    return f"<div style='display:grid;grid-template-columns:repeat({columns}, 1fr);gap:1rem;'>{''.join(cards)}</div>"
@@ -0,0 +1,147 @@
+import threading
+
+from utils.charts import plot_phase_plotly
+from utils.profiler import profiled
+from utils.team_stats import load_team_stats, resolve_league, team_stats_version
+
+# Colores de las 4 gráficas de fases
+PHASE_COLORS = ["#1E88E5", "#43A047", "#FB8C00", "#8E24AA"]
+
+# Fases de juego: (métrica eje X, métrica eje Y, invertir eje X, título)
+PHASES = [
+    ("PPDA", "Contraataques con disparo", False,  "Transición ofensiva"),
+    ("Pérdidas altas recuperadas", "Disparos a puerta recibidos", False, "Transición defensiva"),
+    ("DeepPass", "xG de tiros a puerta", False,  "Fase defensiva"),
+    ("Pases progresivos", "xG", False, "Fase ofensiva"),
+]
+
+# Mapeo de nombres mostrados a nombres de columnas
+METRIC_MAPPING = {
+    "PPDA": "PPDA/90",
+    "Contraataques con disparo": "CtrShots/90",
+    "Pérdidas altas recuperadas": "CP_succes/90",
+    "Disparos a puerta recibidos": "ShotsOT/90",
+    "DeepPass": "DeepPass/90",
+    "xG de tiros a puerta": "PSxGA/90",
+    "Pases progresivos": "ProgPass/90",
+    "xG": "xG/90"
+}
+
+# Métricas del ranking: (columna, nombre mostrado)
+RANKING_METRICS = [
+    ("PPDA/90", "PPDA"),
+    ("CtrShots/90", "Contraataques con disparo"),
+    ("CP_succes/90", "Pérdidas altas recuperadas"),
+    ("ShotsOT/90", "Disparos a puerta recibidos"),
+    ("DeepPass/90", "DeepPass"),
+    ("PSxGA/90", "xG de tiros a puerta"),
+    ("ProgPass/90", "Pases progresivos"),
+    ("xG/90", "xG"),
+]
+
+# Métricas en las que menor es mejor (el ranking va de menor a mayor)
+ASCENDING_METRICS = ["PPDA/90", "PSxGA/90"]
+
+# Bundles ya calculados: liga -> bundle (se recalculan si cambia la versión de los datos)
+_bundles = {}
+_bundle_locks = {}
+_locks_lock = threading.Lock()
+
+_warm_up_thread = None
+
+
+def _axis_range(values):
+    """Rango del eje con un 15% de margen a cada lado"""
+    v_min, v_max = values.min(), values.max()
+    margin = (v_max - v_min) * 0.15
+    return [v_min - margin, v_max + margin]
+
+
+def _build_bundle(league, version):
+    """Precalcula todo lo que no depende del equipo seleccionado"""
+    df = load_team_stats(league, per90=True)
+
+    # Orden del ranking por métrica (mismo orden que sort_values en cada rerun)
+    rankings = {
+        metric_col: df.sort_values(metric_col, ascending=metric_col in ASCENDING_METRICS).index.to_numpy()
+        for metric_col, _ in RANKING_METRICS
+    }
+    medians = {col: df[col].median() for col, _ in RANKING_METRICS}
+
+    # Gráficas base (sin equipo resaltado)
+    phases = []
+    for (x, y, inv, title), color in zip(PHASES, PHASE_COLORS):
+        x_col = METRIC_MAPPING.get(x, x)
+        y_col = METRIC_MAPPING.get(y, y)
+        x_range = _axis_range(df[x_col])
+        y_range = _axis_range(df[y_col])
+        phases.append({
+            "x": x,
+            "y": y,
+            "x_col": x_col,
+            "y_col": y_col,
+            "invert": inv,
+            "title": title,
+            "color": color,
+            "x_range": x_range,
+            "y_range": y_range,
+            "figure": plot_phase_plotly(df, x_col, y_col, inv, title, color, x_range=x_range, y_range=y_range, x_label=x, y_label=y),
+        })
+
+    return {
+        "league": league,
+        "version": version,
+        "df": df,
+        "rankings": rankings,
+        "medians": medians,
+        "phases": phases,
+    }
+
+
+@profiled()
+def get_league_bundle(liga):
+    """Devuelve el bundle precalculado de una liga (compartido por todas las sesiones, no modificar)"""
+    league = resolve_league(liga)
+    version = team_stats_version()
+    bundle = _bundles.get(league)
+    if bundle is not None and bundle["version"] == version:
+        return bundle
+
+    with _locks_lock:
+        lock = _bundle_locks.setdefault(league, threading.Lock())
+    with lock:
+        # Si el warm-up u otra sesión lo acaba de construir, se reutiliza
+        bundle = _bundles.get(league)
+        if bundle is None or bundle["version"] != version:
+            bundle = _build_bundle(league, version)
+            _bundles[league] = bundle
+    return bundle
+
+
+def top_teams(bundle, metric_col, n=10):
+    """Top n del ranking de una métrica a partir del orden precalculado"""
+    return bundle["df"].loc[bundle["rankings"][metric_col][:n]]
+
+
+def _warm_up(leagues, also):
+    for league in leagues:
+        try:
+            get_league_bundle(league)
+        except Exception as e:
+            print(f"Error warming up {league}: {str(e)}")
+    for build in also:
+        try:
+            build()
+        except Exception as e:
+            print(f"Error warming up {getattr(build, '__name__', build)}: {str(e)}")
+
+
+def start_warm_up(leagues, also=()):
+    """Construye en segundo plano los bundles de todas las ligas y, después, los cálculos de also (una sola vez por proceso)"""
+    global _warm_up_thread
+    with _locks_lock:
+        if _warm_up_thread is not None:
+            return _warm_up_thread
+        _warm_up_thread = threading.Thread(target=_warm_up, args=(list(leagues), list(also)), name="league-bundle-warm-up", daemon=True)
+        _warm_up_thread.start()
+    return _warm_up_thread
@@ -0,0 +1,190 @@
+import base64
+import hashlib
+import io
+import os
+import threading
+
+from PIL import Image
+
+from utils.profiler import profiled
+
+# Tamaño máximo (px) de la versión reducida del logo que se usa en las gráficas
+LOGO_THUMB_SIZE = (160, 160)
+
+# Modo de servir los logos: "static" (URL cacheable), "inline" (data URI) o "auto"
+# En "auto" se usan URLs estáticas si Streamlit tiene activado server.enableStaticServing
+LOGO_MODE = os.environ.get("SCOUTVISION_LOGO_MODE", "auto")
+
+# Carpeta dentro de static/ donde se escriben los logos redimensionados (nombre = hash del contenido)
+STATIC_LOGO_DIR = os.path.join("static", "cache", "logos")
+STATIC_LOGO_URL = "app/static/cache/logos"
+
+# Tamaño de visualización (px) de los logos en cada parte de la app
+LOGO_DISPLAY_SIZES = {
+    "barca": 120,
+    "league": 168,
+    "grid": 120,
+    "ranking": 28,
+    "chart": 160,
+}
+
+# Caché de logos compartida por todas las sesiones del proceso: ruta -> asset
+# Cada asset guarda el mtime con el que se leyó para invalidarlo si el archivo cambia
+_logo_cache = {}
+_logo_lock = threading.Lock()
+
+
+def _cargar_logo(path, mtime):
+    """Lee un logo de disco y precalcula bytes, base64 e imagen reducida"""
+    with open(path, "rb") as image_file:
+        raw = image_file.read()
+
+    image = None
+    thumb_uri = None
+    try:
+        image = Image.open(io.BytesIO(raw))
+        image.load()
+        image.thumbnail(LOGO_THUMB_SIZE)
+        # Se guarda ya codificada para que plotly no vuelva a convertir el PNG en cada gráfica
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        thumb_uri = "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+    except Exception as e:
+        print(f"Error decoding image {path}: {str(e)}")
+        image = None
+
+    return {
+        "path": path,
+        "mtime": mtime,
+        "bytes": raw,
+        "base64": base64.b64encode(raw).decode(),
+        "image": image,
+        "thumb_uri": thumb_uri,
+    }
+
+
+@profiled()
+def get_logo_asset(path):
+    """Devuelve el asset cacheado de un logo (None si el archivo no existe)"""
+    if not path:
+        return None
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+
+    asset = _logo_cache.get(path)
+    if asset is not None and asset["mtime"] == mtime:
+        return asset
+
+    with _logo_lock:
+        # Otra sesión puede haberlo cargado mientras esperábamos el lock
+        asset = _logo_cache.get(path)
+        if asset is None or asset["mtime"] != mtime:
+            try:
+                asset = _cargar_logo(path, mtime)
+            except OSError as e:
+                print(f"Error loading image {path}: {str(e)}")
+                return None
+            _logo_cache[path] = asset
+    return asset
+
+
+def get_logo_base64(path):
+    """Devuelve el PNG original codificado en base64 ('' si no existe)"""
+    asset = get_logo_asset(path)
+    return asset["base64"] if asset else ""
+
+
+def get_logo_image(path):
+    """Devuelve la imagen PIL reducida del logo (None si no existe)"""
+    asset = get_logo_asset(path)
+    return asset["image"] if asset else None
+
+
+def get_logo_thumb_uri(path):
+    """Devuelve la imagen reducida como data URI lista para plotly (None si no existe)"""
+    asset = get_logo_asset(path)
+    return asset["thumb_uri"] if asset else None
+
+
+def static_logos_enabled():
+    """Indica si los logos se sirven como archivos estáticos en lugar de en línea"""
+    if LOGO_MODE != "auto":
+        return LOGO_MODE == "static"
+    try:
+        from streamlit import config
+        return bool(config.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def _static_url(filename):
+    """URL absoluta de un archivo estático (respeta server.baseUrlPath)"""
+    try:
+        from streamlit import config
+        base = (config.get_option("server.baseUrlPath") or "").strip("/")
+    except Exception:
+        base = ""
+    prefix = f"/{base}" if base else ""
+    return f"{prefix}/{STATIC_LOGO_URL}/{filename}"
+
+
+def _escribir_logo_estatico(asset, size):
+    """Redimensiona el logo al tamaño de visualización y lo escribe una sola vez con nombre por hash"""
+    image = Image.open(io.BytesIO(asset["bytes"]))
+    # Doble resolución para pantallas de alta densidad
+    image.thumbnail((size * 2, size * 2))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    data = buffer.getvalue()
+
+    filename = hashlib.sha1(data).hexdigest()[:16] + ".png"
+    target = os.path.join(STATIC_LOGO_DIR, filename)
+    if not os.path.exists(target):
+        os.makedirs(STATIC_LOGO_DIR, exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+    return _static_url(filename)
+
+
+def get_logo_static_url(path, size):
+    """URL estática del logo redimensionado a size px (None si no existe o no se puede escribir)"""
+    asset = get_logo_asset(path)
+    if asset is None:
+        return None
+    urls = asset.setdefault("static_urls", {})
+    if size not in urls:
+        try:
+            urls[size] = _escribir_logo_estatico(asset, size)
+        except Exception as e:
+            print(f"Error writing static logo {path}: {str(e)}")
+            urls[size] = None
+    return urls[size]
+
+
+# Camino de los logos que usa la app (grid, ranking, portada): su fila del perfil incluye lectura y codificación
+@profiled()
+def get_logo_src(path, size, inline_thumb=False):
+    """Valor para src/source de un logo: URL estática o, como fallback, data URI en línea"""
+    if static_logos_enabled():
+        url = get_logo_static_url(path, size)
+        if url:
+            return url
+    asset = get_logo_asset(path)
+    if asset is None:
+        return None
+    if inline_thumb and asset["thumb_uri"]:
+        return asset["thumb_uri"]
+    return "data:image/png;base64," + asset["base64"]
+
+
+def invalidate_logo_cache(path=None):
+    """Vacía la caché de logos completa o solo la entrada de una ruta"""
+    with _logo_lock:
+        if path is None:
+            _logo_cache.clear()
+        else:
+            _logo_cache.pop(path, None)
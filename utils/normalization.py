@@ -0,0 +1,149 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Grupo de posición con el que se compara a cada jugador
+POSITION_GROUPS = {
+    "GK": "Portero",
+    "CB": "Central",
+    "RB": "Lateral",
+    "LB": "Lateral",
+    "RWB": "Lateral",
+    "LWB": "Lateral",
+    "CDM": "Mediocentro",
+    "CM": "Mediocentro",
+    "CM-CDM": "Mediocentro",
+    "CAM": "Mediapunta",
+    "W": "Extremo",
+    "RW": "Extremo",
+    "LW": "Extremo",
+    "ST": "Delantero",
+    "CF": "Delantero",
+}
+
+# Métricas en las que un valor bajo es mejor (su percentil se invierte)
+INVERTED_METRICS = set()
+
+# Si un grupo (posición + liga) tiene menos valores que esto en una métrica, se usa toda la población
+MIN_GROUP_SIZE = 5
+
+# Métodos: "rank" (percentil empírico) o "gaussian" (CDF normal del z-score, como el sistema de rating)
+NORMALIZATION_METHODS = ("rank", "gaussian")
+
+_METRIC_SLOT = re.compile(r"^Metrica (\d+)$")
+
+
+def position_group(positions):
+    """Grupo de posición de cada jugador (las posiciones desconocidas forman su propio grupo)"""
+    positions = pd.Series(positions, dtype=object).astype(str).str.strip()
+    return positions.map(POSITION_GROUPS).fillna(positions).to_numpy()
+
+
+def _percentiles(frame, groups, method):
+    """Percentil 0-100 de todas las columnas a la vez, dentro de cada grupo"""
+    grouped = frame.groupby(groups) if groups is not None else frame.groupby(np.zeros(len(frame)))
+    if method == "rank":
+        return grouped.rank(pct=True, method="average").to_numpy() * 100
+
+    from scipy.special import ndtr
+
+    mean = grouped.transform("mean").to_numpy()
+    std = grouped.transform("std", ddof=0).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (frame.to_numpy() - mean) / std
+    # Todos los valores iguales: se quedan en el centro
+    z = np.where(std == 0, 0.0, z)
+    return ndtr(z) * 100
+
+
+def percentile_matrix(values, groups=None, method="rank", invert=None, min_group_size=MIN_GROUP_SIZE):
+    """Normaliza una matriz densa jugador x métrica (NaN = sin dato) a percentiles 0-100
+
+    groups es una etiqueta por jugador; cada métrica se puntúa solo contra su grupo, salvo
+    cuando el grupo tiene menos de min_group_size valores, que se usa toda la población.
+    invert es una máscara booleana por métrica (True = menos es mejor).
+    """
+    if method not in NORMALIZATION_METHODS:
+        raise ValueError(f"Método de normalización desconocido: {method}")
+    values = np.asarray(values, dtype=float)
+    if invert is not None:
+        values = np.where(np.asarray(invert, dtype=bool), -values, values)
+    frame = pd.DataFrame(values)
+
+    result = _percentiles(frame, None, method)
+    if groups is not None:
+        groups = pd.Series(groups).astype(str).to_numpy()
+        counts = frame.notna().groupby(groups).transform("sum").to_numpy()
+        result = np.where(counts >= min_group_size, _percentiles(frame, groups, method), result)
+    result[np.isnan(values)] = np.nan
+    return result
+
+
+def radar_long(wide, value_columns=("Valor Original", "Valor Normalizado")):
+    """Columnas 'Metrica i' / '<valor> i' de una tabla ancha de radares en formato largo
+
+    Una fila por (fila de wide, slot i), ordenadas por slot y luego por fila, con las columnas row,
+    slot, Metrica (sin espacios; NaN si falta) y cada columna de valor como número (admite coma
+    decimal; NaN si falta o no es un número). Es el único analizador del formato ancho: lo usan la
+    normalización y utils.player_store.
+    """
+    slots = sorted(int(m.group(1)) for m in map(_METRIC_SLOT.match, wide.columns) if m)
+    n = len(wide)
+
+    def columna(name):
+        parts = [wide.get(f"{name} {i}", pd.Series(np.nan, index=wide.index)) for i in slots]
+        return pd.concat(parts, ignore_index=True) if parts else pd.Series([], dtype=object)
+
+    long = pd.DataFrame({"row": np.tile(np.arange(n), len(slots)), "slot": np.repeat(slots, n).astype(int)})
+    names = columna("Metrica")
+    long["Metrica"] = names.astype(str).str.strip().where(names.notna())
+    for value_column in value_columns:
+        long[value_column] = pd.to_numeric(columna(value_column).astype(str).str.replace(",", "."), errors="coerce").to_numpy(dtype=float)
+    return long
+
+
+def radar_value_matrix(wide, value_column="Valor Original"):
+    """Pasa las columnas 'Metrica i' / '<value_column> i' a (métricas, matriz densa, filas, columnas, slots)"""
+    long = radar_long(wide, (value_column,))
+    raw = long[value_column].to_numpy()
+    names = long["Metrica"]
+    valid = names.notna().to_numpy() & ~np.isnan(raw)
+    metrics = sorted(set(names[valid]))
+    metric_index = {metric: j for j, metric in enumerate(metrics)}
+    cols = np.array([metric_index.get(name, -1) for name in names], dtype=int)
+    rows = long["row"].to_numpy()
+
+    matrix = np.full((len(wide), len(metrics)), np.nan)
+    matrix[rows[valid], cols[valid]] = raw[valid]
+    return metrics, matrix, rows, cols, long["slot"].to_numpy()
+
+
+def normalize_radar_table(wide, by=("position", "league"), method="rank", min_group_size=MIN_GROUP_SIZE):
+    """Recalcula las columnas 'Valor Normalizado i' de una tabla ancha de radares
+
+    by indica con quién se compara a cada jugador: "position" (grupo de posición), "league",
+    ambos o ninguno (toda la población). Devuelve una copia de la tabla.
+    """
+    metrics, matrix, rows, cols, slots = radar_value_matrix(wide)
+    labels = []
+    if "position" in by:
+        labels.append(position_group(wide["Posicion"]))
+    if "league" in by and "league" in wide.columns:
+        labels.append(wide["league"].astype(str).to_numpy())
+    groups = None
+    if labels:
+        groups = labels[0] if len(labels) == 1 else pd.Series(list(zip(*labels))).astype(str).to_numpy()
+
+    invert = np.array([metric in INVERTED_METRICS for metric in metrics], dtype=bool)
+    normalized = percentile_matrix(matrix, groups, method=method, invert=invert, min_group_size=min_group_size)
+
+    # Vuelta al formato ancho: cada (fila, slot) toma el percentil de su métrica
+    gathered = np.full(len(rows), np.nan)
+    found = cols >= 0
+    gathered[found] = normalized[rows[found], cols[found]]
+    result = wide.copy()
+    n = len(wide)
+    for k, i in enumerate(dict.fromkeys(slots)):
+        result[f"Valor Normalizado {i}"] = np.round(gathered[k * n:(k + 1) * n], 1)
+    return result
@@ -0,0 +1,137 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.arrow_snapshot import read_player_store
+from utils.data_store import dataset_signature, query
+from utils.normalization import radar_long
+from utils.profiler import profiled
+from utils.shared_tables import load_player_store, shared_version
+from utils.snapshot import get_table, publish, register_table
+
+# CSV de radares (configurable por variable de entorno)
+RADAR_CSV_PATH = os.environ.get("SCOUTVISION_RADAR_CSV", os.path.join("DatosLinkedin", "radares_nico_williams.csv"))
+
+# Columnas identificativas del jugador en el CSV
+PLAYER_COLUMNS = ['Jugador', 'Equipo', 'Posicion']
+
+def _dataset_radares():
+    """Dataset Parquet del que se leen los radares (None si no hay ninguno ingerido)
+
+    Se prefiere radares_normalizado (percentiles recalculados por utils.refresh) si está al día
+    con radares; si radares se reingirió después sin recalcularlo, se usa radares tal cual.
+    """
+    raw = dataset_signature("radares")
+    if raw is None:
+        return None
+    normalized = dataset_signature("radares_normalizado")
+    if normalized is not None and normalized[1] >= raw[1]:
+        return "radares_normalizado"
+    return "radares"
+
+
+def _firma_origen():
+    """Identifica la versión de los datos de origen (Parquet ingerido o CSV) por su mtime"""
+    dataset = _dataset_radares()
+    if dataset is not None:
+        return ("parquet", dataset) + dataset_signature(dataset)
+    return ("csv", RADAR_CSV_PATH, os.stat(RADAR_CSV_PATH).st_mtime)
+
+
+def _leer_origen(signature):
+    """Lee la tabla ancha de radares desde Parquet o desde el CSV"""
+    if signature[0] == "parquet":
+        return query(signature[1])
+    return pd.read_csv(RADAR_CSV_PATH, sep=';')
+
+
+def _to_long(wide):
+    """Convierte las columnas 'Metrica i' / 'Valor ... i' en una tabla larga con valores numéricos"""
+    players = wide[PLAYER_COLUMNS].copy()
+    players['Jugador'] = players['Jugador'].astype(str).str.strip()
+    players['Equipo'] = players['Equipo'].astype(str).str.strip()
+
+    # Mismo analizador del formato ancho que la normalización de percentiles
+    values = radar_long(wide)
+    long = pd.concat([players.iloc[values['row'].to_numpy()].reset_index(drop=True), values], axis=1)
+    long = long[long['Metrica'].notna() & long['Valor Normalizado'].notna()].copy()
+    long['Valor Normalizado'] = long['Valor Normalizado'].clip(0, 100)
+    # float32, como en la instantánea Arrow: el almacén es igual se construya o se lea de ella
+    long[['Valor Original', 'Valor Normalizado']] = long[['Valor Original', 'Valor Normalizado']].astype(np.float32)
+    return long.sort_values(['row', 'slot'], kind='stable').drop(columns='slot').reset_index(drop=True)
+
+
+def _build_store(signature):
+    """Construye la tabla larga, la matriz densa jugador x métrica y el índice (jugador, equipo)"""
+    wide = _leer_origen(signature)
+    long = _to_long(wide)
+
+    players = wide[PLAYER_COLUMNS].copy()
+    players['Jugador'] = players['Jugador'].astype(str).str.strip()
+    players['Equipo'] = players['Equipo'].astype(str).str.strip()
+    # Si un jugador aparece varias veces con el mismo equipo, vale la primera fila (como antes)
+    players = players.reset_index(drop=True)
+    index = {}
+    for row, key in enumerate(zip(players['Jugador'], players['Equipo'])):
+        index.setdefault(key, row)
+
+    metrics = sorted(long['Metrica'].unique())
+    metric_index = {metric: j for j, metric in enumerate(metrics)}
+    matrix = np.full((len(players), len(metrics)), np.nan, dtype=np.float32)
+    # Las métricas repetidas de un jugador se quedan con el último valor (igual que el dict original)
+    matrix[long['row'].to_numpy(), long['Metrica'].map(metric_index).to_numpy()] = long['Valor Normalizado'].to_numpy()
+
+    return {
+        "signature": signature,
+        "players": players,
+        "long": long,
+        "metrics": metrics,
+        "metric_index": metric_index,
+        "matrix": matrix,
+        "index": index,
+    }
+
+
+@register_table("players", signature=lambda: shared_version() or _firma_origen())
+def _build_current_store():
+    """Almacén de jugadores para la instantánea compartida"""
+    version = shared_version()
+    if version is not None:
+        # Matriz mapeada desde la instantánea Arrow compartida (ya es de solo lectura)
+        return load_player_store(version)
+    # Instantánea Arrow de la ingesta (matriz mapeada, de solo lectura) si está al día con el origen
+    store = read_player_store(signature=_firma_origen())
+    if store is not None:
+        return store
+    store = _build_store(_firma_origen())
+    # Lo comparten todas las sesiones: la matriz queda de solo lectura
+    store["matrix"].flags.writeable = False
+    return store
+
+
+@profiled()
+def get_player_store():
+    """Devuelve el almacén de métricas de jugadores (de la instantánea compartida; se recarga si cambia el origen)"""
+    return get_table("players")
+
+
+def get_player_row(player_name, team, store=None):
+    """Fila del jugador en la matriz (None si no existe)"""
+    store = store or get_player_store()
+    return store["index"].get((player_name.strip(), team.strip()))
+
+
+def get_player_metrics(player_name, team, store=None):
+    """Métricas normalizadas (0-100) de un jugador como dict {métrica: valor} (None si no existe)"""
+    store = store or get_player_store()
+    row = get_player_row(player_name, team, store)
+    if row is None:
+        return None
+    values = store["matrix"][row]
+    return {metric: float(value) for metric, value in zip(store["metrics"], values) if not np.isnan(value)}
+
+
+def invalidate_player_store():
+    """Reconstruye el almacén y publica una instantánea nueva"""
+    publish(["players"])
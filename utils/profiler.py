@@ -0,0 +1,169 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Perfilado activado con SCOUTVISION_PROFILE=1 (desactivado no añade ningún coste a las funciones)
+PROFILE_ENABLED = os.environ.get("SCOUTVISION_PROFILE", "0").lower() in ("1", "true", "yes")
+
+# Log JSON-lines con una línea por rerun
+PROFILE_LOG_PATH = os.environ.get("SCOUTVISION_PROFILE_LOG", os.path.join("data", "profile.jsonl"))
+
+# Mostrar el panel del último rerun en la barra lateral
+PROFILE_SIDEBAR = os.environ.get("SCOUTVISION_PROFILE_SIDEBAR", "1").lower() in ("1", "true", "yes")
+
+# Cada sesión de Streamlit ejecuta su script en su propio hilo: el rerun en curso es por hilo
+_local = threading.local()
+_log_lock = threading.Lock()
+_patched = False
+
+
+def _current():
+    return getattr(_local, "run", None)
+
+
+def _record(name, elapsed):
+    run = _current()
+    if run is None:
+        return
+    stats = run["functions"].setdefault(name, {"calls": 0, "time": 0.0})
+    stats["calls"] += 1
+    stats["time"] += elapsed
+
+
+def _record_output(kind, size):
+    run = _current()
+    if run is None:
+        return
+    stats = run["output"].setdefault(kind, {"messages": 0, "bytes": 0})
+    stats["messages"] += 1
+    stats["bytes"] += size
+
+
+@contextmanager
+def profile_block(name):
+    """Mide el tiempo de un bloque dentro del rerun en curso"""
+    if not PROFILE_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def profiled(name=None):
+    """Decorador que acumula llamadas y tiempo (inclusivo) de una función en el rerun en curso"""
+    def decorator(func):
+        if not PROFILE_ENABLED:
+            return func
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(label, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def _figure_size(figure_or_data):
+    try:
+        return len(figure_or_data.to_json())
+    except Exception:
+        return 0
+
+
+def _patch_streamlit():
+    """Envuelve st.markdown y st.plotly_chart para contar mensajes y bytes enviados al navegador"""
+    global _patched
+    if _patched:
+        return
+    import streamlit as st
+
+    markdown = st.markdown
+    plotly_chart = st.plotly_chart
+
+    @functools.wraps(markdown)
+    def counted_markdown(body, *args, **kwargs):
+        _record_output("markdown", len(str(body).encode("utf-8")))
+        return markdown(body, *args, **kwargs)
+
+    @functools.wraps(plotly_chart)
+    def counted_plotly_chart(figure_or_data, *args, **kwargs):
+        if _current() is not None:
+            _record_output("plotly_chart", _figure_size(figure_or_data))
+        return plotly_chart(figure_or_data, *args, **kwargs)
+
+    st.markdown = counted_markdown
+    st.plotly_chart = counted_plotly_chart
+    _patched = True
+
+
+def _write_log(run):
+    os.makedirs(os.path.dirname(PROFILE_LOG_PATH) or ".", exist_ok=True)
+    line = json.dumps(run, ensure_ascii=False)
+    with _log_lock:
+        with open(PROFILE_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def start_rerun(page):
+    """Empieza a medir un rerun (al principio del script); no hace nada si el perfilado está desactivado"""
+    if not PROFILE_ENABLED:
+        return
+    _patch_streamlit()
+    previous = _current()
+    if previous is not None:
+        # El rerun anterior se cortó (st.rerun / st.stop) antes de llegar a finish_rerun
+        _close(previous, interrupted=True)
+    _local.run = {
+        "page": page,
+        "started_at": time.time(),
+        "_start": time.perf_counter(),
+        "functions": {},
+        "output": {},
+    }
+
+
+def _close(run, interrupted=False):
+    run["total"] = time.perf_counter() - run.pop("_start")
+    run["interrupted"] = interrupted
+    _local.run = None
+    try:
+        _write_log(run)
+    except OSError as e:
+        print(f"Error writing profile log: {str(e)}")
+    return run
+
+
+def finish_rerun():
+    """Cierra el rerun en curso, lo añade al log y, si está activado, muestra el panel lateral"""
+    run = _current()
+    if run is None:
+        return None
+    run = _close(run)
+    if PROFILE_SIDEBAR:
+        _render_sidebar(run)
+    return run
+
+
+def _render_sidebar(run):
+    import streamlit as st
+
+    with st.sidebar.expander(f"⏱️ Rerun: {run['total'] * 1000:.0f} ms", expanded=False):
+        rows = sorted(run["functions"].items(), key=lambda item: -item[1]["time"])
+        st.table([
+            {"Función": name, "Llamadas": stats["calls"], "ms": round(stats["time"] * 1000, 1)}
+            for name, stats in rows
+        ])
+        st.table([
+            {"Salida": kind, "Mensajes": stats["messages"], "KB": round(stats["bytes"] / 1024, 1)}
+            for kind, stats in run["output"].items()
+        ])
@@ -0,0 +1,175 @@
+import math
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+from plotly.subplots import make_subplots
+
+from utils.player_store import get_player_row, get_player_store
+
+# Colores de línea por equipo
+TEAM_COLORS = {
+    "Barcelona": '#004D98',
+    "Bayern": '#DC052D',
+}
+
+# Paleta para comparar más de un jugador por equipo
+PLAYER_PALETTE = qualitative.Plotly
+
+# Estilo común de los ejes polares
+RADAR_POLAR = dict(
+    radialaxis=dict(
+        visible=True,
+        range=[0, 100],
+        gridcolor='rgba(128, 128, 128, 0.3)',
+        gridwidth=1
+    ),
+    angularaxis=dict(
+        direction='clockwise',
+        rotation=90,
+        gridcolor='rgba(128, 128, 128, 0.3)',
+        gridwidth=1,
+        linecolor='rgba(128, 128, 128, 0.6)',
+        linewidth=1
+    ),
+    bgcolor='rgba(255, 255, 255, 0.9)'
+)
+
+
+def _fill_color(color, alpha=0.3):
+    """Convierte '#RRGGBB' en 'rgba(r, g, b, alpha)'"""
+    color = color.lstrip('#')
+    r, g, b = (int(color[i:i + 2], 16) for i in (0, 2, 4))
+    return f'rgba({r}, {g}, {b}, {alpha})'
+
+
+def resolve_players(keys, store=None):
+    """Resuelve las métricas de varios (jugador, equipo) en una sola pasada sobre la matriz
+
+    Devuelve (claves encontradas, claves no encontradas, submatriz con NaN donde falta la métrica).
+    Un jugador sin ninguna métrica cuenta como no encontrado (no hay nada que dibujar).
+    """
+    store = store or get_player_store()
+    rows = [get_player_row(player, team, store) for player, team in keys]
+    rows = [row if row is not None and not np.isnan(store["matrix"][row]).all() else None for row in rows]
+    found = [key for key, row in zip(keys, rows) if row is not None]
+    missing = [key for key, row in zip(keys, rows) if row is None]
+    matrix = store["matrix"][[row for row in rows if row is not None]]
+    return found, missing, matrix
+
+
+def _categorias(matrix, metrics):
+    """Métricas que tiene al menos uno de los jugadores (columnas alineadas una sola vez)"""
+    present = ~np.isnan(matrix).all(axis=0)
+    return [metrics[j] for j in np.flatnonzero(present)], present
+
+
+def _radar_traces(names, categories, values, colors):
+    """Una traza cerrada por jugador (los valores que faltan cuentan como 0); sin categorías no hay trazas"""
+    if not categories:
+        return []
+    categories_closed = categories + [categories[0]]
+    traces = []
+    for name, row, color in zip(names, values, colors):
+        r = list(row) + [row[0]]
+        traces.append(go.Scatterpolar(
+            r=r,
+            theta=categories_closed,
+            fill='toself',
+            name=name,
+            line_color=color,
+            fillcolor=_fill_color(color),
+            connectgaps=True,
+            line=dict(color=color, width=2)
+        ))
+    return traces
+
+
+def build_radar_figure(names, categories, values, colors, height=350):
+    """Radar con un jugador por traza"""
+    fig = go.Figure()
+    fig.add_traces(_radar_traces(names, categories, values, colors))
+    fig.update_layout(
+        polar=RADAR_POLAR,
+        showlegend=True,
+        height=height,
+        margin=dict(t=20, b=20, l=20, r=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
+def _player_colors(keys):
+    """Color del equipo si es el único jugador de su equipo; si no, colores de la paleta"""
+    teams = [team for _, team in keys]
+    colors = []
+    for i, team in enumerate(teams):
+        if teams.count(team) == 1 and team in TEAM_COLORS:
+            colors.append(TEAM_COLORS[team])
+        else:
+            colors.append(PLAYER_PALETTE[i % len(PLAYER_PALETTE)])
+    return colors
+
+
+def create_radar_batch(keys, store=None, height=450):
+    """Radar con N jugadores superpuestos; devuelve (figura o None, claves no encontradas)"""
+    store = store or get_player_store()
+    found, missing, matrix = resolve_players(keys, store)
+    if not found:
+        return None, missing
+    categories, present = _categorias(matrix, store["metrics"])
+    values = np.nan_to_num(matrix[:, present], nan=0.0)
+    names = [f"{player} ({team})" for player, team in found]
+    return build_radar_figure(names, categories, values, _player_colors(found), height=height), missing
+
+
+def create_radar_grid(pairs, cols=3, store=None, row_height=320):
+    """Cuadrícula de radares, uno por pareja; devuelve (figura o None, claves no encontradas)"""
+    store = store or get_player_store()
+    # Todas las claves se resuelven de una vez; cada pareja toma sus filas de la misma submatriz
+    keys = list(dict.fromkeys(key for pair in pairs for key in pair))
+    found, missing, matrix = resolve_players(keys, store)
+    position = {key: i for i, key in enumerate(found)}
+    pairs = [pair for pair in pairs if all(key in position for key in pair)]
+    if not pairs:
+        return None, missing
+
+    rows = math.ceil(len(pairs) / cols)
+    fig = make_subplots(
+        rows=rows,
+        cols=cols,
+        specs=[[{"type": "polar"}] * cols for _ in range(rows)],
+        subplot_titles=[" vs ".join(player for player, _ in pair) for pair in pairs],
+        vertical_spacing=0.6 / rows,
+    )
+    for i, pair in enumerate(pairs):
+        pair_matrix = matrix[[position[key] for key in pair]]
+        categories, present = _categorias(pair_matrix, store["metrics"])
+        values = np.nan_to_num(pair_matrix[:, present], nan=0.0)
+        names = [f"{player} ({team})" for player, team in pair]
+        for trace in _radar_traces(names, categories, values, _player_colors(list(pair))):
+            trace.showlegend = False
+            fig.add_trace(trace, row=i // cols + 1, col=i % cols + 1)
+
+    fig.update_polars(**RADAR_POLAR)
+    fig.update_polars(radialaxis_showticklabels=False, angularaxis_tickfont_size=9)
+    fig.update_layout(
+        height=row_height * rows,
+        margin=dict(t=40, b=20, l=40, r=40),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig, missing
+
+
+def lineup_pairs(team_a, team_b, store=None):
+    """Empareja los jugadores de dos equipos por posición, en el orden del archivo"""
+    store = store or get_player_store()
+    players = store["players"]
+    pairs = []
+    for pos in dict.fromkeys(players['Posicion']):
+        side_a = players[(players['Equipo'] == team_a) & (players['Posicion'] == pos)]['Jugador'].tolist()
+        side_b = players[(players['Equipo'] == team_b) & (players['Posicion'] == pos)]['Jugador'].tolist()
+        pairs.extend(((a, team_a), (b, team_b)) for a, b in zip(side_a, side_b))
+    return pairs
@@ -0,0 +1,88 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.league_bundle import ASCENDING_METRICS, RANKING_METRICS
+from utils.team_stats import LEAGUE_SEEDS, load_team_stats, team_stats_version
+
+# Tabla combinada de las cinco ligas (se recalcula si cambia la versión de los datos de equipos)
+_combined = None
+_combined_lock = threading.Lock()
+
+
+def partial_top_k(values, k, ascending=False, mask=None):
+    """Posiciones de los k mejores valores sin ordenar todo el array (argpartition + orden de k)
+
+    Los NaN quedan siempre al final; mask limita la selección a las posiciones marcadas.
+    """
+    values = np.asarray(values, dtype=float)
+    candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(values))
+    keys = values[candidates] if ascending else -values[candidates]
+    keys = np.where(np.isnan(keys), np.inf, keys)
+    k = min(k, len(candidates))
+    if k <= 0:
+        return candidates[:0]
+    if k < len(candidates):
+        part = np.argpartition(keys, k - 1)[:k]
+    else:
+        part = np.arange(len(candidates))
+    return candidates[part[np.argsort(keys[part], kind="stable")]]
+
+
+def _build_combined(version):
+    """Concatena las cinco ligas y precalcula el orden completo de cada métrica"""
+    df = pd.concat(
+        [load_team_stats(league).assign(League=league) for league in LEAGUE_SEEDS],
+        ignore_index=True,
+    )
+    league_codes, leagues = pd.factorize(df['League'])
+    orders = {}
+    for metric_col, _ in RANKING_METRICS:
+        values = df[metric_col].to_numpy(dtype=float)
+        keys = values if metric_col in ASCENDING_METRICS else -values
+        orders[metric_col] = np.argsort(keys, kind="stable")
+    return {
+        "version": version,
+        "df": df,
+        "league_codes": league_codes,
+        "leagues": list(leagues),
+        "orders": orders,
+    }
+
+
+def get_combined_rankings():
+    """Tabla combinada y órdenes precalculados (compartidos por todas las sesiones, no modificar)"""
+    global _combined
+    version = team_stats_version()
+    combined = _combined
+    if combined is not None and combined["version"] == version:
+        return combined
+    with _combined_lock:
+        if _combined is None or _combined["version"] != version:
+            _combined = _build_combined(version)
+        return _combined
+
+
+def _league_mask(combined, leagues):
+    """Máscara de filas de las ligas elegidas (None = todas)"""
+    if leagues is None:
+        return None
+    codes = [combined["leagues"].index(league) for league in leagues if league in combined["leagues"]]
+    return np.isin(combined["league_codes"], codes)
+
+
+def top_cross_league(metric_col, k=10, leagues=None, combined=None):
+    """Top k de una métrica en cualquier subconjunto de ligas, filtrando el orden precalculado sin reordenar"""
+    combined = combined or get_combined_rankings()
+    mask = _league_mask(combined, leagues)
+    order = combined["orders"].get(metric_col)
+    if order is None:
+        # Columna sin orden precalculado: selección parcial
+        ascending = metric_col in ASCENDING_METRICS
+        rows = partial_top_k(combined["df"][metric_col], k, ascending=ascending, mask=mask)
+    elif mask is None:
+        rows = order[:k]
+    else:
+        rows = order[mask[order]][:k]
+    return combined["df"].loc[rows]
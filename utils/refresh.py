@@ -0,0 +1,238 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from utils.arrow_snapshot import write_snapshot
+from utils.data_store import has_dataset, ingest_dataframe, ingest_radar_csv, query, radar_partition, read_radar_csv
+from utils.fbref import MAX_WORKERS, extract_arrow_table, fetch_many, squad_jobs
+from utils.normalization import normalize_radar_table
+from utils.snapshot import publish_changed
+from utils.table_stream import table_digest, to_dataframe
+
+# Manifiesto de la última ingesta: origen, hash del contenido y hora de descarga por dataset
+MANIFEST_PATH = os.environ.get("SCOUTVISION_INGEST_MANIFEST", os.path.join("data", "ingest_manifest.json"))
+
+# Columnas de FBref que no son numéricas
+FBREF_TEXT_COLUMNS = ["Jugador", "Nation", "Pos", "Squad", "Matches", "league", "season", "team"]
+
+# Filas de totales que FBref pone en el pie de las tablas de plantilla
+FBREF_TOTAL_ROWS = ["Squad Total", "Opponent Total"]
+
+# Columnas de conteo de la tabla estándar de FBref (las únicas que se convierten en valores por 90)
+FBREF_COUNTING_STATS = ["Gls", "Ast", "G+A", "G-PK", "PK", "PKatt", "CrdY", "CrdR", "xG", "npxG", "xAG", "npxG+xAG", "PrgC", "PrgP", "PrgR"]
+
+# Tablas derivadas: nombre -> {"inputs": datasets de entrada, "build": función(particiones cambiadas)}
+DERIVED_TABLES = {}
+
+_manifest_lock = threading.Lock()
+
+
+def _hash(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(path=None):
+    """Lee el manifiesto (vacío si todavía no existe)"""
+    try:
+        with open(path or MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path=None):
+    """Guarda el manifiesto de forma atómica"""
+    path = path or MANIFEST_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def register_derived(name, inputs):
+    """Decorador para registrar una tabla derivada que se recalcula si cambia alguna de sus entradas"""
+    def decorator(build):
+        DERIVED_TABLES[name] = {"inputs": list(inputs), "build": build}
+        return build
+    return decorator
+
+
+def _job_key(job):
+    return f"{job['dataset']}/{job['league']}/{job['season']}/{job['team']}"
+
+
+def refresh_jobs(jobs, manifest, max_workers=MAX_WORKERS, **fetch_kwargs):
+    """Descarga (con revalidación) y re-ingiere solo las tablas cuyo contenido ha cambiado
+
+    Devuelve {dataset: set de particiones (liga, temporada, equipo) cambiadas}.
+    """
+    changed = {}
+    responses = fetch_many([job["url"] for job in jobs], max_workers=max_workers, **fetch_kwargs)
+    for job in jobs:
+        key = _job_key(job)
+        response = responses[job["url"]]
+        if isinstance(response, Exception):
+            print(f"❌ {key}: {response}")
+            continue
+        html, info = response
+        entry = manifest.get(key, {})
+
+        # Página idéntica a la última ingesta: no se vuelve a analizar
+        content_hash = _hash(html)
+        if entry.get("content_hash") == content_hash:
+            entry["fetched_at"] = info["fetched_at"]
+            manifest[key] = entry
+            continue
+
+        # Tabla en streaming (sin el DOM de la página): su hash se calcula sobre los datos ya extraídos
+        try:
+            table = extract_arrow_table(html, job["table_id"])
+        except ValueError as e:
+            print(f"❌ {key}: {e}")
+            continue
+
+        # La página cambió pero la tabla no (anuncios, fecha de actualización...)
+        table_hash = table_digest(table)
+        if entry.get("table_hash") != table_hash:
+            try:
+                ingest_dataframe(to_dataframe(table), job["dataset"], job["league"], job["season"], team=job["team"])
+            except Exception as e:
+                # Sin actualizar el manifiesto: se reintenta en la próxima actualización
+                print(f"❌ {key}: {e}")
+                continue
+            changed.setdefault(job["dataset"], set()).add((job["league"], job["season"], job["team"]))
+            entry["ingested_at"] = time.time()
+
+        entry.update(source=job["url"], content_hash=content_hash, table_hash=table_hash, fetched_at=info["fetched_at"])
+        manifest[key] = entry
+    return changed
+
+
+def refresh_radar_csv(path, manifest):
+    """Re-ingiere del CSV de radares solo los equipos cuyas filas han cambiado
+
+    Devuelve {"radares": particiones (liga, temporada, equipo) reingeridas} o {} si no cambió nada.
+    """
+    key = f"radares/{os.path.abspath(path)}"
+    with open(path, "rb") as f:
+        content_hash = _hash(f.read())
+    entry = manifest.get(key, {})
+    if entry.get("content_hash") == content_hash and has_dataset("radares"):
+        return {}
+
+    # Hash por equipo: si el CSV cambia solo en un equipo, solo se reescribe su partición
+    team_hashes = {team: _hash(team_df.to_csv(index=False)) for team, team_df in read_radar_csv(path).groupby("Equipo", sort=False)}
+    previous = entry.get("teams", {}) if has_dataset("radares") else {}
+    teams = [team for team, team_hash in team_hashes.items() if previous.get(team) != team_hash]
+    if teams:
+        ingest_radar_csv(path, teams=set(teams))
+    manifest[key] = dict(entry, source=path, content_hash=content_hash, teams=team_hashes, fetched_at=time.time())
+    if not teams:
+        return {}
+    manifest[key]["ingested_at"] = time.time()
+    return {"radares": {radar_partition(team) + (team,) for team in teams}}
+
+
+def recompute_derived(changed):
+    """Recalcula solo las tablas derivadas afectadas (en orden de registro, propagando cambios)"""
+    changed = {dataset: set(partitions) for dataset, partitions in changed.items()}
+    recomputed = []
+    for name, derived in DERIVED_TABLES.items():
+        partitions = set().union(*(changed.get(dataset, set()) for dataset in derived["inputs"]))
+        if not partitions:
+            continue
+        derived["build"](partitions)
+        changed.setdefault(name, set()).update(partitions)
+        recomputed.append(name)
+    return recomputed
+
+
+def refresh(jobs=(), radar_csv=None, max_workers=MAX_WORKERS, **fetch_kwargs):
+    """Actualización incremental completa: descargas, CSV local y tablas derivadas"""
+    with _manifest_lock:
+        manifest = load_manifest()
+        changed = refresh_jobs(list(jobs), manifest, max_workers=max_workers, **fetch_kwargs) if jobs else {}
+        if radar_csv:
+            changed.update(refresh_radar_csv(radar_csv, manifest))
+        recomputed = recompute_derived(changed)
+        save_manifest(manifest)
+    if changed:
+        # Instantánea Arrow para que la app arranque mapeándola en vez de releer el origen
+        write_snapshot()
+        # Si la app corre en este proceso, las sesiones ven los datos nuevos sin esperar a la comprobación periódica
+        publish_changed()
+    return changed, recomputed
+
+
+def _numeric(df):
+    """Columnas numéricas de una tabla de FBref (los miles vienen con coma)"""
+    numeric = df.drop(columns=[c for c in FBREF_TEXT_COLUMNS if c in df.columns])
+    return numeric.apply(lambda col: pd.to_numeric(col.astype(str).str.replace(",", ""), errors="coerce"))
+
+
+@register_derived("fbref_team_per90", inputs=["fbref_stats"])
+def build_team_per90(partitions):
+    """Estadísticas acumuladas por equipo divididas entre los partidos jugados (90s del equipo)
+
+    Solo se dividen las columnas de conteo (FBREF_COUNTING_STATS); edad, minutos, porcentajes y las
+    columnas que ya vienen por 90 no tienen sentido sumadas. utils.team_stats toma de esta tabla las
+    métricas de FBREF_TEAM_METRICS para los equipos ingeridos.
+    """
+    df = query("fbref_stats", teams=sorted({team for _, _, team in partitions}))
+    if "Jugador" in df.columns:
+        # Las filas de totales del pie de tabla duplicarían al equipo entero
+        df = df[df["Jugador"].notna() & ~df["Jugador"].isin(FBREF_TOTAL_ROWS)]
+    for (league, season, team), group in df.groupby(["league", "season", "team"]):
+        if (league, season, team) not in partitions:
+            continue
+        numeric = _numeric(group)
+        if "90s" not in numeric.columns:
+            continue
+        # Los 90s del equipo son la suma de los de sus jugadores entre 11
+        team_90s = numeric["90s"].sum() / 11
+        if not team_90s:
+            continue
+        totals = numeric[[c for c in FBREF_COUNTING_STATS if c in numeric.columns]].sum()
+        row = (totals / team_90s).add_suffix("/90").to_frame().T
+        row.insert(0, "Team", team)
+        ingest_dataframe(row, "fbref_team_per90", league, season, team=team)
+
+
+@register_derived("radares_normalizado", inputs=["radares"])
+def build_radar_normalized(partitions):
+    """Percentiles (0-100) de cada métrica por grupo de posición y liga, sobre todos los jugadores"""
+    wide = normalize_radar_table(query("radares"))
+    # Toda la población influye en los percentiles, así que se reescriben todas las particiones
+    for (league, season), group in wide.groupby(["league", "season"]):
+        ingest_dataframe(group.drop(columns=["league", "season", "team"]), "radares_normalizado", league, season, team_column="Equipo")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Actualización incremental de los datos (solo lo que ha cambiado)")
+    parser.add_argument("--config", help='JSON con una lista de {"team", "squad_id", "season"} de FBref')
+    parser.add_argument("--radar-csv", help="CSV de radares a vigilar")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    jobs = []
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            jobs = [job for entry in json.load(f) for job in squad_jobs(entry["team"], entry["squad_id"], entry["season"])]
+
+    start = time.perf_counter()
+    changed, recomputed = refresh(jobs, radar_csv=args.radar_csv, max_workers=args.workers)
+    for dataset, partitions in changed.items():
+        print(f"✅ {dataset}: {len(partitions)} partición(es) actualizada(s)")
+    for name in recomputed:
+        print(f"🔁 {name} recalculada")
+    if not changed:
+        print("Sin cambios")
+    print(f"Hecho en {time.perf_counter() - start:.1f} s")
@@ -0,0 +1,258 @@
+import argparse
+import asyncio
+import itertools
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from utils.shared_tables import export_tables
+
+# Modo multiproceso (python -m utils.serve --workers 4 --port 8501): cada worker es un `streamlit run`
+# en su propio puerto, así una sesión no bloquea a otra; las tablas se publican una vez en
+# SCOUTVISION_SHARED_DIR (utils.shared_tables) y todos los workers las mapean sin copiarlas
+
+# Workers por defecto: uno por núcleo
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Primer puerto interno de los workers (worker i -> WORKER_BASE_PORT + i)
+WORKER_BASE_PORT = 8600
+
+# Cookie con la que el balanceador fija cada navegador a un worker (las sesiones y los archivos
+# de medios de Streamlit viven en la memoria del worker que los creó)
+STICKY_COOKIE = "scoutvision_worker"
+
+# Formas de repartir las conexiones: "sticky" (cookie) o "round-robin" (por conexión)
+BALANCE_MODES = ("sticky", "round-robin")
+
+# Segundos máximos de espera a que un worker responda al health check
+WORKER_START_TIMEOUT = 60
+
+# Segundos entre comprobaciones de los workers (reinicio de los caídos)
+WATCH_INTERVAL = 2.0
+
+# Tamaño máximo de la cabecera HTTP que se inspecciona
+MAX_HEADER_BYTES = 64 * 1024
+
+
+def worker_env(shared_dir=None, extra_env=None):
+    """Entorno de los workers (el mismo para los que se reinician)"""
+    env = dict(os.environ, **(extra_env or {}))
+    if shared_dir:
+        env["SCOUTVISION_SHARED_DIR"] = os.path.abspath(shared_dir)
+    # Mismo secreto en todos: las cookies de XSRF valen en cualquier worker
+    env.setdefault("STREAMLIT_SERVER_COOKIE_SECRET", secrets.token_hex(16))
+    return env
+
+
+def start_worker(port, env, script="Main.py"):
+    """Lanza un worker de Streamlit en el puerto indicado"""
+    cmd = [sys.executable, "-m", "streamlit", "run", script, "--server.port", str(port), "--server.address", "127.0.0.1",
+           "--server.headless", "true", "--browser.gatherUsageStats", "false"]
+    # Los errores de los workers salen por la consola del lanzador
+    return subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL)
+
+
+def start_workers(n, base_port=WORKER_BASE_PORT, shared_dir=None, script="Main.py", extra_env=None):
+    """Lanza n workers de Streamlit; devuelve la lista de (puerto, proceso)"""
+    env = worker_env(shared_dir, extra_env)
+    return [(base_port + i, start_worker(base_port + i, env, script)) for i in range(n)]
+
+
+def _healthy(port):
+    """Indica si el worker responde en /_stcore/health"""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def wait_healthy(workers, timeout=WORKER_START_TIMEOUT):
+    """Espera a que todos los workers respondan en /_stcore/health"""
+    deadline = time.monotonic() + timeout
+    for port, process in workers:
+        while not _healthy(port):
+            if process.poll() is not None:
+                raise RuntimeError(f"El worker del puerto {port} terminó al arrancar (código {process.returncode})")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"El worker del puerto {port} no respondió en {timeout} s")
+            time.sleep(0.2)
+
+
+def stop_workers(workers):
+    for _, process in workers:
+        if process.poll() is None:
+            process.terminate()
+    for _, process in workers:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _worker_from_cookie(head, n_workers):
+    """Worker fijado en la cookie de la petición (None si no hay o no es válido)"""
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() != b"cookie":
+            continue
+        for cookie in value.decode("latin-1").split(";"):
+            key, _, number = cookie.strip().partition("=")
+            if key == STICKY_COOKIE and number.isdigit() and int(number) < n_workers:
+                return int(number)
+    return None
+
+
+async def _pipe(reader, writer):
+    try:
+        while data := await reader.read(65536):
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+def make_balancer(ports, balance="sticky"):
+    """Manejador de conexiones del balanceador: elige worker y copia bytes en ambos sentidos
+
+    handle.down guarda los workers que no aceptan conexiones: no reciben clientes nuevos y los
+    navegadores fijados a ellos pasan a otro worker (con cookie nueva) hasta que watch_workers
+    los vuelve a ver sanos.
+    """
+    if balance not in BALANCE_MODES:
+        raise ValueError(f"Modo de balanceo desconocido: {balance}")
+    turn = itertools.cycle(range(len(ports)))
+    stats = {"connections": [0] * len(ports), "failovers": 0}
+    down = set()
+
+    def siguiente():
+        # Siguiente worker vivo en el turno (si todos están caídos se prueba igualmente)
+        for _ in range(len(ports)):
+            worker = next(turn)
+            if worker not in down:
+                return worker
+        return next(turn)
+
+    async def handle(client_reader, client_writer):
+        try:
+            head = await client_reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            client_writer.close()
+            return
+        worker = _worker_from_cookie(head, len(ports)) if balance == "sticky" else None
+        new_client = worker is None or worker in down
+        if new_client:
+            worker = siguiente()
+
+        for _ in range(len(ports)):
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", ports[worker], limit=MAX_HEADER_BYTES)
+                break
+            except OSError:
+                # Worker caído: se aparta del reparto y el cliente se fija a otro
+                down.add(worker)
+                stats["failovers"] += 1
+                worker, new_client = siguiente(), True
+        else:
+            client_writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            client_writer.close()
+            return
+        stats["connections"][worker] += 1
+        upstream_writer.write(head)
+
+        if balance == "sticky" and new_client:
+            # Se añade la cookie a la primera respuesta (también al 101 del WebSocket)
+            try:
+                response_head = await upstream_reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                client_writer.close()
+                upstream_writer.close()
+                return
+            status, _, rest = response_head.partition(b"\r\n")
+            cookie = f"Set-Cookie: {STICKY_COOKIE}={worker}; Path=/; SameSite=Lax\r\n".encode()
+            client_writer.write(status + b"\r\n" + cookie + rest)
+
+        await asyncio.gather(_pipe(client_reader, upstream_writer), _pipe(upstream_reader, client_writer))
+
+    handle.stats = stats
+    handle.down = down
+    return handle
+
+
+async def watch_workers(workers, handle, respawn, interval=WATCH_INTERVAL):
+    """Vigila los workers: reinicia los que terminan y devuelve al reparto los que vuelven a responder
+
+    workers es la lista de (puerto, proceso) y se actualiza en su sitio; respawn(puerto) lanza uno nuevo.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        for i, (port, process) in enumerate(workers):
+            if process.poll() is not None:
+                print(f"⚠️ El worker del puerto {port} terminó (código {process.returncode}); se reinicia")
+                handle.down.add(i)
+                workers[i] = (port, respawn(port))
+            elif i in handle.down and await asyncio.to_thread(_healthy, port):
+                print(f"✅ Worker del puerto {port} de nuevo en servicio")
+                handle.down.discard(i)
+
+
+async def serve_balancer(port, ports, balance="sticky", host="127.0.0.1", workers=None, respawn=None):
+    """Arranca el balanceador y atiende hasta que se cancele (con workers y respawn, también los vigila)"""
+    handle = make_balancer(ports, balance)
+    server = await asyncio.start_server(handle, host, port, limit=MAX_HEADER_BYTES)
+    watcher = asyncio.create_task(watch_workers(workers, handle, respawn)) if workers is not None else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ScoutVision con varios workers de Streamlit detrás de un balanceador local")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--port", type=int, default=8501, help="Puerto público del balanceador")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--worker-port", type=int, default=WORKER_BASE_PORT, help="Primer puerto interno de los workers")
+    parser.add_argument("--balance", choices=BALANCE_MODES, default="sticky")
+    parser.add_argument("--shared-dir", default=os.path.join("data", "shared"), help="Carpeta de las tablas compartidas")
+    args = parser.parse_args()
+
+    os.makedirs(args.shared_dir, exist_ok=True)
+    start = time.perf_counter()
+    version = export_tables(args.shared_dir)
+    print(f"✅ Tablas compartidas {version} ({time.perf_counter() - start:.2f} s)")
+
+    env = worker_env(args.shared_dir)
+    workers = [(args.worker_port + i, start_worker(args.worker_port + i, env)) for i in range(args.workers)]
+    try:
+        wait_healthy(workers)
+        print(f"✅ {len(workers)} workers listos; balanceador ({args.balance}) en http://{args.host}:{args.port}")
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(serve_balancer(args.port, [port for port, _ in workers], args.balance, args.host,
+                                               workers=workers, respawn=lambda port: start_worker(port, env)))
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, task.cancel)
+            except (NotImplementedError, RuntimeError):
+                pass
+        try:
+            loop.run_until_complete(task)
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            pass
+        finally:
+            loop.close()
+    finally:
+        stop_workers(workers)
+        print("Workers detenidos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import shutil
+import time
+
+from utils.arrow_snapshot import FILES, read_player_store, read_team_stats, write_snapshot
+
+# Carpeta de las tablas compartidas entre workers (solo en el modo multiproceso, ver utils.serve)
+SHARED_DIR = os.environ.get("SCOUTVISION_SHARED_DIR")
+
+# Archivo con el nombre de la versión publicada (se sustituye con os.replace, atómico)
+CURRENT_FILE = "current"
+
+# Versiones que se conservan en disco (un worker puede seguir leyendo la anterior unos segundos)
+KEEP_VERSIONS = 2
+
+
+def shared_version(directory=None):
+    """Versión publicada en la carpeta compartida (None si no hay modo multiproceso o nada publicado)"""
+    directory = directory or SHARED_DIR
+    if not directory:
+        return None
+    try:
+        with open(os.path.join(directory, CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def export_tables(directory):
+    """Construye las tablas una vez y las publica como instantánea Arrow en una versión nueva; devuelve la versión"""
+    version = time.strftime("%Y%m%d-%H%M%S") + f"-{time.time_ns() % 10**9:09d}"
+    folder = os.path.join(directory, version)
+    os.makedirs(folder)
+    write_snapshot(folder)
+
+    # Publicación atómica: los workers ven la versión anterior o la nueva, nunca una a medias
+    pointer = os.path.join(directory, CURRENT_FILE)
+    with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(pointer + ".tmp", pointer)
+    _limpiar_versiones(directory)
+    return version
+
+
+def _limpiar_versiones(directory):
+    versions = sorted(name for name in os.listdir(directory) if os.path.isfile(os.path.join(directory, name, FILES["team_stats"])))
+    for name in versions[:-KEEP_VERSIONS]:
+        # En Linux los workers que aún tengan mapeados sus archivos siguen leyéndolos
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def _folder(version, directory=None):
+    return os.path.join(directory or SHARED_DIR, version)
+
+
+def load_team_stats(version, directory=None):
+    """Tablas de equipos de una versión publicada: liga -> DataFrame sobre el archivo mapeado (sin copia)"""
+    # La versión es inmutable: no se compara con el origen, solo formato y checksum
+    tables = read_team_stats(_folder(version, directory), check_source=False)
+    if tables is None:
+        raise RuntimeError(f"Versión compartida {version} no válida")
+    return tables
+
+
+def load_player_store(version, directory=None):
+    """Almacén de jugadores de una versión publicada con la matriz mapeada (mismo formato que player_store)"""
+    store = read_player_store(_folder(version, directory), check_source=False, signature=("shared", version))
+    if store is None:
+        raise RuntimeError(f"Versión compartida {version} no válida")
+    return store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publica las tablas compartidas del modo multiproceso")
+    parser.add_argument("--dir", default=SHARED_DIR or os.path.join("data", "shared"))
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    start = time.perf_counter()
+    print(f"✅ versión {export_tables(args.dir)} publicada en {args.dir} ({time.perf_counter() - start:.2f} s)")
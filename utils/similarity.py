@@ -0,0 +1,136 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.normalization import position_group
+from utils.player_store import get_player_row, get_player_store
+
+# Hasta este número de jugadores se comparan todos contra todos; por encima, KD-tree
+BRUTE_FORCE_MAX_PLAYERS = 5000
+
+# El KD-tree solo compensa con pocas dimensiones; con más métricas el producto matricial es más rápido
+TREE_MAX_DIMENSIONS = 20
+
+# Distancias disponibles
+SIMILARITY_METRICS = ("cosine", "euclidean")
+
+# Índice por versión del almacén de jugadores: se reconstruye solo si cambian los datos
+_index = None
+_index_lock = threading.Lock()
+
+
+def _build_index(store):
+    """Matriz de rasgos centrada (percentil 50 = 0, sin dato = 0) y su versión con norma 1"""
+    features = np.nan_to_num((store["matrix"] - 50.0) / 50.0, nan=0.0).astype(np.float32)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    unit = np.divide(features, norms, out=np.zeros_like(features), where=norms > 0)
+    groups, _ = pd.factorize(position_group(store["players"]['Posicion']))
+    return {
+        "signature": store["signature"],
+        "features": features,
+        "sq_norms": np.einsum("ij,ij->i", features, features),
+        "unit": unit,
+        "groups": groups,
+        "trees": {},
+    }
+
+
+def get_similarity_index(store=None):
+    """Devuelve el índice de similitud del almacén actual (cacheado por proceso)"""
+    global _index
+    store = store or get_player_store()
+    index = _index
+    if index is not None and index["signature"] == store["signature"]:
+        return index
+    with _index_lock:
+        if _index is None or _index["signature"] != store["signature"]:
+            _index = _build_index(store)
+        return _index
+
+
+def _tree(index, metric):
+    """KD-tree sobre los rasgos (sobre los vectores unitarios para coseno), construido una vez"""
+    if metric not in index["trees"]:
+        from scipy.spatial import cKDTree
+        index["trees"][metric] = cKDTree(index["unit"] if metric == "cosine" else index["features"])
+    return index["trees"][metric]
+
+
+def _brute_force(index, query, candidates, metric):
+    """Similitud (coseno) o distancia (euclídea) del jugador a todos los candidatos en un paso"""
+    # Producto con la matriz completa (sin copiar la submatriz de candidatos) y luego se indexa
+    if metric == "cosine":
+        return (index["unit"] @ index["unit"][query])[candidates]
+    # |a - b|^2 = |a|^2 + |b|^2 - 2 a·b, con las normas ya precalculadas
+    sq = index["sq_norms"] + index["sq_norms"][query] - 2 * (index["features"] @ index["features"][query])
+    return np.sqrt(np.maximum(sq[candidates], 0))
+
+
+def _tree_search(index, query, mask, k, metric):
+    """Vecinos con el KD-tree, ampliando la búsqueda hasta tener k que pasen el filtro"""
+    tree = _tree(index, metric)
+    vector = index["unit" if metric == "cosine" else "features"][query]
+    n = len(mask)
+    want = k + 1
+    while True:
+        distances, rows = tree.query(vector, k=min(want, n))
+        distances, rows = np.atleast_1d(distances), np.atleast_1d(rows)
+        keep = mask[rows]
+        if keep.sum() >= k or want >= n:
+            rows, distances = rows[keep][:k], distances[keep][:k]
+            break
+        want *= 4
+    # En vectores unitarios: |a - b|^2 = 2 - 2 cos(a, b)
+    scores = 1 - distances ** 2 / 2 if metric == "cosine" else distances
+    return rows, scores
+
+
+def find_similar(player, team, k=10, metric="cosine", same_position=False, positions=None, store=None):
+    """Los k jugadores más parecidos a (player, team) en el espacio de métricas del radar
+
+    Se puede filtrar por el mismo grupo de posición o por una lista de posiciones.
+    Devuelve un DataFrame con Jugador, Equipo, Posicion y Similitud (coseno) o Distancia (euclídea).
+    """
+    if metric not in SIMILARITY_METRICS:
+        raise ValueError(f"Métrica de similitud desconocida: {metric}")
+    if k < 1:
+        raise ValueError(f"k debe ser al menos 1 (se pidió {k})")
+    store = store or get_player_store()
+    query = get_player_row(player, team, store)
+    if query is None:
+        return None
+
+    index = get_similarity_index(store)
+    players = store["players"]
+    mask = np.ones(len(players), dtype=bool)
+    if same_position:
+        mask &= index["groups"] == index["groups"][query]
+    if positions:
+        mask &= players['Posicion'].isin(positions).to_numpy()
+    # Fuera el propio jugador, también sus filas repetidas con el mismo (jugador, equipo)
+    mask &= ~(players['Jugador'].eq(player.strip()) & players['Equipo'].eq(team.strip())).to_numpy()
+    candidates = np.flatnonzero(mask)
+
+    use_tree = len(players) > BRUTE_FORCE_MAX_PLAYERS and index["features"].shape[1] <= TREE_MAX_DIMENSIONS
+    if not use_tree or len(candidates) <= k:
+        scores = _brute_force(index, query, candidates, metric)
+        k = min(k, len(candidates))
+        # Selección parcial de los k mejores y orden solo de esos
+        order = -scores if metric == "cosine" else scores
+        top = np.argpartition(order, k - 1)[:k] if 0 < k < len(candidates) else np.arange(len(candidates))
+        top = top[np.argsort(order[top], kind="stable")]
+        rows, scores = candidates[top], scores[top]
+    else:
+        rows, scores = _tree_search(index, query, mask, k, metric)
+
+    result = players.iloc[rows][['Jugador', 'Equipo', 'Posicion']].reset_index(drop=True)
+    result["Similitud" if metric == "cosine" else "Distancia"] = np.round(scores.astype(float), 3)
+    return result
+
+
+def invalidate_similarity_index():
+    """Fuerza la reconstrucción del índice en el siguiente acceso"""
+    global _index
+    with _index_lock:
+        _index = None
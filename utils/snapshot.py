@@ -0,0 +1,179 @@
+import threading
+import time
+
+# Segundos entre comprobaciones de si los datos de origen han cambiado
+CHECK_INTERVAL = 2.0
+
+# Tablas registradas: nombre -> {"build": función() -> tabla, "signature": función() -> firma del origen}
+TABLES = {}
+
+# Instantánea publicada: se sustituye entera (una asignación, atómica) y nunca se modifica.
+# Los lectores no usan lock: se quedan con la referencia que leyeron aunque se publique otra.
+_snapshot = None
+_checked_at = 0.0
+# Una sola construcción a la vez (solo se espera en la primera carga o al añadir una tabla)
+_build_lock = threading.Lock()
+_check_lock = threading.Lock()
+_rebuild_thread = None
+
+# Instantánea fijada por el hilo que ejecuta un rerun (todo el rerun ve la misma versión)
+_local = threading.local()
+
+
+def register_table(name, signature=None):
+    """Decorador: registra la función que construye una tabla de la instantánea
+
+    signature() identifica la versión de los datos de origen; si cambia, la tabla se reconstruye.
+    """
+    def decorator(build):
+        TABLES[name] = {"build": build, "signature": signature or (lambda: None)}
+        return build
+    return decorator
+
+
+def _firma(spec):
+    """Firma del origen de una tabla; si no se puede leer (p. ej. falta el archivo), una firma de error estable"""
+    try:
+        return spec["signature"]()
+    except Exception as e:
+        return ("unavailable", type(e).__name__, str(e))
+
+
+def _completa(snapshot):
+    """Indica si la instantánea tiene todas las tablas registradas (construidas o marcadas como no disponibles)"""
+    return all(name in snapshot["tables"] or name in snapshot["errors"] for name in TABLES)
+
+
+def _build_snapshot(previous, names):
+    """Nueva instantánea: construye las tablas indicadas y las que faltan; el resto se reutiliza tal cual
+
+    Si una tabla no se puede construir queda como no disponible (get_table lanza su error) y el resto
+    se sigue sirviendo: p. ej. sin CSV de radares las páginas de equipos funcionan igual.
+    """
+    version = previous["version"] + 1 if previous else 1
+    snapshot = {"version": version, "created_at": time.time(), "tables": {}, "versions": {}, "signatures": {}, "errors": {}}
+    for name, spec in list(TABLES.items()):
+        if previous is not None and name not in names and (name in previous["tables"] or name in previous["errors"]):
+            for key in ("tables", "versions", "signatures", "errors"):
+                if name in previous[key]:
+                    snapshot[key][name] = previous[key][name]
+            continue
+        # La firma se lee antes de construir: si el origen cambia mientras tanto, se detecta en la siguiente comprobación
+        snapshot["signatures"][name] = _firma(spec)
+        snapshot["versions"][name] = version
+        try:
+            snapshot["tables"][name] = spec["build"]()
+        except Exception as e:
+            print(f"⚠️ Tabla {name} no disponible: {e}")
+            snapshot["errors"][name] = e
+    return snapshot
+
+
+def publish(names=None):
+    """Reconstruye las tablas indicadas (todas si None) y publica la nueva instantánea"""
+    global _snapshot
+    with _build_lock:
+        _snapshot = _build_snapshot(_snapshot, set(TABLES if names is None else names))
+        return _snapshot
+
+
+def _publish_in_background(names):
+    try:
+        publish(names)
+    except Exception as e:
+        # Se sigue sirviendo la instantánea anterior
+        print(f"⚠️ No se pudo publicar la instantánea ({', '.join(names)}): {e}")
+
+
+def _tablas_cambiadas(snapshot):
+    """Tablas cuyo origen ya no coincide con la firma con la que se construyeron"""
+    return [name for name, spec in list(TABLES.items()) if _firma(spec) != snapshot["signatures"].get(name)]
+
+
+def publish_changed():
+    """Tras una ingesta en este proceso: publica ya las tablas cuyo origen cambió (None si no hay instantánea)"""
+    snapshot = _snapshot
+    if snapshot is None:
+        return None
+    changed = _tablas_cambiadas(snapshot)
+    return publish(changed) if changed else snapshot
+
+
+def _comprobar_origen(snapshot):
+    """Si el origen de alguna tabla cambió, la reconstruye en segundo plano (los lectores no esperan)"""
+    global _checked_at, _rebuild_thread
+    if not _check_lock.acquire(blocking=False):
+        return
+    try:
+        _checked_at = time.monotonic()
+        if _rebuild_thread is not None and _rebuild_thread.is_alive():
+            return
+        changed = _tablas_cambiadas(snapshot)
+        if changed:
+            _rebuild_thread = threading.Thread(target=_publish_in_background, args=(changed,), name="snapshot-rebuild", daemon=True)
+            _rebuild_thread.start()
+    finally:
+        _check_lock.release()
+
+
+def get_snapshot():
+    """Instantánea actual, compartida de solo lectura por todas las sesiones del proceso"""
+    global _snapshot
+    pinned = getattr(_local, "snapshot", None)
+    if pinned is not None and _completa(pinned):
+        return pinned
+
+    snapshot = _snapshot
+    if snapshot is None or not _completa(snapshot):
+        with _build_lock:
+            if _snapshot is None or not _completa(_snapshot):
+                _snapshot = _build_snapshot(_snapshot, set())
+            snapshot = _snapshot
+    elif time.monotonic() - _checked_at >= CHECK_INTERVAL:
+        _comprobar_origen(snapshot)
+
+    if pinned is not None:
+        _local.snapshot = snapshot
+    return snapshot
+
+
+def get_table(name):
+    """Tabla de la instantánea actual (no modificar: la comparten todas las sesiones)
+
+    Si la tabla no está disponible se lanza el error con el que falló su construcción.
+    """
+    snapshot = get_snapshot()
+    error = snapshot["errors"].get(name)
+    if error is not None:
+        raise error.with_traceback(None)
+    return snapshot["tables"][name]
+
+
+def table_version(name):
+    """Versión de la instantánea en la que se construyó la tabla (cambia solo si cambian sus datos)"""
+    return get_snapshot()["versions"][name]
+
+
+def pin_snapshot():
+    """Fija la instantánea actual para el hilo del rerun: aunque se publique otra, el rerun no mezcla versiones"""
+    _local.snapshot = None
+    _local.snapshot = get_snapshot()
+    return _local.snapshot
+
+
+def release_snapshot():
+    """Suelta la instantánea fijada (la versión antigua se libera cuando nadie la usa)"""
+    _local.snapshot = None
+
+
+def snapshot_info():
+    """Versión, antigüedad y versión de cada tabla de la instantánea publicada"""
+    snapshot = _snapshot
+    if snapshot is None:
+        return None
+    return {
+        "version": snapshot["version"],
+        "age_s": round(time.time() - snapshot["created_at"], 1),
+        "tables": dict(snapshot["versions"]),
+        "unavailable": sorted(snapshot["errors"]),
+    }
@@ -0,0 +1,214 @@
+import argparse
+import hashlib
+import io
+import time
+
+import pyarrow as pa
+import pyarrow.ipc
+from lxml import etree
+
+# Filas por RecordBatch
+BATCH_SIZE = 1024
+
+# Columnas de texto de las tablas de FBref (el resto se convierte a número; lo que no se puede, nulo)
+TEXT_COLUMNS = {
+    "Jugador", "Player", "Nation", "Pos", "Squad", "Comp", "Matches", "Age", "Team", "Opponent",
+    "Date", "Day", "Venue", "Result", "Round", "Captain", "Formation", "Referee", "Match Report", "Notes",
+}
+
+# Filas de tbody que repiten la cabecera o separan bloques
+SKIP_ROW_CLASSES = {"thead", "over_header", "spacer", "partial_table"}
+
+
+def _texto(cell):
+    return "".join(cell.itertext()).strip()
+
+
+def _coincide(elem, table_id, table_class):
+    if table_id is not None:
+        value = elem.get("id") or ""
+        return value == table_id or value.startswith(table_id)
+    return table_class in (elem.get("class") or "").split()
+
+
+def _column_names(header_rows):
+    """Nombres de columna a partir de las filas de cabecera (la última tiene los nombres, las de arriba los grupos)
+
+    Mismo criterio que la limpieza del notebook: nombre de la última fila, 'Player' -> 'Jugador' y, si un
+    nombre se repite, se le añade su grupo entre paréntesis.
+    """
+    names = [_texto(cell) for cell in header_rows[-1]]
+    groups = [""] * len(names)
+    if len(header_rows) > 1:
+        expanded = []
+        for cell in header_rows[-2]:
+            expanded.extend([_texto(cell)] * int(cell.get("colspan", 1) or 1))
+        groups = (expanded + [""] * len(names))[:len(names)]
+
+    columns, seen = [], set()
+    for name, group in zip(names, groups):
+        name = "Jugador" if name == "Player" else name
+        column = f"{name} ({group})" if name in seen else name
+        seen.add(name)
+        columns.append(column)
+    return columns
+
+
+def _numero(value):
+    if not value:
+        return None
+    try:
+        return float(value.replace(",", "").rstrip("%"))
+    except ValueError:
+        return None
+
+
+def _schema(columns, text_columns):
+    return pa.schema([(c, pa.string() if c in text_columns else pa.float64()) for c in columns])
+
+
+def _batch(rows, schema):
+    """Convierte filas de texto en un RecordBatch tipado por columnas"""
+    arrays = []
+    for j, field in enumerate(schema):
+        values = [row[j] for row in rows]
+        if pa.types.is_string(field.type):
+            arrays.append(pa.array([v if v else None for v in values], pa.string()))
+        else:
+            arrays.append(pa.array([_numero(v) for v in values], pa.float64()))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _liberar(elem):
+    """Libera un elemento ya procesado y sus hermanos anteriores para no acumular el DOM"""
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def _stream(source, table_id, table_class, batch_size, text_columns, encoding=None):
+    """Recorre el HTML de forma incremental; genera RecordBatch de la primera tabla que coincide"""
+    header_rows, rows, schema = [], [], None
+    in_table = in_thead = in_tfoot = False
+    needle = table_id if table_id is not None else table_class
+
+    # Solo llegan a Python los eventos de tablas y filas (y comentarios): el resto lo recorre lxml en C
+    events = etree.iterparse(source, events=("start", "end", "comment"), tag=("table", "thead", "tfoot", "tr"),
+                             html=True, recover=True, huge_tree=True, encoding=encoding)
+    for event, elem in events:
+        if event == "comment":
+            # FBref deja muchas tablas dentro de comentarios HTML: se analiza solo ese comentario
+            if not in_table and elem.text and needle in elem.text:
+                found = False
+                # El comentario ya es texto: se vuelve a analizar como UTF-8 (sin <meta charset> lxml supondría latin-1)
+                for batch in _stream(io.BytesIO(elem.text.encode("utf-8")), table_id, table_class, batch_size, text_columns, "utf-8"):
+                    found = True
+                    yield batch
+                if found:
+                    return
+            continue
+
+        if event == "start":
+            if not in_table and elem.tag == "table" and _coincide(elem, table_id, table_class):
+                in_table = True
+            elif in_table and elem.tag == "thead":
+                in_thead = True
+            elif in_table and elem.tag == "tfoot":
+                in_tfoot = True
+            continue
+
+        if not in_table:
+            # Filas y tablas de otras tablas: se descartan en cuanto terminan
+            _liberar(elem)
+            continue
+
+        if elem.tag == "thead":
+            in_thead = False
+        elif elem.tag == "tfoot":
+            in_tfoot = False
+        elif elem.tag == "tr" and in_tfoot:
+            # Totales del pie ('Squad Total', 'Opponent Total'): no son filas de jugadores
+            _liberar(elem)
+        elif elem.tag == "tr":
+            cells = [cell for cell in elem if cell.tag in ("th", "td")]
+            is_header = in_thead or (schema is None and cells and all(cell.tag == "th" for cell in cells))
+            if is_header:
+                # Se guarda una copia ligera de la cabecera (la fila original se libera)
+                header_rows.append([etree.fromstring(etree.tostring(cell)) for cell in cells])
+            elif cells and not (set((elem.get("class") or "").split()) & SKIP_ROW_CLASSES):
+                if schema is None:
+                    columns = _column_names(header_rows) if header_rows else [f"col_{j}" for j in range(len(cells))]
+                    schema = _schema(columns, text_columns)
+                values = [_texto(cell) for cell in cells]
+                # Filas repetidas de cabecera dentro del cuerpo
+                if values[:1] != [schema.names[0]] and values[:1] != ["Player"]:
+                    rows.append((values + [""] * len(schema))[:len(schema)])
+                if len(rows) >= batch_size:
+                    yield _batch(rows, schema)
+                    rows = []
+            _liberar(elem)
+        elif elem.tag == "table":
+            if rows:
+                yield _batch(rows, schema)
+            return
+
+
+def stream_table(source, table_id=None, table_class=None, batch_size=BATCH_SIZE, text_columns=None):
+    """Genera pyarrow.RecordBatch con las filas de una tabla, sin construir el DOM completo
+
+    source puede ser HTML en bytes/str, una ruta o un objeto tipo archivo. La tabla se busca por id
+    (o prefijo del id, como en FBref) o por clase, también dentro de comentarios HTML.
+    """
+    if (table_id is None) == (table_class is None):
+        raise ValueError("Indica table_id o table_class")
+    encoding = None
+    if isinstance(source, str) and source.lstrip().startswith("<"):
+        # Texto ya decodificado: se pasa a UTF-8 y se indica (lxml no vería ningún <meta charset>)
+        source, encoding = source.encode("utf-8"), "utf-8"
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    yield from _stream(source, table_id, table_class, batch_size, set(text_columns or TEXT_COLUMNS), encoding)
+
+
+def read_table(source, table_id=None, table_class=None, **kwargs):
+    """Tabla completa como pyarrow.Table (ValueError si no se encuentra)"""
+    batches = list(stream_table(source, table_id=table_id, table_class=table_class, **kwargs))
+    if not batches:
+        raise ValueError(f"No se encontró la tabla '{table_id or table_class}'")
+    return pa.Table.from_batches(batches)
+
+
+def to_dataframe(table):
+    """DataFrame con los mismos tipos que daría pd.read_html: columnas enteras sin nulos como int64"""
+    df = table.to_pandas()
+    for col in df.columns:
+        values = df[col]
+        if values.dtype == "float64" and len(values) and values.notna().all() and (values % 1 == 0).all():
+            df[col] = values.astype("int64")
+    return df
+
+
+def table_digest(table):
+    """sha256 del contenido de la tabla serializada como Arrow IPC (no depende del HTML que la rodea)"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return hashlib.sha256(sink.getvalue()).hexdigest()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extrae una tabla de un HTML grande sin cargar todo el DOM")
+    parser.add_argument("path")
+    parser.add_argument("--id", dest="table_id")
+    parser.add_argument("--class", dest="table_class")
+    parser.add_argument("--parquet", help="Escribir la tabla en este archivo Parquet")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = read_table(args.path, table_id=args.table_id, table_class=args.table_class)
+    print(f"{table.num_rows} filas x {table.num_columns} columnas en {time.perf_counter() - start:.2f} s")
+    if args.parquet:
+        import pyarrow.parquet as pq
+        pq.write_table(table, args.parquet)
@@ -0,0 +1,144 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from utils.arrow_snapshot import read_team_stats
+from utils.data_store import dataset_signature, has_dataset, latest_season, query
+from utils.profiler import profiled
+from utils.shared_tables import load_team_stats as load_shared_team_stats, shared_version
+from utils.snapshot import get_table, publish, register_table, table_version
+from utils.teams import LEAGUE_FOLDERS, canonical_team_name
+
+# Liga por defecto cuando se pide una liga desconocida
+DEFAULT_LEAGUE = "La Liga Española"
+
+# Nombres alternativos de las ligas que se usan en la interfaz
+LEAGUE_ALIASES = {
+    "La Liga": "La Liga Española",
+}
+
+# Semilla fija por liga para datos consistentes (distinta para variabilidad entre ligas)
+LEAGUE_SEEDS = {
+    "La Liga Española": 42,
+    "Premier League": 43,
+    "Serie A": 44,
+    "Bundesliga": 45,
+    "Ligue 1": 46,
+}
+
+# Métricas por 90 minutos y su rango (mín, máx)
+TEAM_METRIC_RANGES = [
+    ('PPDA/90', 5, 14),
+    ('CtrShots/90', 0.2, 3.0),
+    ('CP_succes/90', 0.2, 0.8),
+    ('ShotsOT/90', 1.5, 6.0),
+    ('DeepPass/90', 6, 22),
+    ('PSxGA/90', 0.6, 2.5),
+    ('ProgPass/90', 15, 45),
+    ('xG/90', 0.6, 2.2),
+]
+TEAM_METRICS = [metric for metric, _, _ in TEAM_METRIC_RANGES]
+
+# Métricas que se pueden calcular con las tablas de jugadores de FBref: métrica -> columna de
+# fbref_team_per90 (utils.refresh). El resto (PPDA, contraataques, pérdidas, tiros y PSxG
+# recibidos) necesita datos del rival o de eventos que esas tablas no tienen.
+FBREF_TEAM_METRICS = {
+    'xG/90': 'xG/90',
+    'ProgPass/90': 'PrgP/90',
+}
+
+def resolve_league(liga):
+    """Devuelve el nombre canónico de una liga (la liga por defecto si no se conoce)"""
+    liga = LEAGUE_ALIASES.get(liga, liga)
+    return liga if liga in LEAGUE_SEEDS else DEFAULT_LEAGUE
+
+
+def _build_team_stats(league):
+    """Genera la tabla de estadísticas de una liga en un único paso vectorizado"""
+    # Si hay estadísticas reales ingeridas en Parquet, se leen solo la liga, su última temporada y las columnas usadas
+    if has_dataset("team_stats"):
+        season = latest_season("team_stats", league)
+        if season is not None:
+            df = query("team_stats", columns=['Team'] + TEAM_METRICS, leagues=[league], seasons=[season])
+            return _float32(_con_fbref(df.reset_index(drop=True), league))
+
+    teams = [name for name, _ in LEAGUE_FOLDERS[league][0]]
+    lows = np.array([low for _, low, _ in TEAM_METRIC_RANGES])
+    highs = np.array([high for _, _, high in TEAM_METRIC_RANGES])
+
+    # Mismo orden de muestreo (fila a fila) que np.random.uniform celda a celda
+    rng = np.random.RandomState(LEAGUE_SEEDS[league])
+    values = lows + (highs - lows) * rng.random_sample((len(teams), len(TEAM_METRIC_RANGES)))
+
+    df = pd.DataFrame(values, columns=TEAM_METRICS)
+    df.insert(0, 'Team', teams)
+    return _float32(_con_fbref(df, league))
+
+
+def _float32(df):
+    """Métricas en float32, el mismo tipo que guarda la instantánea Arrow (los dos caminos dan lo mismo)"""
+    return df.astype({metric: np.float32 for metric in TEAM_METRICS if metric in df.columns})
+
+
+def _con_fbref(df, league):
+    """Sustituye las métricas que se calculan desde FBref (fbref_team_per90) en los equipos ingeridos"""
+    if not has_dataset("fbref_team_per90"):
+        return df
+    season = latest_season("fbref_team_per90", league)
+    if season is None:
+        return df
+    fbref = query("fbref_team_per90", columns=["team"] + list(FBREF_TEAM_METRICS.values()), leagues=[league], seasons=[season])
+    fbref = fbref.drop_duplicates("team").set_index("team")
+    teams = df["Team"].map(lambda team: canonical_team_name(team) or team)
+    for metric, column in FBREF_TEAM_METRICS.items():
+        if column in fbref.columns:
+            # Los equipos sin datos de FBref conservan el valor de la fuente principal
+            df[metric] = teams.map(fbref[column]).astype(float).fillna(df[metric])
+    return df
+
+
+def _synthetic_signature():
+    """Hash de lo que define las tablas sintéticas: rangos de las métricas, semillas y equipos de cada liga"""
+    spec = {
+        "ranges": TEAM_METRIC_RANGES,
+        "seeds": LEAGUE_SEEDS,
+        "teams": {league: [name for name, _ in LEAGUE_FOLDERS[league][0]] for league in LEAGUE_SEEDS},
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def source_signature():
+    """Versión del origen de las tablas de equipos: datasets ingeridos (None si no hay) y constantes sintéticas"""
+    return (dataset_signature("team_stats"), dataset_signature("fbref_team_per90"), _synthetic_signature())
+
+
+@register_table("team_stats", signature=lambda: shared_version() or source_signature())
+def _build_all_team_stats():
+    """Tablas de todas las ligas para la instantánea compartida: liga -> DataFrame"""
+    # En modo multiproceso se mapean las tablas que publicó el lanzador (ver utils.serve)
+    version = shared_version()
+    if version is not None:
+        return load_shared_team_stats(version)
+    # Instantánea Arrow de la ingesta: se mapea sin copia si está al día con el origen
+    tables = read_team_stats()
+    if tables is not None:
+        return tables
+    return {league: _build_team_stats(league) for league in LEAGUE_SEEDS}
+
+
+@profiled()
+def load_team_stats(league, per90=True):
+    """Carga las estadísticas por equipo de una liga (de la instantánea compartida, no modificar)"""
+    return get_table("team_stats")[resolve_league(league)]
+
+
+def invalidate_team_stats():
+    """Reconstruye las tablas de todas las ligas y publica una instantánea nueva"""
+    publish(["team_stats"])
+
+
+def team_stats_version():
+    """Versión actual de los datos de equipos (cambia solo cuando se publican datos de equipos nuevos)"""
+    return table_version("team_stats")
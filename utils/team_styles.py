@@ -0,0 +1,102 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.league_bundle import RANKING_METRICS
+from utils.team_stats import LEAGUE_SEEDS, TEAM_METRICS, load_team_stats, team_stats_version
+
+# Número de estilos de juego (clusters) en los que se agrupan los equipos de las cinco ligas
+N_STYLES = 6
+
+# Método de enlace del clustering jerárquico
+LINKAGE_METHOD = "ward"
+
+# Nombre mostrado de cada métrica
+METRIC_LABELS = dict(RANKING_METRICS)
+
+# Estilos ya calculados (se recalculan si cambia la versión de los datos de equipos)
+_styles = None
+_styles_lock = threading.Lock()
+
+
+def _describir_estilo(centroid):
+    """Nombre de un estilo a partir de las dos métricas que más se alejan de la media"""
+    parts = []
+    for j in np.argsort(-np.abs(centroid))[:2]:
+        level = "Alto" if centroid[j] > 0 else "Bajo"
+        parts.append(f"{level} {METRIC_LABELS.get(TEAM_METRICS[j], TEAM_METRICS[j])}")
+    return " · ".join(parts)
+
+
+def _build_styles(version):
+    """Matriz estandarizada de las cinco ligas, distancias por pares y clusters de estilo"""
+    from scipy.cluster.hierarchy import fcluster, linkage
+    from scipy.spatial.distance import pdist, squareform
+
+    df = pd.concat(
+        [load_team_stats(league)[['Team'] + TEAM_METRICS].assign(League=league) for league in LEAGUE_SEEDS],
+        ignore_index=True,
+    )
+    values = df[TEAM_METRICS].to_numpy(dtype=float)
+    std = values.std(axis=0)
+    z = (values - values.mean(axis=0)) / np.where(std > 0, std, 1)
+
+    condensed = pdist(z)
+    distances = squareform(condensed)
+    # Vecinos de cada equipo ordenados por distancia (el primero es el propio equipo)
+    neighbors = np.argsort(distances, axis=1, kind="stable")
+
+    clusters = fcluster(linkage(condensed, method=LINKAGE_METHOD), t=N_STYLES, criterion="maxclust") - 1
+    labels = {c: _describir_estilo(z[clusters == c].mean(axis=0)) for c in np.unique(clusters)}
+
+    index = {}
+    for row, team in enumerate(df['Team']):
+        index.setdefault(team, row)
+
+    return {
+        "version": version,
+        "df": df,
+        "z": z,
+        "distances": distances,
+        "neighbors": neighbors,
+        "clusters": clusters,
+        "labels": labels,
+        "index": index,
+    }
+
+
+def get_team_styles():
+    """Devuelve los estilos de juego precalculados (compartidos por todas las sesiones, no modificar)"""
+    global _styles
+    version = team_stats_version()
+    styles = _styles
+    if styles is not None and styles["version"] == version:
+        return styles
+    with _styles_lock:
+        if _styles is None or _styles["version"] != version:
+            _styles = _build_styles(version)
+        return _styles
+
+
+def closest_teams(team, n=5, styles=None):
+    """Los n equipos de cualquier liga con el estilo más parecido (None si el equipo no existe)"""
+    styles = styles or get_team_styles()
+    row = styles["index"].get(team)
+    if row is None:
+        return None
+    rows = [r for r in styles["neighbors"][row] if r != row][:n]
+    result = styles["df"].loc[rows, ['Team', 'League']].reset_index(drop=True)
+    result['Distancia'] = styles["distances"][row, rows]
+    return result
+
+
+def team_cluster(team, styles=None):
+    """Estilo de juego de un equipo: {"cluster", "label", "members"} (None si el equipo no existe)"""
+    styles = styles or get_team_styles()
+    row = styles["index"].get(team)
+    if row is None:
+        return None
+    cluster = styles["clusters"][row]
+    members = styles["df"].loc[styles["clusters"] == cluster, ['Team', 'League']].reset_index(drop=True)
+    return {"cluster": int(cluster), "label": styles["labels"][cluster], "members": members}
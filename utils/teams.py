@@ -0,0 +1,284 @@
+import os
+import threading
+import time
+import unicodedata
+
+# Carpeta raíz de los logos reales
+LOGOS_ROOT = os.path.join("static", "wetransfer_players_2025-06-18_1752", "LOGHI_PNG")
+
+# Carpeta de logos temporales (fallback)
+FALLBACK_LOGOS_DIR = os.path.join("static", "logos")
+
+# Segundos que se recuerda que un logo no existe antes de volver a comprobar el disco
+MISSING_LOGO_TTL = 30.0
+
+# Listas globales de equipos para todas las ligas
+LALIGA_TEAMS = [
+    ("Barcelona", "Barcelona.png"),
+    ("Real Madrid", "real_madrid.png"),
+    ("Atletico de Madrid", "atletico_de_madrid.png"),
+    ("Athletic Club", "athletic_club.png"),
+    ("Real Sociedad", "real_sociedad.png"),
+    ("Sevilla", "Sevilla.png"),
+    ("Valencia", "valencia.png"),
+    ("Real Betis", "real_betis.png"),
+    ("Villarreal", "villareal.png"),
+    ("Girona", "girona.png"),
+    ("Celta de Vigo", "celta_de_vigo.png"),
+    ("Rayo Vallecano", "rayo_vallecano.png"),
+    ("Osasuna", "osasuna.png"),
+    ("Getafe", "getafe.png"),
+    ("Alaves", "Alaves.png"),
+    ("Espanyol", "espanyol.png"),
+    ("Las Palmas", "las_palmas.png"),
+    ("Mallorca", "mallorca.png"),
+    ("Leganes", "Leganes.png"),
+    ("Real Valladolid", "real_valladolid.png"),
+]
+
+PREMIER_TEAMS = [
+    ("Manchester City", "manchester_city.png"),
+    ("Arsenal", "arsenal.png"),
+    ("Manchester United", "manchester_united.png"),
+    ("Liverpool", "liverpool.png"),
+    ("Newcastle", "Newcastle.png"),
+    ("Brighton", "brighton.png"),
+    ("Aston Villa", "aston_villa.png"),
+    ("Tottenham", "Tottenham.png"),
+    ("Brentford", "brentford.png"),
+    ("Chelsea", "chelsea.png"),
+    ("Crystal Palace", "crystal_palace.png"),
+    ("Wolves", "Wolves.png"),
+    ("West Ham", "West_Ham.png"),
+    ("Bournemouth", "bournemouth.png"),
+    ("Nottingham Forest", "nottingham_forest.png"),
+    ("Fulham", "fulham.png"),
+    ("Everton", "everton.png"),
+    ("Luton Town", "luton_town.png"),
+    ("Burnley", "burnley.png"),
+    ("Sheffield United", "sheffield_united.png"),
+]
+
+SERIE_A_TEAMS = [
+    ("Atalanta", "Atalanta.png"),
+    ("Bologna", "Bologna.png"),
+    ("Cagliari", "Cagliari.png"),
+    ("Como", "Como.png"),
+    ("Empoli", "Empoli.png"),
+    ("Fiorentina", "Fiorentina.png"),
+    ("Genoa", "Genoa.png"),
+    ("Hellas Verona", "Hellas_Verona.png"),
+    ("Inter", "Inter.png"),
+    ("Juventus", "Juventus.png"),
+    ("Lazio", "Lazio.png"),
+    ("Lecce", "Lecce.png"),
+    ("Milan", "Milan.png"),
+    ("Monza", "Monza.png"),
+    ("Napoli", "Napoli.png"),
+    ("Parma", "Parma.png"),
+    ("Roma", "Roma.png"),
+    ("Torino", "Torino.png"),
+    ("Udinese", "Udinese.png"),
+    ("Venezia", "Venezia.png"),
+]
+
+BUNDESLIGA_TEAMS = [
+    ("Augsburg", "Augsburg.png"),
+    ("Bayer Leverkusen", "Bayer_Leverkusen.png"),
+    ("Bayern Munich", "Bayern_Munich.png"),
+    ("Bochum", "Bochum.png"),
+    ("Borussia Dortmund", "Borussia_Dortmund.png"),
+    ("Borussia Mönchengladbach", "Borussia_Mönchengladbach.png"),
+    ("Eintracht Frankfurt", "Eintracht_Frankfurt.png"),
+    ("Freiburg", "Freiburg.png"),
+    ("Heidenheim", "Heidenheim.png"),
+    ("Hoffenheim", "Hoffenheim.png"),
+    ("Holstein Kiel", "Holstein_Kiel.png"),
+    ("Mainz 05", "Mainz_05.png"),
+    ("RB Leipzig", "RB_Leipzig.png"),
+    ("St Pauli", "St_Pauli.png"),
+    ("Stuttgart", "Stuttgart.png"),
+    ("Union Berlin", "Union_Berlin.png"),
+    ("Werder Bremen", "Werder_Bremen.png"),
+    ("Wolfsburg", "Wolfsburg.png"),
+]
+
+LIGUE1_TEAMS = [
+    ("Angers", "Angers.png"),
+    ("Auxerre", "Auxerre.png"),
+    ("Brest", "Brest.png"),
+    ("Le Havre", "Le_Havre.png"),
+    ("Lens", "Lens.png"),
+    ("Lille", "Lille.png"),
+    ("Lyon", "Lyon.png"),
+    ("Marseille", "Marseille.png"),
+    ("Monaco", "Monaco.png"),
+    ("Montpellier", "Montpellier.png"),
+    ("Nantes", "Nantes.png"),
+    ("Nice", "Nice.png"),
+    ("PSG", "Paris_Saint-Germain.png"),
+    ("Reims", "Reims.png"),
+    ("Rennes", "Rennes.png"),
+    ("Saint Etienne", "Saint Etienne.png"),
+    ("Strasbourg", "Strasbourg.png"),
+    ("Toulouse", "Toulouse.png"),
+]
+
+# Diccionario con nombres de ligas y sus equipos
+ligas_y_equipos = {
+    "La Liga Española": [name for name, _ in LALIGA_TEAMS],
+    "Premier League": [name for name, _ in PREMIER_TEAMS],
+    "Serie A": [name for name, _ in SERIE_A_TEAMS],
+    "Bundesliga": [name for name, _ in BUNDESLIGA_TEAMS],
+    "Ligue 1": [name for name, _ in LIGUE1_TEAMS]
+}
+
+
+# Carpetas de logos de cada liga: (equipos, carpeta de la liga, carpeta de los escudos)
+LEAGUE_FOLDERS = {
+    "La Liga Española": (LALIGA_TEAMS, "LA_LIGA", "SQUADRE"),
+    "Premier League": (PREMIER_TEAMS, "PREMIER LEAGUE", "SQUADRE"),
+    "Serie A": (SERIE_A_TEAMS, "SERIE_A", "SQUADRE_24-25"),
+    "Bundesliga": (BUNDESLIGA_TEAMS, "BUNDES", "SQUADRE"),
+    "Ligue 1": (LIGUE1_TEAMS, "LIGUE_1", "SQUADRE"),
+}
+
+# Logos de las ligas (relativos a LOGOS_ROOT)
+LEAGUE_LOGO_FILES = {
+    "La Liga Española": os.path.join("LA_LIGA", "LOGO", "La_Liga.png"),
+    "Premier League": os.path.join("PREMIER LEAGUE", "Premier League.png"),
+    "Serie A": os.path.join("SERIE_A", "LOGO", "Serie_A.png"),
+    "Bundesliga": os.path.join("BUNDES", "LOGO", "Bundesliga.png"),
+    "Ligue 1": os.path.join("LIGUE_1", "LOGO", "Ligue_1.png"),
+}
+
+# Nombres alternativos con los que aparecen los equipos en otras fuentes (CSV, FBref...)
+TEAM_ALIASES = {
+    "Barcelona": ["FC Barcelona", "Barça", "Barca"],
+    "Real Madrid": ["Real Madrid CF"],
+    "Atletico de Madrid": ["Atlético de Madrid", "Atletico Madrid", "Atlético Madrid"],
+    "Alaves": ["Alavés", "Deportivo Alavés"],
+    "Leganes": ["Leganés"],
+    "Villarreal": ["Villareal"],
+    "Celta de Vigo": ["Celta Vigo", "Celta"],
+    "Manchester City": ["Man City"],
+    "Manchester United": ["Man United", "Manchester Utd"],
+    "Newcastle": ["Newcastle United", "Newcastle Utd"],
+    "Brighton": ["Brighton & Hove Albion"],
+    "Tottenham": ["Tottenham Hotspur", "Spurs"],
+    "Wolves": ["Wolverhampton Wanderers"],
+    "West Ham": ["West Ham United"],
+    "Nottingham Forest": ["Nott'ham Forest"],
+    "Sheffield United": ["Sheffield Utd"],
+    "Inter": ["Internazionale", "Inter Milan"],
+    "Milan": ["AC Milan"],
+    "Hellas Verona": ["Verona"],
+    "Bayern Munich": ["Bayern", "Bayern München", "FC Bayern"],
+    "Bayer Leverkusen": ["Leverkusen"],
+    "Borussia Dortmund": ["Dortmund"],
+    "Borussia Mönchengladbach": ["Gladbach", "M'Gladbach", "Monchengladbach"],
+    "Eintracht Frankfurt": ["Frankfurt", "Eint Frankfurt"],
+    "Mainz 05": ["Mainz"],
+    "St Pauli": ["St. Pauli"],
+    "PSG": ["Paris Saint-Germain", "Paris S-G", "Paris SG"],
+    "Saint Etienne": ["Saint-Étienne", "Saint-Etienne"],
+}
+
+
+def _normalizar_nombre(name):
+    """Clave de búsqueda insensible a mayúsculas, tildes y espacios sobrantes"""
+    name = unicodedata.normalize("NFKD", str(name).strip().lower())
+    return "".join(c for c in name if not unicodedata.combining(c))
+
+
+def _construir_registro():
+    """Construye el índice equipo -> liga, carpeta, archivo de logo y alias"""
+    registry = {}
+    for league, (teams_list, league_folder, squadre_folder) in LEAGUE_FOLDERS.items():
+        for name, logo_file in teams_list:
+            registry[name] = {
+                "team": name,
+                "league": league,
+                "league_folder": league_folder,
+                "logo_file": logo_file,
+                # Rutas candidatas en orden de preferencia
+                "candidates": (
+                    os.path.join(LOGOS_ROOT, league_folder, squadre_folder, logo_file),
+                    os.path.join(FALLBACK_LOGOS_DIR, logo_file),
+                    os.path.join(FALLBACK_LOGOS_DIR, name.lower().replace(" ", "_") + ".png"),
+                ),
+                "aliases": tuple(TEAM_ALIASES.get(name, [])),
+            }
+    return registry
+
+
+# Registro de equipos, construido una sola vez al importar el módulo
+TEAM_REGISTRY = _construir_registro()
+
+# Índice de nombres normalizados (nombre oficial y alias) -> nombre oficial
+_ALIAS_INDEX = {}
+for _name, _entry in TEAM_REGISTRY.items():
+    for _alias in (_name,) + _entry["aliases"]:
+        _ALIAS_INDEX[_normalizar_nombre(_alias)] = _name
+
+# Rutas de logo ya resueltas: clave -> (ruta o None, instante de la comprobación)
+_resolved_logos = {}
+_resolved_lock = threading.Lock()
+
+
+def canonical_team_name(team_name):
+    """Devuelve el nombre oficial de un equipo a partir de su nombre o alias (None si no existe)"""
+    if team_name in TEAM_REGISTRY:
+        return team_name
+    return _ALIAS_INDEX.get(_normalizar_nombre(team_name))
+
+
+def get_team_entry(team_name):
+    """Devuelve la entrada del registro de un equipo (None si no existe)"""
+    name = canonical_team_name(team_name)
+    return TEAM_REGISTRY.get(name) if name else None
+
+
+def get_team_league(team_name):
+    """Devuelve la liga de un equipo (None si no existe)"""
+    entry = get_team_entry(team_name)
+    return entry["league"] if entry else None
+
+
+def _resolver(key, candidates):
+    """Devuelve la primera ruta existente, recordando también los resultados negativos"""
+    cached = _resolved_logos.get(key)
+    now = time.monotonic()
+    if cached is not None:
+        path, checked_at = cached
+        if path is not None or now - checked_at < MISSING_LOGO_TTL:
+            return path
+
+    path = next((c for c in candidates if os.path.exists(c)), None)
+    with _resolved_lock:
+        _resolved_logos[key] = (path, now)
+    return path
+
+
+def resolve_team_logo(team_name):
+    """Devuelve la ruta existente del logo de un equipo o None si no hay logo"""
+    entry = get_team_entry(team_name)
+    if entry is None:
+        filename = str(team_name).lower().replace(" ", "_") + ".png"
+        return _resolver(("team", team_name), (os.path.join(FALLBACK_LOGOS_DIR, filename),))
+    return _resolver(("team", entry["team"]), entry["candidates"])
+
+
+def resolve_league_logo(league_name):
+    """Devuelve la ruta existente del logo de una liga o None si no hay logo"""
+    candidates = []
+    if league_name in LEAGUE_LOGO_FILES:
+        candidates.append(os.path.join(LOGOS_ROOT, LEAGUE_LOGO_FILES[league_name]))
+    candidates.append(os.path.join("static", "leagues", league_name.lower().replace(" ", "_") + ".png"))
+    return _resolver(("league", league_name), candidates)
+
+
+def invalidate_logo_paths():
+    """Olvida las rutas resueltas (p. ej. tras añadir logos nuevos)"""
+    with _resolved_lock:
+        _resolved_logos.clear()